@@ -0,0 +1,169 @@
+import calendar
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .models import ArchivedRegistration, RegistrationChange, StudentRegistration
+from .registration_fields import REGISTRATION_SECTIONS
+
+
+ARCHIVE_CHUNK_SIZE = 1000
+# Kept as plain columns on ArchivedRegistration: what the dashboard filters,
+# lists and searches on, and what the statistics count. The rest of the form's
+# answers are compressed.
+ARCHIVE_COLUMNS = [
+    "batch_no",
+    "full_name",
+    "email",
+    "contact_number",
+    "referral_source",
+    "gender",
+    "social_category",
+]
+ARCHIVE_ADMIN_FIELDS = [
+    "id",
+    "submitted_at",
+    "account_created",
+    "created_user_id",
+    "duplicate_of_id",
+]
+ARCHIVE_ANSWER_FIELDS = [
+    field_name
+    for _section_title, fields in REGISTRATION_SECTIONS
+    for field_name, _field_label, _field_type in fields
+    if field_name not in ARCHIVE_COLUMNS
+]
+
+
+def months_ago(months, now=None):
+    """The same day and time ``months`` calendar months before ``now``."""
+    now = now or timezone.now()
+    year, month = divmod(now.year * 12 + now.month - 1 - months, 12)
+    day = min(now.day, calendar.monthrange(year, month + 1)[1])
+    return now.replace(year=year, month=month + 1, day=day)
+
+
+def archive_filter(batches=(), older_than_months=None):
+    """Q for registrations in one of ``batches`` (any case) or older than the cutoff."""
+    condition = Q(pk__in=[])
+    if batches:
+        condition |= Q(batch_key__in=[batch.strip().lower() for batch in batches])
+    if older_than_months is not None:
+        condition |= Q(submitted_at__lt=months_ago(older_than_months))
+    return condition
+
+
+def select_for_archive(registrations, batches=(), older_than_months=None):
+    return registrations.alias(batch_key=Lower("batch_no")).filter(
+        archive_filter(batches, older_than_months)
+    )
+
+
+def pack_answers(registration):
+    # Blank answers are left out; rebuilding the model fills in their defaults.
+    answers = {
+        field_name: getattr(registration, field_name)
+        for field_name in ARCHIVE_ANSWER_FIELDS
+        if getattr(registration, field_name) not in ("", None)
+    }
+    return zlib.compress(
+        json.dumps(answers, cls=DjangoJSONEncoder, separators=(",", ":")).encode(), 9
+    )
+
+
+def unpack_answers(answers):
+    fields = StudentRegistration._meta
+    return {
+        field_name: fields.get_field(field_name).to_python(value)
+        for field_name, value in json.loads(zlib.decompress(answers)).items()
+        if field_name in ARCHIVE_ANSWER_FIELDS
+    }
+
+
+def archive_entry(registration, archived_at):
+    return ArchivedRegistration(
+        archived_at=archived_at,
+        answers=pack_answers(registration),
+        **{field_name: getattr(registration, field_name) for field_name in ARCHIVE_ADMIN_FIELDS},
+        **{field_name: getattr(registration, field_name) for field_name in ARCHIVE_COLUMNS},
+    )
+
+
+def registration_from_archive(archived):
+    """Rebuild the unsaved StudentRegistration that ``archived`` was made from."""
+    return StudentRegistration(
+        **{field_name: getattr(archived, field_name) for field_name in ARCHIVE_ADMIN_FIELDS},
+        **{field_name: getattr(archived, field_name) for field_name in ARCHIVE_COLUMNS},
+        **unpack_answers(archived.answers),
+    )
+
+
+def archive_registrations(registrations, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """Move ``registrations`` into the archive, one transaction per chunk.
+
+    Returns the number moved. The statistics counters cover the archive too,
+    so they are left as they are; the delta export reports the moved rows as
+    archived rather than deleted. Active registrations flagged as duplicates of
+    a moved one lose the flag, as they would if it were deleted.
+    """
+    ids = list(registrations.order_by("id").values_list("id", flat=True))
+    archived_at = timezone.now()
+    for start in range(0, len(ids), chunk_size):
+        chunk_ids = ids[start : start + chunk_size]
+        with transaction.atomic():
+            chunk = list(StudentRegistration.objects.filter(id__in=chunk_ids))
+            ArchivedRegistration.objects.bulk_create(
+                archive_entry(registration, archived_at) for registration in chunk
+            )
+            StudentRegistration.objects.filter(duplicate_of__in=chunk_ids).exclude(
+                id__in=chunk_ids
+            ).update(duplicate_of=None)
+            # A bulk DELETE: the per-row delete signals would take the moved
+            # registrations out of the counters.
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DELETE FROM {StudentRegistration._meta.db_table} "
+                    f"WHERE id IN ({', '.join(['%s'] * len(chunk))})",
+                    [registration.id for registration in chunk],
+                )
+            # The delete trigger logged each move as a deletion.
+            RegistrationChange.objects.filter(registration_id__in=chunk_ids).update(
+                deleted=False, archived=True
+            )
+    return len(ids)
+
+
+def restore_registrations(archived, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """Move ``archived`` registrations back into the active table; returns the count."""
+    ids = list(archived.order_by("id").values_list("id", flat=True))
+    for start in range(0, len(ids), chunk_size):
+        chunk_ids = ids[start : start + chunk_size]
+        with transaction.atomic():
+            registrations = [
+                registration_from_archive(entry)
+                for entry in ArchivedRegistration.objects.filter(id__in=chunk_ids)
+            ]
+            # Duplicates point at an earlier registration: one already active,
+            # restored by an earlier chunk or in this one.
+            active = set(chunk_ids) | set(
+                StudentRegistration.objects.filter(
+                    id__in={registration.duplicate_of_id for registration in registrations}
+                ).values_list("id", flat=True)
+            )
+            for registration in registrations:
+                if registration.duplicate_of_id not in active:
+                    registration.duplicate_of_id = None
+            submitted_at = [registration.submitted_at for registration in registrations]
+            StudentRegistration.objects.bulk_create(registrations)
+            # auto_now_add stamped the insert with the current time.
+            for registration, value in zip(registrations, submitted_at):
+                registration.submitted_at = value
+            StudentRegistration.objects.bulk_update(registrations, ["submitted_at"])
+            # The counters kept these registrations while they were archived.
+            ArchivedRegistration.objects.filter(id__in=chunk_ids).delete()
+    return len(ids)
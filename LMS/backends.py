@@ -0,0 +1,36 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .cache import user_cache_key, user_cache_timeout
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend that serves the session's user from the cache.
+
+    ``get_user`` runs on every authenticated request; a hit skips the User
+    query. The cache holds a pickled copy, so each request still gets its own
+    instance. LMS.signals drops the entry whenever the user is saved or
+    deleted, e.g. by ``update_student`` or at login; ``QuerySet.update()``
+    bypasses that and callers must use ``invalidate_users``.
+    """
+
+    def get_user(self, user_id):
+        cache_key = user_cache_key(user_id)
+        user = cache.get(cache_key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(cache_key, user, user_cache_timeout())
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        cache_key = user_cache_key(user_id)
+        user = await cache.aget(cache_key)
+        if user is None:
+            user = await sync_to_async(ModelBackend.get_user)(self, user_id)
+            if user is None:
+                return None
+            await cache.aset(cache_key, user, user_cache_timeout())
+        return user if self.user_can_authenticate(user) else None
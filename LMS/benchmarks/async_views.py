@@ -0,0 +1,166 @@
+import asyncio
+import importlib
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.test import Client, override_settings
+from django.urls import clear_url_caches, reverse
+
+from ..models import StudentRegistration
+from .common import latency_summary
+from .data import BENCHMARK_ADMIN
+
+
+def reload_urlconfs():
+    importlib.reload(importlib.import_module("LMS.urls"))
+    importlib.reload(importlib.import_module(settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+@contextmanager
+def routed_views(async_views):
+    """Route the read-heavy views as async (or sync) views inside the block."""
+    try:
+        with override_settings(ASYNC_VIEWS=async_views):
+            reload_urlconfs()
+            yield
+    finally:
+        reload_urlconfs()
+
+
+def session_cookie(user):
+    client = Client()
+    client.force_login(user)
+    return f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+
+async def asgi_get(application, path, query_string="", cookie=""):
+    """Send one GET through ``application`` the way an ASGI server would.
+
+    Returns ``(status, seconds to first body byte, seconds to last byte)``.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query_string.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    finished = asyncio.Event()
+    request_sent = False
+    status = first_byte = None
+    started = time.perf_counter()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Django listens for a disconnect while the view runs; stay connected.
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, first_byte
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            if first_byte is None:
+                first_byte = time.perf_counter() - started
+            if not message.get("more_body", False):
+                finished.set()
+
+    try:
+        await application(scope, receive, send)
+    finally:
+        finished.set()
+    return status, first_byte, time.perf_counter() - started
+
+
+async def asgi_load(application, target, requests, concurrency):
+    """Drive ``requests`` GETs over ``concurrency`` connections on one event loop."""
+    path, query_string, cookie = target
+    latencies = []
+    first_bytes = []
+    remaining = iter(range(requests))
+
+    async def connection_loop():
+        for _ in remaining:
+            status, first_byte, elapsed = await asgi_get(application, path, query_string, cookie)
+            if status != 200:
+                raise ValueError(f"GET {path} returned {status}")
+            first_bytes.append(first_byte)
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connection_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latency = latency_summary(latencies)
+    return {
+        "requests_per_s": round(requests / elapsed, 1),
+        "p50_ms": round(latency["p50"] * 1000, 2),
+        "p95_ms": round(latency["p95"] * 1000, 2),
+        "first_byte_p50_ms": round(latency_summary(first_bytes)["p50"] * 1000, 2),
+    }
+
+
+def asgi_peak_kib(application, target):
+    path, query_string, cookie = target
+    tracemalloc.start()
+    try:
+        asyncio.run(asgi_get(application, path, query_string, cookie))
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1)
+
+
+def async_benchmark_targets():
+    """Return ``{name: (path, query string, cookie)}`` for the async-capable views."""
+    admin = session_cookie(User.objects.get(username=BENCHMARK_ADMIN))
+    student = session_cookie(User.objects.filter(profile__isnull=False).order_by("id").first())
+    registration_id = StudentRegistration.objects.order_by("id").values_list("id", flat=True)[0]
+    return {
+        "admin dashboard": (reverse("admin_dashboard"), "", admin),
+        "registration detail": (
+            reverse("registration_detail", args=[registration_id]),
+            "",
+            admin,
+        ),
+        "student dashboard": (reverse("student_dashboard"), "", student),
+        "export csv": (reverse("export_registrations_csv"), "columns=all", admin),
+    }
+
+
+def run_async_view_benchmarks(requests=200, concurrency=32, only=""):
+    """Serve each view through Django's ASGI handler, first sync and then async.
+
+    The load generator plays an ASGI server such as uvicorn: one event loop,
+    ``concurrency`` connections in flight. Both modes use the same handler and
+    middleware; only the routed view differs.
+    """
+    targets = {
+        name: target for name, target in async_benchmark_targets().items() if only in name
+    }
+    results = {}
+    for mode in ("sync", "async"):
+        with routed_views(async_views=mode == "async"):
+            application = ASGIHandler()
+            for name, target in targets.items():
+                asyncio.run(asgi_load(application, target, concurrency, concurrency))  # Warm up.
+                metrics = asyncio.run(asgi_load(application, target, requests, concurrency))
+                metrics["peak_kib"] = asgi_peak_kib(application, target)
+                results.setdefault(name, {})[mode] = metrics
+    return results
@@ -0,0 +1,102 @@
+import time
+from itertools import product
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from hope.auth import SESSION_PROFILES, password_hashers, session_engine
+
+from .common import latency_summary, request_view
+
+
+BENCHMARK_STUDENT = "student0"
+BENCHMARK_STUDENT_PASSWORD = "student"
+# Login throttling would refuse the timed logins after the first few.
+UNTHROTTLED = (10**9, 1)
+AUTH_BACKENDS = {
+    "uncached": "django.contrib.auth.backends.ModelBackend",
+    "cached": "LMS.backends.CachedModelBackend",
+}
+
+
+def student_login(client):
+    return request_view(
+        client,
+        "post",
+        reverse("student_login"),
+        {"username": BENCHMARK_STUDENT, "password": BENCHMARK_STUDENT_PASSWORD},
+        expected_status=302,
+    )
+
+
+def measure_logins(logins):
+    """Return logins per second on one thread, each from a fresh client."""
+    student_login(Client())  # Warm up.
+    started = time.perf_counter()
+    for _ in range(logins):
+        student_login(Client())
+    return round(logins / (time.perf_counter() - started), 1)
+
+
+def measure_password_hashing(hashes, profile):
+    """Return password checks per second on one thread under a hasher profile."""
+    with override_settings(PASSWORD_HASHERS=password_hashers(profile)):
+        password_hash = make_password(BENCHMARK_STUDENT_PASSWORD)
+        started = time.perf_counter()
+        for _ in range(hashes):
+            check_password(BENCHMARK_STUDENT_PASSWORD, password_hash)
+        return round(hashes / (time.perf_counter() - started), 1)
+
+
+def measure_logged_in_requests(requests):
+    """Return latency and query count of the student dashboard once logged in."""
+    client = Client()
+    student_login(client)
+    url = reverse("student_dashboard")
+    request_view(client, "get", url)  # Warm the session, user and profile caches.
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        request_view(client, "get", url)
+        latencies.append(time.perf_counter() - started)
+    with CaptureQueriesContext(connection) as queries:
+        request_view(client, "get", url)
+    return {
+        "p50_ms": round(latency_summary(latencies)["p50"] * 1000, 3),
+        "queries": len(queries),
+    }
+
+
+def run_auth_benchmarks(
+    logins=20, requests=200, session_profiles=SESSION_PROFILES, hasher_profiles=("pbkdf2",)
+):
+    """Measure password checks, logins and logged-in request cost.
+
+    Returns ``(hashing, sessions)``: password checks per second for each hasher
+    profile, and logins per second plus dashboard latency and query count for
+    each session profile with and without the cached user backend, using the
+    configured hasher. Every figure is for one thread, i.e. one core. Each
+    setup uses new clients, as the session middleware picks its engine when
+    it is loaded.
+    """
+    hashing = {
+        profile: measure_password_hashing(logins, profile) for profile in hasher_profiles
+    }
+    sessions = {}
+    for profile, backend in product(session_profiles, AUTH_BACKENDS):
+        with override_settings(
+            SESSION_ENGINE=session_engine(profile),
+            AUTHENTICATION_BACKENDS=[AUTH_BACKENDS[backend]],
+            LMS_LOGIN_THROTTLE_IP=UNTHROTTLED,
+            LMS_LOGIN_THROTTLE_USERNAME=UNTHROTTLED,
+        ):
+            cache.clear()
+            sessions[f"{profile} sessions, {backend} users"] = {
+                "logins_per_s": measure_logins(logins),
+                **measure_logged_in_requests(requests),
+            }
+    return hashing, sessions
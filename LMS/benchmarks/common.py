@@ -0,0 +1,48 @@
+from django.http import QueryDict
+
+from ..models import StudentRegistration
+from ..registration_fields import REGISTRATION_SECTIONS, SELECT_OPTIONS
+
+
+def sample_submission():
+    data = QueryDict(mutable=True)
+    for _section_title, fields in REGISTRATION_SECTIONS:
+        for field_name, field_label, field_type in fields:
+            if field_name in SELECT_OPTIONS:
+                data[field_name] = SELECT_OPTIONS[field_name][0]
+            elif field_type == "date":
+                data[field_name] = "2001-04-17"
+            elif field_type == "email":
+                data[field_name] = "  applicant@example.com "
+            else:
+                max_length = StudentRegistration._meta.get_field(field_name).max_length
+                data[field_name] = f"  {field_label[: max_length or 200]}  "
+    data["contact_number"] = "+91 98765 43210"
+    return data
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def latency_summary(latencies):
+    latencies = sorted(latencies)
+    return {
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "max": latencies[-1] if latencies else 0.0,
+    }
+
+
+def request_view(client, method, url, data=None, expected_status=200):
+    response = getattr(client, method)(url, data)
+    if response.status_code != expected_status:
+        raise ValueError(f"{method.upper()} {url} returned {response.status_code}")
+    if response.streaming:
+        for _chunk in response.streaming_content:
+            pass
+    return response
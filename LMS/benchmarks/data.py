@@ -0,0 +1,89 @@
+from contextlib import contextmanager
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import DurationField, ExpressionWrapper, F, Value
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+
+from ..binding import bind_registration
+from ..cache import invalidate_student_profiles, invalidate_users
+from ..models import StudentProfile, StudentRegistration
+from ..stats import rebuild_registration_stats
+from .common import sample_submission
+
+
+BENCHMARK_SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+BENCHMARK_BATCHES = 20
+# Every fourth seeded registration already has a student account and profile.
+ACCOUNT_EVERY = 4
+SEED_CHUNK_SIZE = 5000
+MINUTE_MICROSECONDS = 60 * 1_000_000
+BENCHMARK_ADMIN = "bench-admin"
+
+
+def seed_benchmark_data(rows, chunk_size=SEED_CHUNK_SIZE):
+    """Seed ``rows`` registrations plus accounts and profiles for a quarter of them."""
+    User.objects.create_user(BENCHMARK_ADMIN, password=BENCHMARK_ADMIN, is_staff=True)
+    values, _errors = bind_registration(sample_submission())
+    # One hash shared by every seeded student; hashing each would dominate seeding.
+    password_hash = make_password("student")
+
+    for start in range(0, rows, chunk_size):
+        indexes = range(start, min(start + chunk_size, rows))
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                User(username=f"student{index}", password=password_hash)
+                for index in indexes
+                if index % ACCOUNT_EVERY == 0
+            )
+            StudentProfile.objects.bulk_create(
+                StudentProfile(user=user, course_name="Cloud Computing") for user in users
+            )
+            # bulk_create skips the signals that drop cached users and profiles.
+            invalidate_users([user.id for user in users])
+            invalidate_student_profiles([user.id for user in users])
+            accounts = iter(users)
+            registrations = []
+            for index in indexes:
+                created_user = next(accounts) if index % ACCOUNT_EVERY == 0 else None
+                registrations.append(
+                    StudentRegistration(
+                        **{
+                            **values,
+                            "full_name": f"Student {index}",
+                            "email": f"student{index}@example.com",
+                            "contact_number": f"9{index:09d}",
+                            "batch_no": f"B{index % BENCHMARK_BATCHES}",
+                            "account_created": created_user is not None,
+                            "created_user": created_user,
+                        }
+                    )
+                )
+            StudentRegistration.objects.bulk_create(registrations)
+
+    # auto_now_add stamps every row with the same instant; spread them a minute
+    # apart so date ordering and cursors behave like real intake.
+    StudentRegistration.objects.update(
+        submitted_at=Value(timezone.now())
+        - ExpressionWrapper(F("id") * MINUTE_MICROSECONDS, output_field=DurationField())
+    )
+    rebuild_registration_stats()
+
+
+@contextmanager
+def scratch_benchmark_database(database_path, keepdb=False):
+    """Run the block against a migrated throwaway database at ``database_path``.
+
+    The test database machinery migrates the file and points the default
+    connection at it, so the real database is never touched.
+    """
+    connection.settings_dict["TEST"]["NAME"] = str(database_path)
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
@@ -0,0 +1,184 @@
+import time
+import tracemalloc
+from itertools import product
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import StudentRegistration
+from .common import latency_summary, request_view, sample_submission
+from .data import BENCHMARK_ADMIN
+
+
+# Latency and memory deltas below these floors are treated as noise.
+LATENCY_NOISE_MS = 2.0
+MEMORY_NOISE_KIB = 64.0
+
+
+def dashboard_run(params):
+    def run(client, state):
+        return request_view(client, "get", reverse("admin_dashboard"), params)
+
+    return run
+
+
+def benchmark_scenarios():
+    """Return ``(name, run)`` pairs; ``run(client, state)`` makes one request."""
+    scenarios = []
+    for status, batch, q in product(("all", "pending", "created"), ("", "B1"), ("", "Student 42")):
+        params = {"status": status, "batch": batch, "q": q}
+        params = {name: value for name, value in params.items() if value and value != "all"}
+        scenarios.append((f"dashboard {urlencode(params) or 'unfiltered'}", dashboard_run(params)))
+
+    submission = sample_submission()
+    scenarios += [
+        (
+            "export csv",
+            lambda client, state: request_view(
+                client, "get", reverse("export_registrations_csv"), {"columns": "all"}
+            ),
+        ),
+        (
+            "export jsonl",
+            lambda client, state: request_view(
+                client, "get", reverse("export_registrations_csv"), {"format": "jsonl"}
+            ),
+        ),
+        (
+            "register post",
+            lambda client, state: request_view(
+                client, "post", reverse("student_register"), submission, expected_status=302
+            ),
+        ),
+        (
+            "registration detail",
+            lambda client, state: request_view(
+                client, "get", reverse("registration_detail", args=[state["registration_id"]])
+            ),
+        ),
+        (
+            "create credentials",
+            lambda client, state: create_credentials(client, next(state["pending_ids"])),
+        ),
+    ]
+    return scenarios
+
+
+def create_credentials(client, registration_id):
+    return request_view(
+        client,
+        "post",
+        reverse("create_credentials_for_registration", args=[registration_id]),
+        {"username": f"bench{registration_id}", "password": "bench-password"},
+        expected_status=302,
+    )
+
+
+def value_bytes(value):
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode())
+    if isinstance(value, (bytes, memoryview)):
+        return len(value)
+    return 8
+
+
+def bytes_read(captured_queries):
+    """Size of the column data the captured SELECTs hand back to Python.
+
+    The logged SQL has its parameters inlined, so each SELECT is simply run again
+    on a plain cursor and its values measured (8 bytes for a number or date).
+    """
+    total = 0
+    with connection.cursor() as cursor:
+        for query in captured_queries:
+            if query["sql"].startswith("SELECT"):
+                cursor.execute(query["sql"])
+                total += sum(value_bytes(value) for row in cursor.fetchall() for value in row)
+    return total
+
+
+def measure_scenario(run, client, state, repeat):
+    run(client, state)  # Warm caches, connections and the session.
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run(client, state)
+        latencies.append(time.perf_counter() - started)
+
+    with CaptureQueriesContext(connection) as queries:
+        run(client, state)
+    # Count now: the next request's request_started signal clears the query log.
+    query_count = len(queries)
+    read = bytes_read(queries.captured_queries)
+
+    tracemalloc.start()
+    try:
+        run(client, state)
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    summary = latency_summary(latencies)
+    return {
+        # Best-of-N is the most stable figure to gate on; p95 is informational.
+        "latency_ms": round(min(latencies) * 1000, 3),
+        "p95_ms": round(summary["p95"] * 1000, 3),
+        "queries": query_count,
+        "read_kib": round(read / 1024, 1),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_view_benchmarks(repeat=5, only=""):
+    """Drive every scenario through the test client against the current database."""
+    client = Client()
+    client.force_login(User.objects.get(username=BENCHMARK_ADMIN))
+    state = {
+        "registration_id": StudentRegistration.objects.order_by("id").values_list("id", flat=True)[0],
+        "pending_ids": iter(
+            StudentRegistration.objects.filter(account_created=False)
+            .order_by("id")
+            .values_list("id", flat=True)
+        ),
+    }
+    return {
+        name: measure_scenario(run, client, state, repeat)
+        for name, run in benchmark_scenarios()
+        if only in name
+    }
+
+
+def compare_benchmark_results(baseline, results, latency_tolerance=0.5, memory_tolerance=0.25):
+    """List every tracked metric in ``results`` that regressed past ``baseline``.
+
+    Query counts must not grow at all; latency, peak memory and bytes read may
+    grow by their tolerance (a fraction of the baseline) before counting as a
+    regression.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if metrics["queries"] > base["queries"]:
+            regressions.append(f"{name}: {base['queries']} -> {metrics['queries']} queries")
+        for metric, tolerance, noise, unit in (
+            ("latency_ms", latency_tolerance, LATENCY_NOISE_MS, "ms"),
+            ("peak_kib", memory_tolerance, MEMORY_NOISE_KIB, "KiB"),
+            ("read_kib", memory_tolerance, MEMORY_NOISE_KIB, "KiB"),
+        ):
+            if metric not in base:
+                continue  # Baselines saved before the metric existed.
+            limit = base[metric] * (1 + tolerance)
+            if metrics[metric] > limit and metrics[metric] - base[metric] > noise:
+                regressions.append(
+                    f"{name}: {metric} {base[metric]:.1f} -> {metrics[metric]:.1f} {unit} "
+                    f"(limit {limit:.1f})"
+                )
+    return regressions
@@ -0,0 +1,104 @@
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import models
+from django.utils.datastructures import MultiValueDict
+from django.utils.dateparse import parse_date
+
+from .models import StudentRegistration
+from .registration_fields import REGISTRATION_SECTIONS, REQUIRED_FIELDS, SELECT_OPTIONS
+
+
+BinderField = namedtuple(
+    "BinderField", ["name", "label", "kind", "required", "max_length", "options"]
+)
+
+
+def compile_registration_binder():
+    """Flatten the form definition and model metadata into one binding plan."""
+    binder_fields = []
+    for _section_title, fields in REGISTRATION_SECTIONS:
+        for field_name, field_label, field_type in fields:
+            model_field = StudentRegistration._meta.get_field(field_name)
+            options = SELECT_OPTIONS.get(field_name)
+            if options:
+                kind = "select"
+            elif isinstance(model_field, models.DateField):
+                kind = "date"
+            else:
+                kind = field_type
+            binder_fields.append(
+                BinderField(
+                    name=field_name,
+                    label=field_label,
+                    kind=kind,
+                    required=field_name in REQUIRED_FIELDS,
+                    max_length=model_field.max_length,
+                    options={option.casefold(): option for option in options or ()},
+                )
+            )
+    return tuple(binder_fields)
+
+
+REGISTRATION_BINDER = compile_registration_binder()
+
+REGISTRATION_DISPLAY = tuple(
+    (section_title, tuple((field_name, field_label) for field_name, field_label, _ in fields))
+    for section_title, fields in REGISTRATION_SECTIONS
+)
+
+
+def bind_registration(data):
+    """Extract, trim and validate registration fields from ``data`` in one pass.
+
+    ``data`` is any mapping of field name to raw text (``request.POST``, an
+    imported spreadsheet row). Returns ``(values, errors)``; ``values`` holds
+    model-ready values for every form field, with choices canonicalised and dates
+    parsed, and is only safe to save when ``errors`` is empty.
+    """
+    if isinstance(data, MultiValueDict):
+        # One pass over the raw lists is far cheaper than ~50 QueryDict.get() calls.
+        data = {key: value_list[-1] for key, value_list in dict.items(data) if value_list}
+    values = {}
+    errors = []
+    get = data.get
+    for name, label, kind, required, max_length, options in REGISTRATION_BINDER:
+        value = (get(name) or "").strip()
+        if not value:
+            if required:
+                errors.append(f"{label} is required.")
+            values[name] = None if kind == "date" else ""
+            continue
+
+        if max_length and len(value) > max_length:
+            errors.append(f"{label} must be at most {max_length} characters.")
+        elif kind == "select":
+            option = options.get(value.casefold())
+            if option is None:
+                errors.append(f"{label} must be one of: {', '.join(options.values())}.")
+            value = option
+        elif kind == "email":
+            try:
+                validate_email(value)
+            except ValidationError:
+                errors.append(f"{label} is not a valid email address.")
+        elif kind == "date":
+            try:
+                value = parse_date(value)
+            except ValueError:
+                value = None
+            if value is None:
+                errors.append(f"{label} must be a date in YYYY-MM-DD format.")
+        values[name] = value
+    return values, errors
+
+
+def registration_display_sections(registration):
+    return [
+        (
+            section_title,
+            [(field_label, getattr(registration, field_name)) for field_name, field_label in fields],
+        )
+        for section_title, fields in REGISTRATION_DISPLAY
+    ]
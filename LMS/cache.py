@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import StudentProfile
+
+
+PROFILE_CACHE_TIMEOUT = 15 * 60
+USER_CACHE_TIMEOUT = 60
+PROFILE_PAYLOAD_FIELDS = ["course_name", "course_duration", "progress_percent", "notes"]
+
+
+def student_profile_cache_key(user_id):
+    return f"lms:student-profile:{user_id}"
+
+
+def empty_profile_payload():
+    return {
+        field_name: StudentProfile._meta.get_field(field_name).get_default()
+        for field_name in PROFILE_PAYLOAD_FIELDS
+    }
+
+
+def get_student_profile_payload(user_id):
+    """Return the dashboard's profile fields for ``user_id``, served from cache.
+
+    A miss reads the profile once and never creates one; students without a
+    profile see the model defaults until an admin saves theirs.
+    """
+    cache_key = student_profile_cache_key(user_id)
+    payload = cache.get(cache_key)
+    if payload is None:
+        payload = (
+            StudentProfile.objects.filter(user_id=user_id).values(*PROFILE_PAYLOAD_FIELDS).first()
+            or empty_profile_payload()
+        )
+        cache.set(
+            cache_key,
+            payload,
+            getattr(settings, "LMS_PROFILE_CACHE_TIMEOUT", PROFILE_CACHE_TIMEOUT),
+        )
+    return payload
+
+
+async def aget_student_profile_payload(user_id):
+    """Async version of :func:`get_student_profile_payload`, for async views."""
+    cache_key = student_profile_cache_key(user_id)
+    payload = await cache.aget(cache_key)
+    if payload is None:
+        payload = (
+            await StudentProfile.objects.filter(user_id=user_id)
+            .values(*PROFILE_PAYLOAD_FIELDS)
+            .afirst()
+            or empty_profile_payload()
+        )
+        await cache.aset(
+            cache_key,
+            payload,
+            getattr(settings, "LMS_PROFILE_CACHE_TIMEOUT", PROFILE_CACHE_TIMEOUT),
+        )
+    return payload
+
+
+def invalidate_student_profiles(user_ids):
+    cache.delete_many([student_profile_cache_key(user_id) for user_id in user_ids])
+
+
+def user_cache_key(user_id):
+    return f"lms:user:{user_id}"
+
+
+def user_cache_timeout():
+    return getattr(settings, "LMS_USER_CACHE_TIMEOUT", USER_CACHE_TIMEOUT)
+
+
+def invalidate_users(user_ids):
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids])
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core import checks
+
+
+@checks.register(checks.Tags.compatibility)
+def check_background_jobs(app_configs, **kwargs):
+    # Inline jobs run exports and provisioning inside the admin's request,
+    # which is what the job queue exists to avoid.
+    if getattr(settings, "LMS_BACKGROUND_JOBS", "worker") == "inline" and not settings.DEBUG:
+        return [
+            checks.Warning(
+                "LMS_BACKGROUND_JOBS is 'inline' with DEBUG off, so exports and bulk "
+                "provisioning run inside the admin's request.",
+                hint="Set LMS_BACKGROUND_JOBS = 'worker' and run `manage.py run_jobs`.",
+                id="LMS.W001",
+            )
+        ]
+    return []
@@ -0,0 +1,165 @@
+import string
+from itertools import groupby
+
+from django.db.models import Q
+
+from .models import RegistrationIdentity, StudentRegistration
+from .sql import PHONE_SEPARATORS
+
+
+# Keys mirror the SQL in migration 0006, which fills RegistrationIdentity from
+# triggers; the two must normalise values identically.
+PHONE_KEY_DIGITS = 10
+MIN_PHONE_DIGITS = 7
+MIN_ID_NUMBER_LENGTH = 4
+ID_NUMBER_SEPARATORS = " -/"
+CLUSTER_FETCH_SIZE = 500
+
+# SQLite's lower()/upper() only fold ASCII letters; fold the same way here.
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+ASCII_UPPER = str.maketrans(string.ascii_lowercase, string.ascii_uppercase)
+
+IDENTITY_KIND_LABELS = {"email": "Email", "phone": "Phone", "id_number": "ID Number"}
+IDENTITY_FIELDS = ["email", "contact_number", "whatsapp_number", "unique_id_number"]
+
+
+def strip_characters(value, characters):
+    return (value or "").translate({ord(character): None for character in characters})
+
+
+def identity_keys(values):
+    """Return the ``(kind, value)`` lookup keys for a mapping of registration fields."""
+    keys = set()
+    email = (values.get("email") or "").strip(" ").translate(ASCII_LOWER)
+    # Same test as LIKE '_%@_%': an "@" with at least one character either side.
+    if "@" in email[1:-1]:
+        keys.add(("email", email))
+    for field_name in ("contact_number", "whatsapp_number"):
+        phone = strip_characters(values.get(field_name), PHONE_SEPARATORS)[-PHONE_KEY_DIGITS:]
+        if len(phone) >= MIN_PHONE_DIGITS:
+            keys.add(("phone", phone))
+    id_number = strip_characters(values.get("unique_id_number"), ID_NUMBER_SEPARATORS)
+    if len(id_number) >= MIN_ID_NUMBER_LENGTH:
+        keys.add(("id_number", id_number.translate(ASCII_UPPER)))
+    return keys
+
+
+def find_duplicate_of(values):
+    """Return the id of the earliest registration sharing a key with ``values``.
+
+    At most four point lookups on the (kind, value) index, however many
+    registrations exist.
+    """
+    keys = identity_keys(values)
+    if not keys:
+        return None
+    condition = Q()
+    for kind, value in keys:
+        condition |= Q(kind=kind, value=value)
+    return (
+        RegistrationIdentity.objects.filter(condition)
+        .order_by("registration_id")
+        .values_list("registration_id", flat=True)
+        .first()
+    )
+
+
+def find_earlier_duplicates(registrations):
+    """Map each saved registration's id to the earliest earlier one sharing a key.
+
+    The batch form of :func:`find_duplicate_of`, for rows already inserted
+    together, such as a drained outbox batch: one indexed lookup per key kind,
+    and rows in ``registrations`` match each other as well as older ones.
+    Registrations with no earlier match map to ``None``.
+    """
+    keys = {
+        registration.id: identity_keys(
+            {field_name: getattr(registration, field_name) for field_name in IDENTITY_FIELDS}
+        )
+        for registration in registrations
+    }
+    values_by_kind = {}
+    for registration_keys in keys.values():
+        for kind, value in registration_keys:
+            values_by_kind.setdefault(kind, set()).add(value)
+    condition = Q(pk__in=[])
+    for kind, values in values_by_kind.items():
+        condition |= Q(kind=kind, value__in=values)
+
+    first = {}
+    for kind, value, registration_id in RegistrationIdentity.objects.filter(
+        condition
+    ).values_list("kind", "value", "registration_id"):
+        first[kind, value] = min(first.get((kind, value), registration_id), registration_id)
+    earlier = {}
+    for registration_id, registration_keys in keys.items():
+        earliest = min((first[key] for key in registration_keys if key in first), default=None)
+        earlier[registration_id] = (
+            earliest if earliest is not None and earliest < registration_id else None
+        )
+    return earlier
+
+
+def find_root(parents, node):
+    root = node
+    while parents[root] != root:
+        root = parents[root]
+    while parents[node] != root:
+        parents[node], node = root, parents[node]
+    return root
+
+
+def duplicate_clusters():
+    """Group registrations linked by any shared key, largest clusters first.
+
+    Reads the identity index once in key order, so registrations sharing a
+    key arrive together; a union-find then merges chains such as "A shares an
+    email with B, B shares a phone with C". Linear in the number of keys, with
+    no pairwise comparison.
+    """
+    parents = {}
+    shared_keys = {}
+    identities = (
+        RegistrationIdentity.objects.order_by("kind", "value")
+        .values_list("kind", "value", "registration_id")
+        .iterator(chunk_size=5000)
+    )
+    for (kind, value), rows in groupby(identities, key=lambda row: row[:2]):
+        registration_ids = [registration_id for _kind, _value, registration_id in rows]
+        if len(registration_ids) < 2:
+            continue
+        for registration_id in registration_ids:
+            parents.setdefault(registration_id, registration_id)
+        first = find_root(parents, registration_ids[0])
+        for registration_id in registration_ids[1:]:
+            parents[find_root(parents, registration_id)] = first
+        shared_keys[(kind, value)] = registration_ids[0]
+
+    members = {}
+    for registration_id in parents:
+        members.setdefault(find_root(parents, registration_id), []).append(registration_id)
+    keys_by_root = {}
+    for key, registration_id in shared_keys.items():
+        keys_by_root.setdefault(find_root(parents, registration_id), []).append(key)
+
+    registrations = {}
+    registration_ids = list(parents)
+    for start in range(0, len(registration_ids), CLUSTER_FETCH_SIZE):
+        for registration in StudentRegistration.objects.filter(
+            id__in=registration_ids[start : start + CLUSTER_FETCH_SIZE]
+        ).only("id", "full_name", "email", "contact_number", "submitted_at", "account_created"):
+            registrations[registration.id] = registration
+
+    clusters = [
+        {
+            "registrations": [registrations[registration_id] for registration_id in sorted(ids)],
+            "keys": [
+                (IDENTITY_KIND_LABELS[kind], value) for kind, value in sorted(keys_by_root[root])
+            ],
+        }
+        for root, ids in members.items()
+    ]
+    clusters.sort(
+        key=lambda cluster: (-len(cluster["registrations"]), cluster["registrations"][0].id)
+    )
+    return clusters
@@ -0,0 +1,436 @@
+import csv
+import io
+import json
+from itertools import chain, islice
+
+from asgiref.sync import sync_to_async
+from django.db.models import F
+
+from .archive import registration_from_archive
+from .binding import REGISTRATION_BINDER
+from .models import ArchivedRegistration, RegistrationChange
+from .registration_fields import REGISTRATION_SECTIONS
+
+
+EXPORT_CHUNK_SIZE = 2000
+# Rows per Parquet row group. Each group is built in memory as Python lists
+# before it is encoded, so this bounds the export's peak memory.
+PARQUET_ROW_GROUP_SIZE = 20000
+DELTA_EXPORT_LIMIT = 5000
+MAX_DELTA_EXPORT_LIMIT = 50000
+
+SUMMARY_EXPORT_FIELDS = [
+    "full_name",
+    "email",
+    "contact_number",
+    "batch_no",
+    "batch_timings",
+    "faculty_name",
+    "graduation_status",
+    "preferred_job_location",
+    "application_status",
+    "referral_source",
+]
+
+
+# Admin columns a CSV only carries when ``?columns=`` names them, so that the
+# default layout CRM and spreadsheet imports rely on stays as it was.
+EXPORT_OPTIONAL_COLUMNS = {"duplicate_of_id": "duplicate_of_id"}
+
+
+def registration_export_fields(columns, export_format="csv"):
+    """Field names for ``?columns=``: a comma-separated list such as "all,duplicate_of_id".
+
+    "all" selects every answer instead of SUMMARY_EXPORT_FIELDS; names from
+    EXPORT_OPTIONAL_COLUMNS add those columns.
+    """
+    choices = {choice.strip() for choice in columns.split(",")}
+    # The typed formats are for analysis and always carry every column.
+    if "all" in choices or export_format != "csv":
+        field_names = [
+            field_name
+            for _section_title, fields in REGISTRATION_SECTIONS
+            for field_name, _field_label, _field_type in fields
+        ]
+    else:
+        field_names = SUMMARY_EXPORT_FIELDS
+    return [
+        *field_names,
+        *(
+            name
+            for name in EXPORT_OPTIONAL_COLUMNS
+            if name in choices or export_format != "csv"
+        ),
+    ]
+
+
+EXPORT_LEADING_COLUMNS = [
+    ("registration_id", "id"),
+    ("submitted_at", "submitted_at"),
+]
+
+EXPORT_TRAILING_COLUMNS = [
+    ("account_created", "account_created"),
+    ("created_user_id", "created_user_id"),
+    ("created_username", "created_user__username"),
+]
+
+
+def export_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def export_columns(field_names):
+    return [
+        *EXPORT_LEADING_COLUMNS,
+        *[
+            (field_name, field_name)
+            for field_name in field_names
+            if field_name not in EXPORT_OPTIONAL_COLUMNS
+        ],
+        *EXPORT_TRAILING_COLUMNS,
+        *[
+            (field_name, EXPORT_OPTIONAL_COLUMNS[field_name])
+            for field_name in field_names
+            if field_name in EXPORT_OPTIONAL_COLUMNS
+        ],
+    ]
+
+
+class CsvChunks:
+    """Collect CSV rows and hand them out as encoded chunks."""
+
+    def __init__(self, columns):
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+        self.writer.writerow([header for header, _ in columns])
+
+    def write(self, row):
+        self.writer.writerow([export_cell(value) for value in row])
+
+    def flush(self):
+        chunk = self.buffer.getvalue().encode("utf-8")
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return chunk
+
+
+def export_rows(registrations, columns):
+    return registrations.values_list(*[lookup for _, lookup in columns])
+
+
+def archived_export_rows(archived, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    # The tuples export_rows() would give, rebuilt from the compressed answers.
+    entries = archived.annotate(created_username=F("created_user__username"))
+    for entry in entries.iterator(chunk_size=chunk_size):
+        registration = registration_from_archive(entry)
+        yield tuple(
+            entry.created_username
+            if lookup == "created_user__username"
+            else getattr(registration, lookup)
+            for _, lookup in columns
+        )
+
+
+def iter_export_rows(registrations, columns, archived=None, chunk_size=EXPORT_CHUNK_SIZE):
+    """Iterate the export rows of ``registrations``, then of ``archived`` if given."""
+    rows = export_rows(registrations, columns).iterator(chunk_size=chunk_size)
+    if archived is None:
+        return rows
+    return chain(rows, archived_export_rows(archived, columns, chunk_size))
+
+
+def stream_registrations_csv(
+    registrations, field_names, archived=None, chunk_size=EXPORT_CHUNK_SIZE
+):
+    """Yield the CSV export as encoded chunks of ``chunk_size`` rows.
+
+    Rows are read as tuples through ``values_list().iterator()`` so neither the
+    model instances nor the finished file are ever held in memory.
+    """
+    columns = export_columns(field_names)
+    chunks = CsvChunks(columns)
+    rows = iter_export_rows(registrations, columns, archived, chunk_size)
+    for index, row in enumerate(rows, start=1):
+        chunks.write(row)
+        if index % chunk_size == 0:
+            yield chunks.flush()
+    yield chunks.flush()
+
+
+async def astream_export(chunks):
+    """Iterate a sync export generator from an async view, e.g. under ASGI.
+
+    Each chunk is produced in the database thread and the event loop is free
+    in between; under ASGI Django would buffer a sync iterator in full before
+    sending it. ``aiterator()`` is not used because on ``values_list()`` it
+    starts the query on the event loop.
+    """
+    next_chunk = sync_to_async(next)
+    while True:
+        chunk = await next_chunk(chunks, None)
+        if chunk is None:
+            break
+        yield chunk
+
+
+# Column kinds for the typed formats, keyed by export column header; columns
+# not listed are text. Select fields whose only options are Yes/No become
+# booleans and the other select fields categoricals over their options.
+EXPORT_COLUMN_KINDS = {
+    "registration_id": ("int", None),
+    "submitted_at": ("datetime", None),
+    "account_created": ("bool", None),
+    "created_user_id": ("int", None),
+    "duplicate_of_id": ("int", None),
+}
+for binder_field in REGISTRATION_BINDER:
+    if binder_field.kind == "date":
+        EXPORT_COLUMN_KINDS[binder_field.name] = ("date", None)
+    elif binder_field.kind == "select" and set(binder_field.options) == {"yes", "no"}:
+        EXPORT_COLUMN_KINDS[binder_field.name] = ("yes_no", None)
+    elif binder_field.kind == "select":
+        EXPORT_COLUMN_KINDS[binder_field.name] = (
+            "category",
+            tuple(binder_field.options.values()),
+        )
+
+
+def export_column_kinds(columns):
+    return [EXPORT_COLUMN_KINDS.get(header, ("text", None)) for header, _ in columns]
+
+
+def typed_export_value(kind, value):
+    """Convert a stored value to its typed form; a blank choice becomes ``None``."""
+    if kind == "yes_no":
+        return {"Yes": True, "No": False}.get(value)
+    if kind == "category":
+        return value or None
+    return value
+
+
+def stream_registrations_jsonl(
+    registrations, field_names, archived=None, chunk_size=EXPORT_CHUNK_SIZE
+):
+    """Yield the export as JSON Lines, one object per registration.
+
+    Yes/No answers are booleans, blank choices ``null`` and dates ISO 8601
+    strings.
+    """
+    columns = export_columns(field_names)
+    headers = [header for header, _ in columns]
+    kinds = [kind for kind, _options in export_column_kinds(columns)]
+    encoder = json.JSONEncoder(ensure_ascii=False, default=lambda value: value.isoformat())
+    rows = iter_export_rows(registrations, columns, archived, chunk_size)
+    lines = []
+    for index, row in enumerate(rows, start=1):
+        record = {
+            header: typed_export_value(kind, value)
+            for header, kind, value in zip(headers, kinds, row)
+        }
+        lines.append(encoder.encode(record))
+        if index % chunk_size == 0:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class ByteChunks:
+    """Write-only file object whose written bytes are collected by ``take()``.
+
+    ``tell()`` keeps counting across ``take()`` calls, as the Parquet writer
+    records absolute offsets in the file footer.
+    """
+
+    closed = False
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        chunk = b"".join(self.parts)
+        self.parts = []
+        return chunk
+
+
+def parquet_column(pa, kind, options, values):
+    if kind == "int":
+        return pa.array(values, pa.int64())
+    if kind == "bool":
+        return pa.array(values, pa.bool_())
+    if kind == "yes_no":
+        return pa.array([typed_export_value(kind, value) for value in values], pa.bool_())
+    if kind == "date":
+        return pa.array(values, pa.date32())
+    if kind == "datetime":
+        return pa.array(values, pa.timestamp("us", tz="UTC"))
+    if kind == "category":
+        # One fixed dictionary (the form's options) for every row group.
+        index = {option: position for position, option in enumerate(options)}
+        return pa.DictionaryArray.from_arrays(
+            pa.array([index.get(value) for value in values], pa.int8()),
+            pa.array(options, pa.string()),
+        )
+    return pa.array(values, pa.string())
+
+
+def stream_registrations_parquet(
+    registrations, field_names, archived=None, row_group_size=PARQUET_ROW_GROUP_SIZE
+):
+    """Return a generator of the export as a zstd-compressed Parquet file.
+
+    Columns are typed: ids as integers, dates and timestamps as such, Yes/No
+    answers as booleans and the other select fields dictionary-encoded over
+    their options. Rows are encoded one row group at a time. Raises
+    ``ValueError`` up front when pyarrow is not installed.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ValueError("Parquet export requires the pyarrow package.") from exc
+
+    columns = export_columns(field_names)
+    kinds = export_column_kinds(columns)
+    empty = [parquet_column(pa, kind, options, []) for kind, options in kinds]
+    schema = pa.schema(
+        [(header, array.type) for (header, _), array in zip(columns, empty)]
+    )
+
+    def chunks():
+        sink = ByteChunks()
+        writer = pq.ParquetWriter(pa.PythonFile(sink, mode="w"), schema, compression="zstd")
+        rows = iter_export_rows(registrations, columns, archived)
+        while True:
+            group = list(islice(rows, row_group_size))
+            if group:
+                arrays = [
+                    parquet_column(pa, kind, options, list(values))
+                    for (kind, options), values in zip(kinds, zip(*group))
+                ]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            if len(group) < row_group_size:
+                break
+            yield sink.take()
+        writer.close()
+        yield sink.take()
+
+    return chunks()
+
+
+# format -> how to serve it. ``stream(registrations, field_names, archived)``
+# returns an iterator of encoded chunks; ``archived`` rows, if given, follow the
+# active ones.
+EXPORT_FORMATS = {
+    "csv": {
+        "label": "CSV",
+        "content_type": "text/csv",
+        "extension": "csv",
+        "stream": stream_registrations_csv,
+    },
+    "jsonl": {
+        "label": "JSON Lines",
+        "content_type": "application/x-ndjson",
+        "extension": "jsonl",
+        "stream": stream_registrations_jsonl,
+    },
+    "parquet": {
+        "label": "Parquet",
+        "content_type": "application/vnd.apache.parquet",
+        "extension": "parquet",
+        "stream": stream_registrations_parquet,
+    },
+}
+
+
+def stream_registrations_export(registrations, field_names, export_format="csv", archived=None):
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {export_format!r}.")
+    return EXPORT_FORMATS[export_format]["stream"](registrations, field_names, archived)
+
+
+DELTA_LEADING_COLUMNS = ["change_seq", "deleted", "archived"]
+
+
+def registration_changes(since, limit=DELTA_EXPORT_LIMIT, using=None):
+    """Return ``(changes, watermark, has_more)`` for changes after seq ``since``.
+
+    ``changes`` holds up to ``limit`` ``(seq, registration_id, deleted,
+    archived)`` tuples in seq order. Passing ``watermark`` back as ``since`` picks up
+    where this page stopped; ``has_more`` says whether that would return
+    anything yet.
+    """
+    changes = list(
+        RegistrationChange.objects.using(using)
+        .filter(seq__gt=since)
+        .order_by("seq")
+        .values_list("seq", "registration_id", "deleted", "archived")[: limit + 1]
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    watermark = changes[-1][0] if changes else since
+    return changes, watermark, has_more
+
+
+def stream_registration_changes_csv(
+    registrations, changes, field_names, chunk_size=EXPORT_CHUNK_SIZE
+):
+    """Yield a CSV of ``changes`` in seq order, one encoded chunk per ``chunk_size``.
+
+    Rows carry the registration's current values, so a registration changed
+    twice since the watermark appears once. An archived registration keeps
+    its values, read back from the archive, with ``archived`` set. A deleted
+    registration, or one gone from its table after ``changes`` was read, is
+    written as a tombstone: its id and ``deleted`` set, every other cell empty.
+    """
+    columns = export_columns(field_names)
+    chunks = CsvChunks([(header, None) for header in DELTA_LEADING_COLUMNS] + columns)
+    tombstone_cells = [None] * (len(columns) - 1)
+    archive = ArchivedRegistration.objects.using(registrations.db)
+    for start in range(0, len(changes), chunk_size):
+        chunk = changes[start : start + chunk_size]
+        ids = {False: [], True: []}
+        for _seq, registration_id, deleted, archived in chunk:
+            if not deleted:
+                ids[archived].append(registration_id)
+        rows = {
+            False: {
+                row[0]: row
+                for row in export_rows(registrations.filter(id__in=ids[False]), columns)
+            },
+            True: {
+                row[0]: row
+                for row in archived_export_rows(archive.filter(id__in=ids[True]), columns)
+            },
+        }
+        for seq, registration_id, deleted, archived in chunk:
+            row = None if deleted else rows[archived].get(registration_id)
+            if row is None:
+                chunks.write([seq, True, False, registration_id, *tombstone_cells])
+            else:
+                chunks.write([seq, False, archived, *row])
+        yield chunks.flush()
+    if not changes:
+        yield chunks.flush()
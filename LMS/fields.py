@@ -0,0 +1,78 @@
+from django.core import exceptions
+from django.db import models
+
+
+class OptionField(models.PositiveSmallIntegerField):
+    """A choice from ``options`` stored as its 1-based position; blank is 0.
+
+    Python code sees the option text, as it did when these answers were
+    CharFields: assigning, filtering, ``values()`` and display all use
+    ``"Yes"``, ``"Male"`` and so on, and only the column holds the small
+    integer. Codes are positions, so options may only ever be appended.
+    """
+
+    empty_strings_allowed = True
+    description = "One of a fixed list of options"
+
+    def __init__(self, *args, options=(), **kwargs):
+        self.options = list(options)
+        self.codes = {option: code for code, option in enumerate(self.options, start=1)}
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["options"] = self.options
+        return name, path, args, kwargs
+
+    @property
+    def validators(self):
+        # The integer range validators would compare option text with numbers.
+        return list(self._validators)
+
+    def decode(self, code):
+        if code is None or isinstance(code, str):
+            return code
+        return self.options[code - 1] if code else ""
+
+    def from_db_value(self, value, expression, connection):
+        return self.decode(value)
+
+    def to_python(self, value):
+        return self.decode(value)
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None or isinstance(value, int):
+            return value
+        if value == "":
+            return 0
+        try:
+            return self.codes[value]
+        except KeyError:
+            raise ValueError(f"Field '{self.name}' expects one of {self.options}, got {value!r}.")
+
+    def validate(self, value, model_instance):
+        super().validate(value, model_instance)
+        if value and value not in self.codes:
+            raise exceptions.ValidationError(
+                "%(value)r is not one of the options.",
+                code="invalid_choice",
+                params={"value": value},
+            )
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj) or ""
+
+
+class SearchDocumentField(models.TextField):
+    """The hidden FTS5 column named after its table, used as the MATCH target."""
+
+
+@SearchDocumentField.register_lookup
+class FullTextMatch(models.Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
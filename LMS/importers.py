@@ -0,0 +1,151 @@
+import csv
+from datetime import date, datetime
+
+from django.db import transaction
+
+from .binding import REGISTRATION_BINDER, bind_registration
+from .models import StudentRegistration
+from .stats import record_registrations_added
+
+
+IMPORT_BATCH_SIZE = 1000
+# What a malformed upload raises part-way through reading: a bad encoding, a NUL
+# byte or an oversized CSV field, or a missing openpyxl for an XLSX file.
+SPREADSHEET_READ_ERRORS = (csv.Error, UnicodeDecodeError, ValueError)
+
+FIELD_LABELS = {field.name: field.label for field in REGISTRATION_BINDER}
+
+
+def normalize_header(header):
+    return " ".join(str(header or "").split()).casefold()
+
+
+# Spreadsheet headers may use either the form label or the model field name.
+COLUMN_MAP = {
+    **{normalize_header(field_name): field_name for field_name in FIELD_LABELS},
+    **{normalize_header(field_label): field_name for field_name, field_label in FIELD_LABELS.items()},
+}
+
+
+def cell_text(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def read_csv_rows(binary_file):
+    # Decoded a line at a time, so an encoding error surfaces on the row that has
+    # it rather than wherever the decoder's read-ahead happened to reach.
+    yield from csv.reader(line.decode("utf-8-sig") for line in binary_file)
+
+
+def read_xlsx_rows(binary_file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise ValueError("XLSX import requires the openpyxl package; upload a CSV file.") from exc
+
+    workbook = load_workbook(binary_file, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield [cell_text(value) for value in row]
+    finally:
+        workbook.close()
+
+
+def read_spreadsheet_rows(binary_file, filename):
+    if filename.lower().endswith(".xlsx"):
+        return read_xlsx_rows(binary_file)
+    return read_csv_rows(binary_file)
+
+
+def save_import_batch(batch):
+    with transaction.atomic():
+        StudentRegistration.objects.bulk_create(batch)
+        # bulk_create skips post_save, so count the batch here.
+        record_registrations_added(batch)
+    return len(batch)
+
+
+def numbered_rows(rows, report):
+    """Yield ``(sheet row number, row)`` until ``rows`` ends or cannot be read.
+
+    A read error stops the import where it happened and is reported against the
+    first row that could not be read; the rows before it are still imported.
+    """
+    rows = iter(rows)
+    row_number = 1
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except SPREADSHEET_READ_ERRORS as exc:
+            report["errors"].append(
+                {
+                    "row": row_number,
+                    "errors": [f"Could not read the file from this row on: {exc}"],
+                }
+            )
+            return
+        yield row_number, row
+        row_number += 1
+
+
+def import_registrations(rows, batch_size=IMPORT_BATCH_SIZE):
+    """Validate spreadsheet ``rows`` and insert the valid ones in batches.
+
+    ``rows`` is an iterable of cell lists whose first entry is the header row.
+    Each batch commits on its own, so a bad row never discards earlier work; it is
+    reported as ``{"row": <1-based sheet row>, "errors": [...]}`` instead, as is a
+    file that stops being readable part-way through.
+    """
+    report = {"created": 0, "errors": [], "ignored_columns": []}
+    rows = numbered_rows(rows, report)
+    _row_number, header = next(rows, (1, None))
+    if report["errors"]:
+        return report
+    header = header or []
+    columns = [COLUMN_MAP.get(normalize_header(column)) for column in header]
+    report["ignored_columns"] = [
+        str(column) for column, field_name in zip(header, columns) if column and not field_name
+    ]
+
+    missing = [
+        field.label for field in REGISTRATION_BINDER if field.required and field.name not in columns
+    ]
+    if missing:
+        report["errors"].append(
+            {"row": 1, "errors": [f"Missing required column(s): {', '.join(missing)}."]}
+        )
+        return report
+
+    batch = []
+    for row_number, row in rows:
+        values = {
+            field_name: cell_text(value)
+            for field_name, value in zip(columns, row)
+            if field_name
+        }
+        if not any(values.values()):
+            continue
+
+        values, errors = bind_registration(values)
+        if errors:
+            report["errors"].append({"row": row_number, "errors": errors})
+            continue
+
+        batch.append(StudentRegistration(**values))
+        if len(batch) >= batch_size:
+            report["created"] += save_import_batch(batch)
+            batch = []
+
+    if batch:
+        report["created"] += save_import_batch(batch)
+    return report
@@ -0,0 +1,249 @@
+import csv
+import io
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connections
+from django.db.models import F
+from django.utils import timezone
+
+from .exports import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    registration_export_fields,
+    stream_registrations_export,
+)
+from .models import BackgroundJob
+from .provisioning import CREDENTIAL_SHEET_HEADER, provision_credentials
+from .search import filter_archived_registrations, filter_registrations
+
+
+logger = logging.getLogger(__name__)
+
+# Progress is written at most this often, so tight loops do not become a
+# stream of UPDATEs.
+PROGRESS_INTERVAL = 0.5
+DEFAULT_JOB_WORKERS = 2
+# A running job whose worker has not touched it for this long is failed.
+DEFAULT_STALE_JOB_SECONDS = 5 * 60
+JOB_POOLS = ("thread", "process")
+
+
+def queued_jobs_enabled():
+    return getattr(settings, "LMS_BACKGROUND_JOBS", "worker") == "worker"
+
+
+def artifacts_root():
+    return Path(getattr(settings, "LMS_JOB_ARTIFACTS", settings.BASE_DIR / "job_artifacts"))
+
+
+def job_artifact_path(job):
+    return artifacts_root() / str(job.id) / job.artifact
+
+
+def write_artifact(job, name, write):
+    """Create ``name`` for ``job`` through ``write(handle)`` and return ``name``.
+
+    The file is only readable by the server's user and appears under its final
+    name once complete, so a download never sees half a file.
+    """
+    directory = artifacts_root() / str(job.id)
+    directory.mkdir(parents=True, exist_ok=True)
+    partial = directory / f".{name}.partial"
+    with open(os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as handle:
+        write(handle)
+    os.replace(partial, directory / name)
+    return name
+
+
+def export_registrations_job(job, progress):
+    registrations, _q, _status, _batch = filter_registrations(job.params)
+    archived = filter_archived_registrations(job.params)
+    export_format = job.params.get("format", "csv")
+    field_names = registration_export_fields(job.params.get("columns", ""), export_format)
+    chunks = stream_registrations_export(registrations, field_names, export_format, archived)
+    total = registrations.count() + (0 if archived is None else archived.count())
+    progress(0, total)
+
+    def write(handle):
+        # An estimate: a Parquet chunk is a whole row group, not EXPORT_CHUNK_SIZE
+        # rows. Finishing the job sets progress to the total either way.
+        for index, chunk in enumerate(chunks, start=1):
+            handle.write(chunk)
+            progress(min(total, index * EXPORT_CHUNK_SIZE), total)
+
+    extension = EXPORT_FORMATS[export_format]["extension"]
+    return write_artifact(job, f"student_registrations.{extension}", write)
+
+
+def provision_credentials_job(job, progress):
+    registrations, _q, _status, _batch = filter_registrations(job.params)
+    try:
+        credentials = provision_credentials(
+            registrations, job.params["username_format"], job.params["password_length"], progress
+        )
+    except IntegrityError as exc:
+        raise ValueError("A generated username is already taken. Please retry.") from exc
+    if not credentials:
+        job.message = "No pending registrations matched the filters."
+        return ""
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CREDENTIAL_SHEET_HEADER)
+    writer.writerows(credentials)
+    return write_artifact(
+        job, "student_credentials.csv", lambda handle: handle.write(buffer.getvalue().encode())
+    )
+
+
+# kind -> how to run it. A handler takes (job, progress) and returns the file
+# name of its artifact, or "". Artifacts marked download_once hold secrets
+# and are deleted as soon as they are downloaded.
+JOB_KINDS = {
+    "export_registrations": {
+        "label": "Registrations export",
+        "run": export_registrations_job,
+        "download_once": False,
+    },
+    "provision_credentials": {
+        "label": "Credential provisioning",
+        "run": provision_credentials_job,
+        "download_once": True,
+    },
+}
+
+
+def job_label(job):
+    return JOB_KINDS[job.kind]["label"] if job.kind in JOB_KINDS else job.kind
+
+
+def job_progress(job_id):
+    """Return a ``progress(done, total)`` callback that records onto the job row."""
+    last_saved = 0.0
+
+    def progress(done, total):
+        nonlocal last_saved
+        now = time.monotonic()
+        if done < total and now - last_saved < PROGRESS_INTERVAL:
+            return
+        last_saved = now
+        BackgroundJob.objects.filter(id=job_id).update(progress=done, total=total)
+
+    return progress
+
+
+def enqueue_job(kind, params, user=None):
+    """Create a ``kind`` job; run it now unless a worker is configured to pick it up."""
+    job = BackgroundJob.objects.create(kind=kind, params=params, created_by=user)
+    if not queued_jobs_enabled():
+        now = timezone.now()
+        BackgroundJob.objects.filter(id=job.id).update(
+            status=BackgroundJob.RUNNING, started_at=now, heartbeat_at=now
+        )
+        run_job(job.id)
+        job.refresh_from_db()
+    return job
+
+
+def claim_next_job():
+    """Mark the oldest queued job running and return its id, or ``None``.
+
+    The conditional UPDATE is the lock: when two workers pick the same row,
+    only one update matches and the other moves on to the next job.
+    """
+    while True:
+        job_id = (
+            BackgroundJob.objects.filter(status=BackgroundJob.QUEUED)
+            .order_by("id")
+            .values_list("id", flat=True)
+            .first()
+        )
+        if job_id is None:
+            return None
+        now = timezone.now()
+        claimed = BackgroundJob.objects.filter(id=job_id, status=BackgroundJob.QUEUED).update(
+            status=BackgroundJob.RUNNING, started_at=now, heartbeat_at=now
+        )
+        if claimed:
+            return job_id
+
+
+def finish_job(job_id, status, **fields):
+    BackgroundJob.objects.filter(id=job_id).update(
+        status=status, finished_at=timezone.now(), **fields
+    )
+
+
+def run_job(job_id):
+    """Run a claimed job to completion and return its final status."""
+    job = BackgroundJob.objects.get(id=job_id)
+    job.message = ""
+    try:
+        if job.kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind {job.kind!r}.")
+        artifact = JOB_KINDS[job.kind]["run"](job, job_progress(job.id))
+    except Exception as exc:
+        logger.exception("Background job %s (%s) failed", job.id, job.kind)
+        finish_job(job.id, BackgroundJob.FAILED, message=str(exc) or exc.__class__.__name__)
+        return BackgroundJob.FAILED
+    finish_job(
+        job.id,
+        BackgroundJob.SUCCEEDED,
+        artifact=artifact or "",
+        message=job.message,
+        progress=F("total"),
+    )
+    return BackgroundJob.SUCCEEDED
+
+
+def run_claimed_job(job_id):
+    # Pool workers live across many jobs; treat each like a request and drop
+    # connections that are broken or past CONN_MAX_AGE.
+    close_old_connections()
+    try:
+        return run_job(job_id)
+    finally:
+        close_old_connections()
+
+
+def touch_jobs(job_ids):
+    BackgroundJob.objects.filter(id__in=list(job_ids)).update(heartbeat_at=timezone.now())
+
+
+def fail_stale_jobs(stale_after=DEFAULT_STALE_JOB_SECONDS):
+    """Fail running jobs whose worker stopped heartbeating, e.g. after a crash."""
+    cutoff = timezone.now() - timedelta(seconds=stale_after)
+    return BackgroundJob.objects.filter(
+        status=BackgroundJob.RUNNING, heartbeat_at__lt=cutoff
+    ).update(
+        status=BackgroundJob.FAILED,
+        message="The worker stopped before the job finished.",
+        finished_at=timezone.now(),
+    )
+
+
+def job_pool(pool, workers):
+    if pool == "process":
+        # Forked, so workers start with Django already set up; submit_job closes
+        # this process's connections before any worker can inherit them.
+        return ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("fork")
+        )
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lms-job")
+
+
+def submit_job(pool, job_id):
+    if isinstance(pool, ProcessPoolExecutor):
+        connections.close_all()
+    try:
+        return pool.submit(run_claimed_job, job_id)
+    except BrokenExecutor:
+        finish_job(job_id, BackgroundJob.FAILED, message="The worker pool stopped.")
+        raise
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from LMS.archive import (
+    ARCHIVE_CHUNK_SIZE,
+    archive_registrations,
+    restore_registrations,
+    select_for_archive,
+)
+from LMS.models import ArchivedRegistration, StudentRegistration
+
+
+class Command(BaseCommand):
+    help = (
+        "Move registrations from closed batches, or submitted more than N months ago, "
+        "into the compressed archive table, or with --restore move them back. Archived "
+        "registrations leave the dashboard, search and exports unless include_archived "
+        "is asked for."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch",
+            action="append",
+            default=[],
+            dest="batches",
+            help="A closed batch number (any case); repeat for several.",
+        )
+        parser.add_argument("--older-than-months", type=int)
+        parser.add_argument(
+            "--restore", action="store_true", help="Move matching archived registrations back."
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Count the matches without moving them."
+        )
+        parser.add_argument("--chunk-size", type=int, default=ARCHIVE_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        batches, older_than_months = options["batches"], options["older_than_months"]
+        if not batches and older_than_months is None:
+            raise CommandError("Pass --batch, --older-than-months or both.")
+        if older_than_months is not None and older_than_months < 0:
+            raise CommandError("--older-than-months must be 0 or more.")
+
+        if options["restore"]:
+            source, move, action = ArchivedRegistration, restore_registrations, "Restored"
+        else:
+            source, move, action = StudentRegistration, archive_registrations, "Archived"
+        matches = select_for_archive(source.objects.all(), batches, older_than_months)
+
+        if options["dry_run"]:
+            self.stdout.write(f"{matches.count()} registrations match.")
+            return
+        moved = move(matches, chunk_size=options["chunk_size"])
+        self.stdout.write(self.style.SUCCESS(f"{action} {moved} registrations."))
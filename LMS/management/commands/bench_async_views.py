@@ -0,0 +1,56 @@
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from LMS.benchmarks.async_views import run_async_view_benchmarks
+from LMS.benchmarks.data import BENCHMARK_SCALES, scratch_benchmark_database, seed_benchmark_data
+from LMS.models import StudentRegistration
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database, serve the dashboards, registration detail and CSV "
+        "export through Django's ASGI handler under concurrent load, and compare "
+        "throughput, latency and peak memory of the sync and async views."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=list(BENCHMARK_SCALES), default="1k")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per view and mode.")
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--only", default="", help="Run views whose name contains this.")
+        parser.add_argument(
+            "--data-dir",
+            type=Path,
+            help="Keep the seeded database here and reuse it on later runs.",
+        )
+
+    def handle(self, *args, **options):
+        scale = options["scale"]
+        with tempfile.TemporaryDirectory() as scratch:
+            data_dir = options["data_dir"] or Path(scratch)
+            data_dir.mkdir(parents=True, exist_ok=True)
+            with scratch_benchmark_database(
+                data_dir / f"bench-views-{scale}.sqlite3", keepdb=bool(options["data_dir"])
+            ):
+                if not StudentRegistration.objects.exists():
+                    self.stdout.write(f"Seeding {BENCHMARK_SCALES[scale]} registrations...")
+                    seed_benchmark_data(BENCHMARK_SCALES[scale])
+                results = run_async_view_benchmarks(
+                    options["requests"], options["concurrency"], options["only"]
+                )
+
+        self.stdout.write(
+            f"{options['requests']} requests per view, concurrency {options['concurrency']}"
+        )
+        for name, modes in results.items():
+            for mode, metrics in modes.items():
+                self.stdout.write(
+                    f"{name:<22} {mode:<6} {metrics['requests_per_s']:8.1f} req/s"
+                    f"  p50 {metrics['p50_ms']:8.2f} ms  p95 {metrics['p95_ms']:8.2f} ms"
+                    f"  first byte {metrics['first_byte_p50_ms']:8.2f} ms"
+                    f"  {metrics['peak_kib']:10.1f} KiB peak"
+                )
+            speedup = modes["async"]["requests_per_s"] / modes["sync"]["requests_per_s"]
+            self.stdout.write(f"{name:<22} async/sync throughput {speedup:.2f}x")
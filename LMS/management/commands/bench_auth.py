@@ -0,0 +1,49 @@
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from hope.auth import PASSWORD_HASHER_PROFILES, SESSION_PROFILES
+from LMS.benchmarks.auth import run_auth_benchmarks
+from LMS.benchmarks.data import scratch_benchmark_database, seed_benchmark_data
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database and measure student logins per second and the "
+        "latency and query count of a logged-in dashboard request, for each session "
+        "profile with and without the cached user backend. Figures are per core."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", nargs="+", default=list(SESSION_PROFILES))
+        parser.add_argument(
+            "--hashers",
+            nargs="+",
+            choices=list(PASSWORD_HASHER_PROFILES),
+            default=["pbkdf2"],
+            help="Password hasher profiles to time; 'argon2' needs argon2-cffi.",
+        )
+        parser.add_argument("--logins", type=int, default=20, help="Timed logins per setup.")
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Timed dashboard requests per setup."
+        )
+        parser.add_argument("--rows", type=int, default=1000, help="Registrations seeded.")
+
+    def handle(self, *args, **options):
+        with tempfile.TemporaryDirectory() as scratch:
+            with scratch_benchmark_database(Path(scratch) / "bench-auth.sqlite3"):
+                seed_benchmark_data(options["rows"])
+                hashing, sessions = run_auth_benchmarks(
+                    options["logins"], options["requests"], options["profiles"], options["hashers"]
+                )
+
+        for profile, checks_per_s in hashing.items():
+            self.stdout.write(f"{profile + ' hashing':<40} {checks_per_s:7.1f} password checks/s")
+        self.stdout.write(f"Logins hash with the {settings.PASSWORD_HASHER_PROFILE!r} profile.")
+        for name, metrics in sessions.items():
+            self.stdout.write(
+                f"{name:<40} {metrics['logins_per_s']:7.1f} logins/s"
+                f"  dashboard p50 {metrics['p50_ms']:7.2f} ms  {metrics['queries']} queries"
+            )
@@ -0,0 +1,137 @@
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, close_old_connections, connections
+
+from hope.database import SQLITE_PROFILES
+from LMS.benchmarks.common import latency_summary, sample_submission
+from LMS.benchmarks.data import scratch_benchmark_database
+from LMS.binding import bind_registration
+from LMS.models import StudentRegistration
+from LMS.pagination import keyset_paginate
+
+
+def seed_registrations(count, values):
+    StudentRegistration.objects.bulk_create(
+        (StudentRegistration(**values) for _ in range(count)), batch_size=1000
+    )
+
+
+def read_dashboard():
+    registrations = StudentRegistration.objects.filter(account_created=False)
+    registrations.count()
+    keyset_paginate(registrations, [("submitted_at", True), ("id", True)])
+
+
+def write_registration(values):
+    StudentRegistration(**values).save()
+
+
+def run_worker(values, write_ratio, deadline, seed, results):
+    rng = random.Random(seed)
+    latencies, errors = [], 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if rng.random() < write_ratio:
+                write_registration(values)
+            else:
+                read_dashboard()
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors += 1
+        finally:
+            # Emulate request_finished: drops the connection unless CONN_MAX_AGE keeps it.
+            close_old_connections()
+    connections["default"].close()
+    results.append((latencies, errors))
+
+
+class Command(BaseCommand):
+    help = (
+        "Run a mixed read/write workload from concurrent threads against a scratch "
+        "SQLite database under each database profile and compare throughput. Each "
+        "profile runs in its own process with HOPE_DATABASE_PROFILE set, so it is "
+        "configured exactly as settings would configure it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", nargs="+", default=list(SQLITE_PROFILES))
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--seconds", type=float, default=10.0)
+        parser.add_argument("--write-ratio", type=float, default=0.2)
+        parser.add_argument("--rows", type=int, default=20000, help="Rows seeded before the run.")
+        parser.add_argument(
+            "--database", type=Path, help="Run this process's own profile against this file."
+        )
+
+    def handle(self, *args, **options):
+        if options["database"]:
+            self.run_profile(options["database"], options)
+            return
+
+        unknown = set(options["profiles"]) - set(SQLITE_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown database profiles: {', '.join(sorted(unknown))}.")
+        with tempfile.TemporaryDirectory() as scratch:
+            for profile in options["profiles"]:
+                command = [
+                    sys.executable,
+                    str(Path(settings.BASE_DIR) / "manage.py"),
+                    "bench_database_profile",
+                    "--database",
+                    str(Path(scratch) / f"{profile}.sqlite3"),
+                    *(
+                        f"--{name.replace('_', '-')}={options[name]}"
+                        for name in ("threads", "seconds", "write_ratio", "rows")
+                    ),
+                ]
+                result = subprocess.run(
+                    command,
+                    env={**os.environ, "HOPE_DATABASE_PROFILE": profile},
+                    capture_output=True,
+                    text=True,
+                )
+                if result.returncode:
+                    raise CommandError(f"Profile {profile!r} failed:\n{result.stderr}")
+                self.stdout.write(result.stdout, ending="")
+
+    def run_profile(self, database_path, options):
+        values, errors = bind_registration(sample_submission())
+        if errors:
+            raise ValueError(f"Sample submission does not bind: {errors}")
+
+        with scratch_benchmark_database(database_path):
+            seed_registrations(options["rows"], values)
+            connections["default"].close()
+
+            results = []
+            deadline = time.perf_counter() + options["seconds"]
+            workers = [
+                threading.Thread(
+                    target=run_worker,
+                    args=(values, options["write_ratio"], deadline, index, results),
+                )
+                for index in range(options["threads"])
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        latencies = [latency for worker_latencies, _ in results for latency in worker_latencies]
+        failures = sum(worker_errors for _, worker_errors in results)
+        summary = latency_summary(latencies)
+        self.stdout.write(
+            f"{settings.DATABASE_PROFILE:>8}: {len(latencies) / options['seconds']:8.1f} ops/s, "
+            f"{failures} locked, "
+            + ", ".join(f"{name} {value * 1000:.1f} ms" for name, value in summary.items())
+        )
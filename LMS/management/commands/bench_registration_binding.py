@@ -0,0 +1,84 @@
+import json
+import statistics
+import timeit
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from LMS.benchmarks.common import sample_submission
+from LMS.binding import bind_registration
+from LMS.models import StudentRegistration
+
+
+def bind_submission(data):
+    values, errors = bind_registration(data)
+    if errors:
+        return None
+    return StudentRegistration(**values)
+
+
+def binding_cases():
+    accepted = sample_submission()
+    rejected = sample_submission()
+    rejected["email"] = "not-an-email"
+    rejected["gender"] = "unknown"
+    rejected["date_of_birth"] = "17/04/2001"
+    return {"accepted submission": accepted, "rejected submission": rejected}
+
+
+class Command(BaseCommand):
+    help = (
+        "Time registration binding per submission and compare it with a saved JSON "
+        "baseline; run with --save on the revision to compare against first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--number", type=int, default=2000, help="Submissions per timing run.")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            help="Baseline JSON file; defaults to benchmarks/registration-binding.json.",
+        )
+        parser.add_argument(
+            "--save", action="store_true", help="Write these results as the new baseline."
+        )
+        parser.add_argument("--tolerance", type=float, default=0.25)
+
+    def handle(self, *args, **options):
+        baseline_path = options["baseline"] or (
+            Path(settings.BASE_DIR) / "benchmarks" / "registration-binding.json"
+        )
+        results = {}
+        for label, data in binding_cases().items():
+            runs = timeit.repeat(
+                lambda: bind_submission(data), number=options["number"], repeat=options["repeat"]
+            )
+            per_call = [run / options["number"] * 1_000_000 for run in runs]
+            results[label] = min(per_call)
+            self.stdout.write(
+                f"{label:>20}: {min(per_call):7.1f} us/submission "
+                f"(median {statistics.median(per_call):.1f} us)"
+            )
+
+        if options["save"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+            self.stdout.write(f"Saved baseline to {baseline_path}.")
+            return
+        if not baseline_path.exists():
+            self.stdout.write(f"No baseline at {baseline_path}; rerun with --save to record one.")
+            return
+
+        baseline = json.loads(baseline_path.read_text())
+        regressions = [
+            f"{label}: {baseline[label]:.1f} -> {us:.1f} us"
+            for label, us in results.items()
+            if label in baseline and us > baseline[label] * (1 + options["tolerance"])
+        ]
+        if regressions:
+            raise CommandError(
+                f"Binding regressions against {baseline_path}:\n  " + "\n  ".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {baseline_path}."))
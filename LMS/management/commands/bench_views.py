@@ -0,0 +1,88 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from LMS.benchmarks.data import BENCHMARK_SCALES, scratch_benchmark_database, seed_benchmark_data
+from LMS.benchmarks.views import compare_benchmark_results, run_view_benchmarks
+from LMS.models import StudentRegistration
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database at the chosen scale, drive the LMS views through the "
+        "test client and compare latency, query count, bytes read and peak memory with "
+        "a saved JSON baseline. Exits non-zero when a tracked metric regresses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=list(BENCHMARK_SCALES), default="1k")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario.")
+        parser.add_argument("--only", default="", help="Run scenarios whose name contains this.")
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            help="Baseline JSON file; defaults to benchmarks/views-<scale>.json.",
+        )
+        parser.add_argument(
+            "--save", action="store_true", help="Write these results as the new baseline."
+        )
+        parser.add_argument("--latency-tolerance", type=float, default=0.5)
+        parser.add_argument("--memory-tolerance", type=float, default=0.25)
+        parser.add_argument(
+            "--data-dir",
+            type=Path,
+            help="Keep the seeded database here and reuse it on later runs "
+            "(seeding 1m rows takes minutes).",
+        )
+
+    def handle(self, *args, **options):
+        scale = options["scale"]
+        baseline_path = options["baseline"] or (
+            Path(settings.BASE_DIR) / "benchmarks" / f"views-{scale}.json"
+        )
+
+        with tempfile.TemporaryDirectory() as scratch:
+            data_dir = options["data_dir"] or Path(scratch)
+            data_dir.mkdir(parents=True, exist_ok=True)
+            results = self.run_benchmarks(data_dir / f"bench-views-{scale}.sqlite3", options)
+
+        for name, metrics in results.items():
+            self.stdout.write(
+                f"{name:<48} {metrics['latency_ms']:9.2f} ms  (p95 {metrics['p95_ms']:.2f})"
+                f"  {metrics['queries']:3d} queries  {metrics['read_kib']:9.1f} KiB read"
+                f"  {metrics['peak_kib']:10.1f} KiB peak"
+            )
+
+        if options["save"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(
+                json.dumps({"scale": scale, "scenarios": results}, indent=2, sort_keys=True) + "\n"
+            )
+            self.stdout.write(f"Saved baseline to {baseline_path}.")
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(f"No baseline at {baseline_path}; rerun with --save to record one.")
+            return
+
+        baseline = json.loads(baseline_path.read_text())["scenarios"]
+        regressions = compare_benchmark_results(
+            baseline, results, options["latency_tolerance"], options["memory_tolerance"]
+        )
+        if regressions:
+            raise CommandError(
+                "Performance regressions against " + str(baseline_path) + ":\n  "
+                + "\n  ".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {baseline_path}."))
+
+    def run_benchmarks(self, database_path, options):
+        rows = BENCHMARK_SCALES[options["scale"]]
+        with scratch_benchmark_database(database_path, keepdb=bool(options["data_dir"])):
+            if not StudentRegistration.objects.exists():
+                self.stdout.write(f"Seeding {rows} registrations...")
+                seed_benchmark_data(rows)
+            return run_view_benchmarks(repeat=options["repeat"], only=options["only"])
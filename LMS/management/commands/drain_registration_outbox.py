@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from LMS.outbox import DRAIN_BATCH_SIZE, drain_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        "Move queued registration submissions from the outbox into the database. "
+        "Run one worker at a time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=DRAIN_BATCH_SIZE)
+        parser.add_argument(
+            "--interval", type=float, default=1.0, help="Seconds to sleep when the outbox is empty."
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once the outbox is empty instead of polling."
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            drained = drain_outbox(options["batch_size"])
+            total += drained
+            if drained:
+                self.stdout.write(f"Saved {drained} registrations ({total} total).")
+            elif options["once"]:
+                break
+            else:
+                time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS(f"Outbox empty; saved {total} registrations."))
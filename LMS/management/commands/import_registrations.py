@@ -0,0 +1,34 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from LMS.importers import IMPORT_BATCH_SIZE, import_registrations, read_spreadsheet_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk import student registrations from a CSV or XLSX spreadsheet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Spreadsheet whose headers are form labels or field names.")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.is_file():
+            raise CommandError(f"File not found: {path}")
+
+        with path.open("rb") as spreadsheet:
+            report = import_registrations(
+                read_spreadsheet_rows(spreadsheet, path.name),
+                batch_size=options["batch_size"],
+            )
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {' '.join(error['errors'])}")
+        if report["ignored_columns"]:
+            self.stdout.write(f"Ignored columns: {', '.join(report['ignored_columns'])}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['created']} registrations; {len(report['errors'])} rows rejected."
+            )
+        )
@@ -0,0 +1,82 @@
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+
+from django.core.management.base import BaseCommand, CommandError
+
+from LMS.benchmarks.common import latency_summary, sample_submission
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+def submit_registration(url, index):
+    cookies = CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(cookies), NoRedirect)
+    try:
+        opener.open(url).read()
+    except OSError:
+        return 0.0, None
+    csrf_token = next(cookie.value for cookie in cookies if cookie.name == "csrftoken")
+
+    data = sample_submission()
+    data["email"] = f"loadtest{index}@example.com"
+    data["csrfmiddlewaretoken"] = csrf_token
+    request = urllib.request.Request(
+        url, data=data.urlencode().encode(), headers={"Referer": url}, method="POST"
+    )
+
+    started = time.perf_counter()
+    try:
+        opener.open(request).read()
+        status = 200
+    except urllib.error.HTTPError as exc:
+        status = exc.code
+    except OSError:
+        # Connection resets and refusals count as failed submits, not crashes.
+        status = None
+    return time.perf_counter() - started, status
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire a concurrent burst of registration submissions at a running server and "
+        "report submit latency percentiles. Compare LMS_REGISTRATION_INGEST=direct "
+        "against queue by restarting the server between runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000/student/register/")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=50)
+
+    def handle(self, *args, **options):
+        url = options["url"]
+        try:
+            urllib.request.urlopen(url).read()
+        except urllib.error.URLError as exc:
+            raise CommandError(f"Cannot reach {url}: {exc}") from exc
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+            results = list(
+                pool.map(lambda index: submit_registration(url, index), range(options["requests"]))
+            )
+        elapsed = time.perf_counter() - started
+
+        latencies = [latency for latency, status in results if status == 302]
+        failures = len(results) - len(latencies)
+        summary = latency_summary(latencies)
+        self.stdout.write(
+            f"{len(latencies)} accepted, {failures} failed in {elapsed:.2f}s "
+            f"({len(results) / elapsed:.1f} submits/s, concurrency {options['concurrency']})"
+        )
+        self.stdout.write(
+            "submit latency: "
+            + ", ".join(f"{name} {value * 1000:.1f} ms" for name, value in summary.items())
+        )
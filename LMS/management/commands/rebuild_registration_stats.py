@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from LMS.stats import rebuild_registration_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the registration statistics counters from the registrations table "
+        "and the archive."
+    )
+
+    def handle(self, *args, **options):
+        buckets = rebuild_registration_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} statistics buckets."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from LMS.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index over student registrations."
+
+    def handle(self, *args, **options):
+        indexed = rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} registrations."))
@@ -0,0 +1,55 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from hope.routers import read_replica_alias
+
+
+def copy_database(source_name, target_name):
+    # The online backup API copies a consistent snapshot while the primary keeps
+    # taking writes, and readers of the target see either the old or new copy.
+    source = sqlite3.connect(source_name)
+    target = sqlite3.connect(target_name, timeout=30)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database over the read replica "
+        "(DATABASE_READ_REPLICA), once or on an interval."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Seconds between copies; defaults to half of DATABASE_REPLICA_LAG.",
+        )
+        parser.add_argument("--once", action="store_true")
+
+    def handle(self, *args, **options):
+        replica = read_replica_alias()
+        if not replica:
+            raise CommandError("DATABASE_READ_REPLICA is not configured.")
+        source_name = str(connections[DEFAULT_DB_ALIAS].settings_dict["NAME"])
+        target_name = str(connections[replica].settings_dict["NAME"])
+        # Copying twice per stickiness window keeps the replica within
+        # DATABASE_REPLICA_LAG of the primary.
+        interval = options["interval"] or getattr(settings, "DATABASE_REPLICA_LAG", 60) / 2
+
+        while True:
+            started = time.perf_counter()
+            copy_database(source_name, target_name)
+            self.stdout.write(
+                f"Copied {source_name} to {target_name} in {time.perf_counter() - started:.2f}s."
+            )
+            if options["once"]:
+                return
+            time.sleep(interval)
@@ -0,0 +1,80 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from django.core.management.base import BaseCommand
+
+from LMS.jobs import (
+    DEFAULT_JOB_WORKERS,
+    DEFAULT_STALE_JOB_SECONDS,
+    JOB_POOLS,
+    claim_next_job,
+    fail_stale_jobs,
+    finish_job,
+    job_pool,
+    submit_job,
+    touch_jobs,
+)
+from LMS.models import BackgroundJob
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs (exports, credential provisioning) on a thread "
+        "or process pool. With LMS_BACKGROUND_JOBS = 'worker', the default, admin "
+        "actions queue their jobs for this command, so it must be kept running."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=DEFAULT_JOB_WORKERS)
+        parser.add_argument(
+            "--pool",
+            choices=JOB_POOLS,
+            default="thread",
+            help="Processes sidestep the GIL for CPU-heavy jobs but cost a Django startup each.",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=1.0, help="Seconds between polls of the queue."
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=DEFAULT_STALE_JOB_SECONDS,
+            help="Fail running jobs whose worker has been silent this many seconds.",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Exit once the queue is empty instead of polling."
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        running = {}
+        with job_pool(options["pool"], workers) as pool:
+            while True:
+                failed = fail_stale_jobs(options["stale_after"])
+                if failed:
+                    self.stdout.write(self.style.WARNING(f"Failed {failed} stale jobs."))
+
+                for future in [future for future in running if future.done()]:
+                    job_id = running.pop(future)
+                    try:
+                        status = future.result()
+                    except Exception as exc:
+                        # The job never reported back, e.g. its process died.
+                        finish_job(job_id, BackgroundJob.FAILED, message=str(exc))
+                        status = BackgroundJob.FAILED
+                    self.stdout.write(f"Job {job_id} {status}.")
+
+                touch_jobs(running.values())
+                while len(running) < workers:
+                    job_id = claim_next_job()
+                    if job_id is None:
+                        break
+                    running[submit_job(pool, job_id)] = job_id
+
+                if running:
+                    wait(running, timeout=options["interval"], return_when=FIRST_COMPLETED)
+                elif options["once"]:
+                    break
+                else:
+                    time.sleep(options["interval"])
+        self.stdout.write(self.style.SUCCESS("Job queue empty."))
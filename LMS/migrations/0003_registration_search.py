@@ -0,0 +1,100 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+import LMS.fields
+
+
+# Frozen as it was when the index was created: a contact number with its
+# separators stripped, then a space and its last ten digits. Live code builds
+# the same expression with LMS.sql.phone_sql.
+DIGITS_SQL = (
+    "replace(replace(replace(replace(replace(replace(replace(replace("
+    "{column}, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), '.', ''), ',', ''), '/', '')"
+)
+PHONE_SQL = "{digits} || ' ' || substr({digits}, -10)"
+PHONE = PHONE_SQL.format(digits=DIGITS_SQL.format(column="contact_number"))
+NEW_PHONE = PHONE_SQL.format(digits=DIGITS_SQL.format(column="new.contact_number"))
+INDEX_NEW_ROW = (
+    "INSERT INTO LMS_registration_search(rowid, full_name, email, phone, referral_source) "
+    f"VALUES (new.id, new.full_name, lower(new.email), {NEW_PHONE}, new.referral_source);"
+)
+
+
+CREATE_SEARCH_INDEX = [
+    (
+        "CREATE VIRTUAL TABLE LMS_registration_search USING fts5("
+        "full_name, email, phone, referral_source, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4')"
+    ),
+    (
+        "INSERT INTO LMS_registration_search(LMS_registration_search, rank) "
+        "VALUES ('rank', 'bm25(10.0, 6.0, 6.0, 1.0)')"
+    ),
+    (
+        "INSERT INTO LMS_registration_search(rowid, full_name, email, phone, referral_source) "
+        f"SELECT id, full_name, lower(email), {PHONE}, referral_source "
+        "FROM LMS_studentregistration"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_search_ai AFTER INSERT ON LMS_studentregistration "
+        f"BEGIN {INDEX_NEW_ROW} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_search_ad AFTER DELETE ON LMS_studentregistration "
+        "BEGIN DELETE FROM LMS_registration_search WHERE rowid = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_search_au AFTER UPDATE OF "
+        "full_name, email, contact_number, referral_source ON LMS_studentregistration "
+        "BEGIN DELETE FROM LMS_registration_search WHERE rowid = old.id; "
+        f"{INDEX_NEW_ROW} END"
+    ),
+]
+
+DROP_SEARCH_INDEX = [
+    "DROP TRIGGER IF EXISTS LMS_registration_search_au",
+    "DROP TRIGGER IF EXISTS LMS_registration_search_ad",
+    "DROP TRIGGER IF EXISTS LMS_registration_search_ai",
+    "DROP TABLE IF EXISTS LMS_registration_search",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LMS", "0002_studentregistration"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_SEARCH_INDEX, reverse_sql=DROP_SEARCH_INDEX),
+        migrations.CreateModel(
+            name="RegistrationSearchEntry",
+            fields=[
+                (
+                    "registration",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_entry",
+                        serialize=False,
+                        to="LMS.studentregistration",
+                    ),
+                ),
+                ("full_name", models.TextField()),
+                ("email", models.TextField()),
+                ("phone", models.TextField()),
+                ("referral_source", models.TextField()),
+                (
+                    "document",
+                    LMS.fields.SearchDocumentField(db_column="LMS_registration_search"),
+                ),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "LMS_registration_search",
+                "managed": False,
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LMS", "0003_registration_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="studentregistration",
+            index=models.Index(fields=["-submitted_at", "-id"], name="lms_reg_submitted_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="studentregistration",
+            index=models.Index(
+                condition=models.Q(("account_created", False)),
+                fields=["-submitted_at", "-id"],
+                name="lms_reg_pending_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentregistration",
+            index=models.Index(
+                condition=models.Q(("account_created", True)),
+                fields=["-submitted_at", "-id"],
+                name="lms_reg_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="studentregistration",
+            index=models.Index(
+                django.db.models.functions.text.Lower("batch_no"),
+                models.OrderBy(models.F("submitted_at"), descending=True),
+                models.OrderBy(models.F("id"), descending=True),
+                name="lms_reg_batch_idx",
+            ),
+        ),
+    ]
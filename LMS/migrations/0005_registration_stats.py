@@ -0,0 +1,75 @@
+from django.db import migrations, models
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+
+
+STAT_DIMENSIONS = [
+    ("batch", "batch_no"),
+    ("referral_source", "referral_source"),
+    ("gender", "gender"),
+    ("social_category", "social_category"),
+    ("day", "submitted_at"),
+]
+
+
+def backfill_registration_stats(apps, schema_editor):
+    StudentRegistration = apps.get_model("LMS", "StudentRegistration")
+    RegistrationStat = apps.get_model("LMS", "RegistrationStat")
+    stats = []
+    for dimension, field_name in STAT_DIMENSIONS:
+        bucket = TruncDate(field_name) if field_name == "submitted_at" else F(field_name)
+        rows = (
+            StudentRegistration.objects.using(schema_editor.connection.alias)
+            .order_by()
+            .values(bucket_value=bucket)
+            .annotate(
+                pending=Count("id", filter=Q(account_created=False)),
+                created=Count("id", filter=Q(account_created=True)),
+            )
+        )
+        for row in rows:
+            value = row["bucket_value"]
+            stats.append(
+                RegistrationStat(
+                    dimension=dimension,
+                    bucket=value.isoformat() if hasattr(value, "isoformat") else value or "",
+                    pending=row["pending"],
+                    created=row["created"],
+                )
+            )
+    RegistrationStat.objects.using(schema_editor.connection.alias).bulk_create(
+        stats, batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LMS", "0004_registration_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RegistrationStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("dimension", models.CharField(max_length=32)),
+                ("bucket", models.CharField(max_length=200)),
+                ("pending", models.IntegerField(default=0)),
+                ("created", models.IntegerField(default=0)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("dimension", "bucket"), name="lms_stat_bucket_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_registration_stats, migrations.RunPython.noop),
+    ]
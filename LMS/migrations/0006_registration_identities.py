@@ -0,0 +1,112 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Frozen as it was when the triggers were created: a phone number with its
+# separators stripped. Live code builds the same expression with
+# LMS.sql.digits_sql.
+DIGITS_SQL = (
+    "replace(replace(replace(replace(replace(replace(replace(replace("
+    "{column}, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), '.', ''), ',', ''), '/', '')"
+)
+
+
+def insert_identities_sql(row="", source=""):
+    # One row per usable key: case-folded email, the last ten digits of each
+    # phone number and the ID number without separators. DISTINCT folds a
+    # WhatsApp number equal to the contact number into one key.
+    keys = [
+        ("'email'", f"lower(trim({row}email))"),
+        ("'phone'", f"substr({DIGITS_SQL.format(column=f'{row}contact_number')}, -10)"),
+        ("'phone'", f"substr({DIGITS_SQL.format(column=f'{row}whatsapp_number')}, -10)"),
+        (
+            "'id_number'",
+            f"upper(replace(replace(replace(trim({row}unique_id_number), ' ', ''), '-', ''), '/', ''))",
+        ),
+    ]
+    rows = " UNION ALL ".join(
+        f"SELECT {row}id AS registration_id, {kind} AS kind, {value} AS value{source}"
+        for kind, value in keys
+    )
+    return (
+        "INSERT INTO LMS_registrationidentity (registration_id, kind, value) "
+        f"SELECT DISTINCT registration_id, kind, value FROM ({rows}) "
+        "WHERE (kind = 'email' AND value LIKE '_%@_%') "
+        "OR (kind = 'phone' AND length(value) >= 7) "
+        "OR (kind = 'id_number' AND length(value) >= 4);"
+    )
+
+
+CREATE_IDENTITY_TRIGGERS = [
+    insert_identities_sql(source=" FROM LMS_studentregistration"),
+    (
+        "CREATE TRIGGER LMS_registration_identity_ai AFTER INSERT ON LMS_studentregistration "
+        f"BEGIN {insert_identities_sql('new.')} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_identity_ad AFTER DELETE ON LMS_studentregistration "
+        "BEGIN DELETE FROM LMS_registrationidentity WHERE registration_id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_identity_au AFTER UPDATE OF "
+        "email, contact_number, whatsapp_number, unique_id_number ON LMS_studentregistration "
+        "BEGIN DELETE FROM LMS_registrationidentity WHERE registration_id = old.id; "
+        f"{insert_identities_sql('new.')} END"
+    ),
+]
+
+DROP_IDENTITY_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS LMS_registration_identity_au",
+    "DROP TRIGGER IF EXISTS LMS_registration_identity_ad",
+    "DROP TRIGGER IF EXISTS LMS_registration_identity_ai",
+    "DELETE FROM LMS_registrationidentity",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LMS", "0005_registration_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="studentregistration",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="LMS.studentregistration",
+            ),
+        ),
+        migrations.CreateModel(
+            name="RegistrationIdentity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("kind", models.CharField(max_length=16)),
+                ("value", models.CharField(max_length=254)),
+                (
+                    "registration",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="identities",
+                        to="LMS.studentregistration",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["kind", "value"], name="lms_identity_lookup_idx")
+                ],
+            },
+        ),
+        migrations.RunSQL(CREATE_IDENTITY_TRIGGERS, reverse_sql=DROP_IDENTITY_TRIGGERS),
+    ]
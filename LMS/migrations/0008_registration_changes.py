@@ -0,0 +1,65 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def record_change_sql(registration_id, deleted):
+    # INSERT OR REPLACE drops the registration's previous log row, and
+    # AUTOINCREMENT hands the new one a seq above every seq ever issued.
+    return (
+        "INSERT OR REPLACE INTO LMS_registrationchange (registration_id, deleted) "
+        f"VALUES ({registration_id}, {deleted});"
+    )
+
+
+CREATE_CHANGE_TRIGGERS = [
+    (
+        "INSERT INTO LMS_registrationchange (registration_id, deleted) "
+        "SELECT id, 0 FROM LMS_studentregistration ORDER BY id"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_change_ai AFTER INSERT ON LMS_studentregistration "
+        f"BEGIN {record_change_sql('new.id', 0)} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_change_au AFTER UPDATE ON LMS_studentregistration "
+        f"BEGIN {record_change_sql('new.id', 0)} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_change_ad AFTER DELETE ON LMS_studentregistration "
+        f"BEGIN {record_change_sql('old.id', 1)} END"
+    ),
+]
+
+DROP_CHANGE_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS LMS_registration_change_ad",
+    "DROP TRIGGER IF EXISTS LMS_registration_change_au",
+    "DROP TRIGGER IF EXISTS LMS_registration_change_ai",
+    "DELETE FROM LMS_registrationchange",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LMS", "0007_background_jobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RegistrationChange",
+            fields=[
+                ("seq", models.BigAutoField(primary_key=True, serialize=False)),
+                ("deleted", models.BooleanField(default=False)),
+                (
+                    "registration",
+                    models.OneToOneField(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="change_entry",
+                        to="LMS.studentregistration",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunSQL(CREATE_CHANGE_TRIGGERS, reverse_sql=DROP_CHANGE_TRIGGERS),
+    ]
@@ -0,0 +1,201 @@
+from django.db import migrations
+
+import LMS.fields
+
+
+# The answers' options as of this migration; each is stored as its 1-based
+# position and a blank answer as 0. Before, they were CharFields holding the
+# option text.
+REGISTRATION_OPTIONS = {
+    "unique_id_proof_type": ["Aadhaar", "PAN", "Passport", "Voter ID", "Driving License", "Other"],
+    "gender": ["Male", "Female", "Other", "Prefer not to say"],
+    "graduation_status": ["Completed", "Final Year", "Pursuing", "Not Started"],
+    "currently_studying_or_working": ["Studying", "Working", "Both", "Neither"],
+    "internships_currently": ["Yes", "No"],
+    "preparing_competitive_exams": ["Yes", "No"],
+    "wants_job_immediately": ["Yes", "No"],
+    "comfortable_shift_jobs": ["Yes", "No"],
+    "can_spend_4_hours_daily": ["Yes", "No"],
+    "can_submit_assignments_on_time": ["Yes", "No"],
+    "can_attend_webinars": ["Yes", "No"],
+    "has_computer_or_laptop": ["Yes", "No"],
+    "has_smartphone": ["Yes", "No"],
+    "single_parent": ["Yes", "No"],
+    "social_category": ["Gen", "OBC", "SC", "ST", "Other"],
+    "application_status": ["FIRST TIME", "REJOINING"],
+}
+
+# The registration table's triggers as 0003, 0006 and 0008 created them. The
+# table rebuild behind the new columns drops every trigger on the table, so
+# they are put back afterwards. Dropping them also keeps the change log
+# triggers from recording every row the encoding updates touch.
+DIGITS_SQL = (
+    "replace(replace(replace(replace(replace(replace(replace(replace("
+    "{column}, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), '.', ''), ',', ''), '/', '')"
+)
+NEW_CONTACT_DIGITS = DIGITS_SQL.format(column="new.contact_number")
+NEW_WHATSAPP_DIGITS = DIGITS_SQL.format(column="new.whatsapp_number")
+INDEX_NEW_ROW = (
+    "INSERT INTO LMS_registration_search(rowid, full_name, email, phone, referral_source) "
+    "VALUES (new.id, new.full_name, lower(new.email), "
+    f"{NEW_CONTACT_DIGITS} || ' ' || substr({NEW_CONTACT_DIGITS}, -10), new.referral_source);"
+)
+INSERT_NEW_IDENTITIES = (
+    "INSERT INTO LMS_registrationidentity (registration_id, kind, value) "
+    "SELECT DISTINCT registration_id, kind, value FROM ("
+    "SELECT new.id AS registration_id, 'email' AS kind, lower(trim(new.email)) AS value "
+    "UNION ALL SELECT new.id AS registration_id, 'phone' AS kind, "
+    f"substr({NEW_CONTACT_DIGITS}, -10) AS value "
+    "UNION ALL SELECT new.id AS registration_id, 'phone' AS kind, "
+    f"substr({NEW_WHATSAPP_DIGITS}, -10) AS value "
+    "UNION ALL SELECT new.id AS registration_id, 'id_number' AS kind, "
+    "upper(replace(replace(replace(trim(new.unique_id_number), ' ', ''), '-', ''), '/', '')) "
+    "AS value) "
+    "WHERE (kind = 'email' AND value LIKE '_%@_%') "
+    "OR (kind = 'phone' AND length(value) >= 7) "
+    "OR (kind = 'id_number' AND length(value) >= 4);"
+)
+
+
+def record_change_sql(registration_id, deleted):
+    return (
+        "INSERT OR REPLACE INTO LMS_registrationchange (registration_id, deleted) "
+        f"VALUES ({registration_id}, {deleted});"
+    )
+
+
+CREATE_REGISTRATION_TRIGGERS = [
+    (
+        "CREATE TRIGGER LMS_registration_search_ai AFTER INSERT ON LMS_studentregistration "
+        f"BEGIN {INDEX_NEW_ROW} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_search_ad AFTER DELETE ON LMS_studentregistration "
+        "BEGIN DELETE FROM LMS_registration_search WHERE rowid = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_search_au AFTER UPDATE OF "
+        "full_name, email, contact_number, referral_source ON LMS_studentregistration "
+        "BEGIN DELETE FROM LMS_registration_search WHERE rowid = old.id; "
+        f"{INDEX_NEW_ROW} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_identity_ai AFTER INSERT ON LMS_studentregistration "
+        f"BEGIN {INSERT_NEW_IDENTITIES} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_identity_ad AFTER DELETE ON LMS_studentregistration "
+        "BEGIN DELETE FROM LMS_registrationidentity WHERE registration_id = old.id; END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_identity_au AFTER UPDATE OF "
+        "email, contact_number, whatsapp_number, unique_id_number ON LMS_studentregistration "
+        "BEGIN DELETE FROM LMS_registrationidentity WHERE registration_id = old.id; "
+        f"{INSERT_NEW_IDENTITIES} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_change_ai AFTER INSERT ON LMS_studentregistration "
+        f"BEGIN {record_change_sql('new.id', 0)} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_change_au AFTER UPDATE ON LMS_studentregistration "
+        f"BEGIN {record_change_sql('new.id', 0)} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_change_ad AFTER DELETE ON LMS_studentregistration "
+        f"BEGIN {record_change_sql('old.id', 1)} END"
+    ),
+]
+
+DROP_REGISTRATION_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS LMS_registration_change_ad",
+    "DROP TRIGGER IF EXISTS LMS_registration_change_au",
+    "DROP TRIGGER IF EXISTS LMS_registration_change_ai",
+    "DROP TRIGGER IF EXISTS LMS_registration_identity_au",
+    "DROP TRIGGER IF EXISTS LMS_registration_identity_ad",
+    "DROP TRIGGER IF EXISTS LMS_registration_identity_ai",
+    "DROP TRIGGER IF EXISTS LMS_registration_search_au",
+    "DROP TRIGGER IF EXISTS LMS_registration_search_ad",
+    "DROP TRIGGER IF EXISTS LMS_registration_search_ai",
+]
+
+
+def sql_text(value):
+    return "'" + value.replace("'", "''") + "'"
+
+
+def encode_options_sql(field_name, options):
+    cases = " ".join(
+        f"WHEN {sql_text(option.casefold())} THEN {code}"
+        for code, option in enumerate(options, start=1)
+    )
+    return (
+        f"UPDATE LMS_studentregistration SET {field_name}_code = "
+        f"CASE lower(trim({field_name})) WHEN '' THEN 0 {cases} END"
+    )
+
+
+def decode_options_sql(field_name, options):
+    cases = " ".join(
+        f"WHEN {code} THEN {sql_text(option)}" for code, option in enumerate(options, start=1)
+    )
+    return (
+        f"UPDATE LMS_studentregistration SET {field_name} = "
+        f"CASE {field_name}_code WHEN 0 THEN '' {cases} END"
+    )
+
+
+def check_options_are_known(apps, schema_editor):
+    # An answer outside the options has no code; stop before any column changes.
+    with schema_editor.connection.cursor() as cursor:
+        for field_name, options in REGISTRATION_OPTIONS.items():
+            known = ", ".join(sql_text(option.casefold()) for option in ["", *options])
+            cursor.execute(
+                f"SELECT DISTINCT {field_name} FROM LMS_studentregistration "
+                f"WHERE lower(trim({field_name})) NOT IN ({known})"
+            )
+            unknown = [value for (value,) in cursor.fetchall()]
+            if unknown:
+                raise ValueError(
+                    f"StudentRegistration.{field_name} holds values outside its options "
+                    f"{options}: {unknown}. Correct them before migrating."
+                )
+
+
+def store_as_codes(field_name, options):
+    # SQLite cannot change a column's type in place: the codes go into a new
+    # column, which takes over the answer's name once the text column is gone.
+    code_name = f"{field_name}_code"
+    return [
+        migrations.AddField(
+            model_name="studentregistration",
+            name=code_name,
+            field=LMS.fields.OptionField(blank=True, options=options),
+        ),
+        migrations.RunSQL(
+            encode_options_sql(field_name, options),
+            reverse_sql=decode_options_sql(field_name, options),
+        ),
+        migrations.RemoveField(model_name="studentregistration", name=field_name),
+        migrations.RenameField(
+            model_name="studentregistration", old_name=code_name, new_name=field_name
+        ),
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LMS", "0008_registration_changes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(DROP_REGISTRATION_TRIGGERS, reverse_sql=CREATE_REGISTRATION_TRIGGERS),
+        migrations.RunPython(check_options_are_known, migrations.RunPython.noop),
+        *[
+            operation
+            for field_name, options in REGISTRATION_OPTIONS.items()
+            for operation in store_as_codes(field_name, options)
+        ],
+        migrations.RunSQL(CREATE_REGISTRATION_TRIGGERS, reverse_sql=DROP_REGISTRATION_TRIGGERS),
+    ]
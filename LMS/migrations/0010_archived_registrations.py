@@ -0,0 +1,122 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.text
+
+import LMS.fields
+
+
+# Frozen as it was when the index was created; see 0003_registration_search.
+DIGITS_SQL = (
+    "replace(replace(replace(replace(replace(replace(replace(replace("
+    "{column}, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), '.', ''), ',', ''), '/', '')"
+)
+PHONE_SQL = "{digits} || ' ' || substr({digits}, -10)"
+NEW_PHONE = PHONE_SQL.format(digits=DIGITS_SQL.format(column="new.contact_number"))
+
+
+CREATE_ARCHIVE_SEARCH_INDEX = [
+    (
+        "CREATE VIRTUAL TABLE LMS_archive_search USING fts5("
+        "full_name, email, phone, referral_source, "
+        "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4')"
+    ),
+    (
+        "INSERT INTO LMS_archive_search(LMS_archive_search, rank) "
+        "VALUES ('rank', 'bm25(10.0, 6.0, 6.0, 1.0)')"
+    ),
+    (
+        "CREATE TRIGGER LMS_archive_search_ai AFTER INSERT ON LMS_archivedregistration "
+        "BEGIN INSERT INTO LMS_archive_search(rowid, full_name, email, phone, referral_source) "
+        f"VALUES (new.id, new.full_name, lower(new.email), {NEW_PHONE}, "
+        "new.referral_source); END"
+    ),
+    (
+        "CREATE TRIGGER LMS_archive_search_ad AFTER DELETE ON LMS_archivedregistration "
+        "BEGIN DELETE FROM LMS_archive_search WHERE rowid = old.id; END"
+    ),
+]
+
+DROP_ARCHIVE_SEARCH_INDEX = [
+    "DROP TRIGGER IF EXISTS LMS_archive_search_ad",
+    "DROP TRIGGER IF EXISTS LMS_archive_search_ai",
+    "DROP TABLE IF EXISTS LMS_archive_search",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LMS", "0009_compact_registration_options"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedRegistration",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("submitted_at", models.DateTimeField()),
+                ("archived_at", models.DateTimeField()),
+                ("batch_no", models.CharField(blank=True, max_length=100)),
+                ("full_name", models.CharField(max_length=200)),
+                ("email", models.EmailField(max_length=254)),
+                ("contact_number", models.CharField(max_length=20)),
+                ("referral_source", models.CharField(blank=True, max_length=200)),
+                ("account_created", models.BooleanField(default=False)),
+                ("duplicate_of_id", models.BigIntegerField(blank=True, null=True)),
+                ("answers", models.BinaryField()),
+                (
+                    "created_user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["-submitted_at", "-id"], name="lms_archive_submitted_idx"
+                    ),
+                    models.Index(
+                        django.db.models.functions.text.Lower("batch_no"),
+                        models.F("submitted_at").desc(),
+                        models.F("id").desc(),
+                        name="lms_archive_batch_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(CREATE_ARCHIVE_SEARCH_INDEX, reverse_sql=DROP_ARCHIVE_SEARCH_INDEX),
+        migrations.CreateModel(
+            name="ArchivedRegistrationSearchEntry",
+            fields=[
+                (
+                    "registration",
+                    models.OneToOneField(
+                        db_column="rowid",
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        primary_key=True,
+                        related_name="search_entry",
+                        serialize=False,
+                        to="LMS.archivedregistration",
+                    ),
+                ),
+                ("full_name", models.TextField()),
+                ("email", models.TextField()),
+                ("phone", models.TextField()),
+                ("referral_source", models.TextField()),
+                ("document", LMS.fields.SearchDocumentField(db_column="LMS_archive_search")),
+                ("rank", models.FloatField()),
+            ],
+            options={
+                "db_table": "LMS_archive_search",
+                "managed": False,
+            },
+        ),
+    ]
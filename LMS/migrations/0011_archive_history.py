@@ -0,0 +1,135 @@
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import migrations, models
+
+import LMS.fields
+
+
+STAT_FIELDS = {
+    "gender": ["Male", "Female", "Other", "Prefer not to say"],
+    "social_category": ["Gen", "OBC", "SC", "ST", "Other"],
+}
+CHUNK_SIZE = 1000
+
+# Adding the columns rebuilds LMS_archivedregistration and
+# LMS_registrationchange. The rebuild drops the archive's search index triggers,
+# and the change log triggers on LMS_studentregistration stop it renaming its
+# table, so both sets are put back afterwards, as 0008 and 0010 created them.
+DIGITS_SQL = (
+    "replace(replace(replace(replace(replace(replace(replace(replace("
+    "{column}, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), '.', ''), ',', ''), '/', '')"
+)
+PHONE_SQL = "{digits} || ' ' || substr({digits}, -10)"
+NEW_PHONE = PHONE_SQL.format(digits=DIGITS_SQL.format(column="new.contact_number"))
+
+CREATE_ARCHIVE_TRIGGERS = [
+    (
+        "CREATE TRIGGER LMS_archive_search_ai AFTER INSERT ON LMS_archivedregistration "
+        "BEGIN INSERT INTO LMS_archive_search(rowid, full_name, email, phone, referral_source) "
+        f"VALUES (new.id, new.full_name, lower(new.email), {NEW_PHONE}, "
+        "new.referral_source); END"
+    ),
+    (
+        "CREATE TRIGGER LMS_archive_search_ad AFTER DELETE ON LMS_archivedregistration "
+        "BEGIN DELETE FROM LMS_archive_search WHERE rowid = old.id; END"
+    ),
+]
+
+DROP_ARCHIVE_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS LMS_archive_search_ad",
+    "DROP TRIGGER IF EXISTS LMS_archive_search_ai",
+]
+
+
+def record_change_sql(registration_id, deleted):
+    return (
+        "INSERT OR REPLACE INTO LMS_registrationchange (registration_id, deleted) "
+        f"VALUES ({registration_id}, {deleted});"
+    )
+
+
+CREATE_CHANGE_TRIGGERS = [
+    (
+        "CREATE TRIGGER LMS_registration_change_ai AFTER INSERT ON LMS_studentregistration "
+        f"BEGIN {record_change_sql('new.id', 0)} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_change_au AFTER UPDATE ON LMS_studentregistration "
+        f"BEGIN {record_change_sql('new.id', 0)} END"
+    ),
+    (
+        "CREATE TRIGGER LMS_registration_change_ad AFTER DELETE ON LMS_studentregistration "
+        f"BEGIN {record_change_sql('old.id', 1)} END"
+    ),
+]
+
+DROP_CHANGE_TRIGGERS = [
+    "DROP TRIGGER IF EXISTS LMS_registration_change_ad",
+    "DROP TRIGGER IF EXISTS LMS_registration_change_au",
+    "DROP TRIGGER IF EXISTS LMS_registration_change_ai",
+]
+
+
+def update_archive(apps, update_entry):
+    ArchivedRegistration = apps.get_model("LMS", "ArchivedRegistration")
+    entries = ArchivedRegistration.objects.order_by("id")
+    fields = ["answers", *STAT_FIELDS]
+    chunk = []
+    for entry in entries.iterator(chunk_size=CHUNK_SIZE):
+        update_entry(entry, json.loads(zlib.decompress(entry.answers)))
+        chunk.append(entry)
+        if len(chunk) == CHUNK_SIZE:
+            ArchivedRegistration.objects.bulk_update(chunk, fields)
+            chunk = []
+    ArchivedRegistration.objects.bulk_update(chunk, fields)
+
+
+def unpack_stat_fields(apps, schema_editor):
+    # The packed answers keep their copy; LMS.archive no longer reads it.
+    def update_entry(entry, answers):
+        for field_name in STAT_FIELDS:
+            setattr(entry, field_name, answers.get(field_name, ""))
+
+    update_archive(apps, update_entry)
+
+
+def pack_stat_fields(apps, schema_editor):
+    def update_entry(entry, answers):
+        for field_name in STAT_FIELDS:
+            if getattr(entry, field_name):
+                answers[field_name] = getattr(entry, field_name)
+        entry.answers = zlib.compress(
+            json.dumps(answers, cls=DjangoJSONEncoder, separators=(",", ":")).encode(), 9
+        )
+
+    update_archive(apps, update_entry)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LMS", "0010_archived_registrations"),
+    ]
+
+    operations = [
+        migrations.RunSQL(DROP_ARCHIVE_TRIGGERS, reverse_sql=CREATE_ARCHIVE_TRIGGERS),
+        *[
+            migrations.AddField(
+                model_name="archivedregistration",
+                name=field_name,
+                field=LMS.fields.OptionField(blank=True, options=options),
+            )
+            for field_name, options in STAT_FIELDS.items()
+        ],
+        migrations.RunPython(unpack_stat_fields, pack_stat_fields),
+        migrations.RunSQL(CREATE_ARCHIVE_TRIGGERS, reverse_sql=DROP_ARCHIVE_TRIGGERS),
+        migrations.RunSQL(DROP_CHANGE_TRIGGERS, reverse_sql=CREATE_CHANGE_TRIGGERS),
+        migrations.AddField(
+            model_name="registrationchange",
+            name="archived",
+            field=models.BooleanField(db_default=False, default=False),
+        ),
+        migrations.RunSQL(CREATE_CHANGE_TRIGGERS, reverse_sql=DROP_CHANGE_TRIGGERS),
+    ]
@@ -0,0 +1,75 @@
+from django.db import migrations
+
+
+# Frozen as it was when this migration was written. Before it, the phone
+# column held a contact number's digits and its last ten digits; from it on
+# it also holds every shorter suffix of those ten digits down to three, so a
+# search for the last digits of a number finds it.
+DIGITS_SQL = (
+    "replace(replace(replace(replace(replace(replace(replace(replace("
+    "{column}, ' ', ''), '-', ''), '+', ''), '(', ''), ')', ''), '.', ''), ',', ''), '/', '')"
+)
+OLD_PHONE_SQL = "{digits} || ' ' || substr({digits}, -10)"
+NEW_PHONE_SQL = (
+    "{digits} || ' ' || substr({digits}, -10) || ' ' || substr({digits}, -9) || ' ' || "
+    "substr({digits}, -8) || ' ' || substr({digits}, -7) || ' ' || substr({digits}, -6) || ' ' || "
+    "substr({digits}, -5) || ' ' || substr({digits}, -4) || ' ' || substr({digits}, -3)"
+)
+
+
+def phone(phone_sql, column):
+    return phone_sql.format(digits=DIGITS_SQL.format(column=column))
+
+
+def search_index_sql(phone_sql):
+    """The phone-dependent triggers and index contents built with ``phone_sql``."""
+    index_row = (
+        "INSERT INTO {table}(rowid, full_name, email, phone, referral_source) "
+        "VALUES (new.id, new.full_name, lower(new.email), "
+        f"{phone(phone_sql, 'new.contact_number')}, new.referral_source);"
+    )
+    fill_index = (
+        "INSERT INTO {table}(rowid, full_name, email, phone, referral_source) "
+        f"SELECT id, full_name, lower(email), {phone(phone_sql, 'contact_number')}, "
+        "referral_source FROM {source}"
+    )
+    registrations = {"table": "LMS_registration_search", "source": "LMS_studentregistration"}
+    archive = {"table": "LMS_archive_search", "source": "LMS_archivedregistration"}
+    return [
+        "DROP TRIGGER IF EXISTS LMS_registration_search_ai",
+        "DROP TRIGGER IF EXISTS LMS_registration_search_au",
+        "DROP TRIGGER IF EXISTS LMS_archive_search_ai",
+        "DELETE FROM LMS_registration_search",
+        fill_index.format(**registrations),
+        "DELETE FROM LMS_archive_search",
+        fill_index.format(**archive),
+        (
+            "CREATE TRIGGER LMS_registration_search_ai AFTER INSERT ON LMS_studentregistration "
+            f"BEGIN {index_row.format(**registrations)} END"
+        ),
+        (
+            "CREATE TRIGGER LMS_registration_search_au AFTER UPDATE OF "
+            "full_name, email, contact_number, referral_source ON LMS_studentregistration "
+            "BEGIN DELETE FROM LMS_registration_search WHERE rowid = old.id; "
+            f"{index_row.format(**registrations)} END"
+        ),
+        (
+            "CREATE TRIGGER LMS_archive_search_ai AFTER INSERT ON LMS_archivedregistration "
+            f"BEGIN {index_row.format(**archive)} END"
+        ),
+        "INSERT INTO LMS_registration_search(LMS_registration_search) VALUES ('optimize')",
+        "INSERT INTO LMS_archive_search(LMS_archive_search) VALUES ('optimize')",
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("LMS", "0011_archive_history"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            search_index_sql(NEW_PHONE_SQL), reverse_sql=search_index_sql(OLD_PHONE_SQL)
+        ),
+    ]
@@ -1,5 +1,9 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models.functions import Lower
+
+from .fields import OptionField, SearchDocumentField
+from .registration_fields import SELECT_OPTIONS
 
 
 class StudentProfile(models.Model):
@@ -15,6 +19,9 @@ class StudentProfile(models.Model):
 
 
 class StudentRegistration(models.Model):
+    # Answers with SELECT_OPTIONS are OptionFields: small integers in the table,
+    # the option text everywhere else.
+
     # 1. Basic Information
     batch_no = models.CharField(max_length=100, blank=True)
     batch_timings = models.CharField(max_length=100, blank=True)
@@ -23,15 +30,15 @@ class StudentRegistration(models.Model):
     # 2. Personal Details
     full_name = models.CharField(max_length=200)
     email = models.EmailField()
-    unique_id_proof_type = models.CharField(max_length=100, blank=True)
+    unique_id_proof_type = OptionField(options=SELECT_OPTIONS["unique_id_proof_type"], blank=True)
     unique_id_number = models.CharField(max_length=100, blank=True)
     date_of_birth = models.DateField(null=True, blank=True)
     contact_number = models.CharField(max_length=20)
     whatsapp_number = models.CharField(max_length=20, blank=True)
-    gender = models.CharField(max_length=30, blank=True)
+    gender = OptionField(options=SELECT_OPTIONS["gender"], blank=True)
 
     # 3. Educational Details
-    graduation_status = models.CharField(max_length=100, blank=True)
+    graduation_status = OptionField(options=SELECT_OPTIONS["graduation_status"], blank=True)
     current_education_qualification = models.CharField(max_length=150, blank=True)
     ug_discipline = models.CharField(max_length=150, blank=True)
     studied_college_in = models.CharField(max_length=150, blank=True)
@@ -41,27 +48,43 @@ class StudentRegistration(models.Model):
     college_address = models.TextField(blank=True)
 
     # 4. Current Status (Study / Work)
-    currently_studying_or_working = models.CharField(max_length=100, blank=True)
+    currently_studying_or_working = OptionField(
+        options=SELECT_OPTIONS["currently_studying_or_working"], blank=True
+    )
     work_office_designation_salary = models.TextField(blank=True)
-    internships_currently = models.CharField(max_length=100, blank=True)
-    preparing_competitive_exams = models.CharField(max_length=100, blank=True)
+    internships_currently = OptionField(
+        options=SELECT_OPTIONS["internships_currently"], blank=True
+    )
+    preparing_competitive_exams = OptionField(
+        options=SELECT_OPTIONS["preparing_competitive_exams"], blank=True
+    )
     course_help_in_competitive_exams = models.TextField(blank=True)
 
     # 5. Career Plans & Preferences
-    wants_job_immediately = models.CharField(max_length=100, blank=True)
+    wants_job_immediately = OptionField(
+        options=SELECT_OPTIONS["wants_job_immediately"], blank=True
+    )
     plans_higher_education = models.TextField(blank=True)
     preferred_job_location = models.CharField(max_length=150, blank=True)
-    comfortable_shift_jobs = models.CharField(max_length=100, blank=True)
+    comfortable_shift_jobs = OptionField(
+        options=SELECT_OPTIONS["comfortable_shift_jobs"], blank=True
+    )
 
     # 6. Course Commitment & Availability
-    can_spend_4_hours_daily = models.CharField(max_length=100, blank=True)
-    can_submit_assignments_on_time = models.CharField(max_length=100, blank=True)
+    can_spend_4_hours_daily = OptionField(
+        options=SELECT_OPTIONS["can_spend_4_hours_daily"], blank=True
+    )
+    can_submit_assignments_on_time = OptionField(
+        options=SELECT_OPTIONS["can_submit_assignments_on_time"], blank=True
+    )
     course_importance_and_need = models.TextField(blank=True)
-    can_attend_webinars = models.CharField(max_length=100, blank=True)
+    can_attend_webinars = OptionField(options=SELECT_OPTIONS["can_attend_webinars"], blank=True)
 
     # 7. Technical Readiness
-    has_computer_or_laptop = models.CharField(max_length=100, blank=True)
-    has_smartphone = models.CharField(max_length=100, blank=True)
+    has_computer_or_laptop = OptionField(
+        options=SELECT_OPTIONS["has_computer_or_laptop"], blank=True
+    )
+    has_smartphone = OptionField(options=SELECT_OPTIONS["has_smartphone"], blank=True)
 
     # 8. Residential Details
     residential_address = models.TextField(blank=True)
@@ -69,7 +92,7 @@ class StudentRegistration(models.Model):
     currently_staying_in = models.CharField(max_length=150, blank=True)
 
     # 9. Family Details
-    single_parent = models.CharField(max_length=100, blank=True)
+    single_parent = OptionField(options=SELECT_OPTIONS["single_parent"], blank=True)
     parents_details = models.TextField(blank=True)
     father_or_guardian_name = models.CharField(max_length=200, blank=True)
     father_or_guardian_contact = models.CharField(max_length=20, blank=True)
@@ -78,10 +101,10 @@ class StudentRegistration(models.Model):
     annual_family_income = models.CharField(max_length=100, blank=True)
     family_members_count = models.CharField(max_length=50, blank=True)
     highest_family_education = models.CharField(max_length=150, blank=True)
-    social_category = models.CharField(max_length=50, blank=True)
+    social_category = OptionField(options=SELECT_OPTIONS["social_category"], blank=True)
 
     # 10. Course Application Status
-    application_status = models.CharField(max_length=100, blank=True)
+    application_status = OptionField(options=SELECT_OPTIONS["application_status"], blank=True)
     referral_source = models.CharField(max_length=200, blank=True)
 
     # Admin handling
@@ -94,6 +117,240 @@ class StudentRegistration(models.Model):
         blank=True,
         related_name="student_registration",
     )
+    # Earliest registration sharing an email, phone or ID number when this one
+    # was submitted; see LMS.duplicates.
+    duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+    class Meta:
+        # Match the dashboard query shapes: newest first, optionally narrowed by
+        # status or a case-folded batch number, paged on (submitted_at, id). The
+        # status filter is a bare boolean predicate, which SQLite can only serve
+        # from partial indexes carrying the same condition.
+        indexes = [
+            models.Index(fields=["-submitted_at", "-id"], name="lms_reg_submitted_idx"),
+            models.Index(
+                fields=["-submitted_at", "-id"],
+                condition=models.Q(account_created=False),
+                name="lms_reg_pending_idx",
+            ),
+            models.Index(
+                fields=["-submitted_at", "-id"],
+                condition=models.Q(account_created=True),
+                name="lms_reg_created_idx",
+            ),
+            models.Index(
+                Lower("batch_no"),
+                models.F("submitted_at").desc(),
+                models.F("id").desc(),
+                name="lms_reg_batch_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.full_name} ({self.email})"
+
+
+class RegistrationSearchEntry(models.Model):
+    # FTS5 virtual table maintained by triggers on StudentRegistration; see LMS.search.
+    registration = models.OneToOneField(
+        StudentRegistration,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        related_name="search_entry",
+    )
+    full_name = models.TextField()
+    email = models.TextField()
+    phone = models.TextField()
+    referral_source = models.TextField()
+    document = SearchDocumentField(db_column="LMS_registration_search")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "LMS_registration_search"
+
+
+class RegistrationIdentity(models.Model):
+    # Normalised contact keys (case-folded email, phone digits, ID number) for
+    # duplicate detection, maintained by triggers on StudentRegistration; see
+    # LMS.duplicates.
+    registration = models.ForeignKey(
+        StudentRegistration,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="identities",
+    )
+    kind = models.CharField(max_length=16)
+    value = models.CharField(max_length=254)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["kind", "value"], name="lms_identity_lookup_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}={self.value} (registration {self.registration_id})"
+
+
+class RegistrationChange(models.Model):
+    # Change log for delta exports, maintained by triggers on StudentRegistration:
+    # every insert, update or delete renumbers the registration's single row to
+    # the next seq, so rows with seq > a watermark are exactly the registrations
+    # changed since it. See LMS.exports.registration_changes and
+    # stream_registration_changes_csv. LMS.archive turns the delete its moves
+    # leave behind into an ``archived`` entry; the triggers' next write for the
+    # registration, a restore included, resets the flag through its db_default.
+    seq = models.BigAutoField(primary_key=True)
+    registration = models.OneToOneField(
+        StudentRegistration,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="change_entry",
+    )
+    deleted = models.BooleanField(default=False)
+    archived = models.BooleanField(default=False, db_default=False)
+
+    def __str__(self):
+        action = "archived" if self.archived else "deleted" if self.deleted else "changed"
+        return f"#{self.seq}: registration {self.registration_id} {action}"
+
+
+class ArchivedRegistration(models.Model):
+    # A registration moved out of the active table by LMS.archive. The columns
+    # the dashboard filters, lists and searches on, and those the statistics
+    # count, are kept as they were; every other answer is packed into
+    # ``answers`` as zlib-compressed JSON. The id is the registration's own, so
+    # it is never reused and restoring keeps it.
+    id = models.BigIntegerField(primary_key=True)
+    submitted_at = models.DateTimeField()
+    archived_at = models.DateTimeField()
+    batch_no = models.CharField(max_length=100, blank=True)
+    full_name = models.CharField(max_length=200)
+    email = models.EmailField()
+    contact_number = models.CharField(max_length=20)
+    referral_source = models.CharField(max_length=200, blank=True)
+    gender = OptionField(options=SELECT_OPTIONS["gender"], blank=True)
+    social_category = OptionField(options=SELECT_OPTIONS["social_category"], blank=True)
+    account_created = models.BooleanField(default=False)
+    created_user = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    # May point at an active or an archived registration, so it is not a key.
+    duplicate_of_id = models.BigIntegerField(null=True, blank=True)
+    answers = models.BinaryField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-submitted_at", "-id"], name="lms_archive_submitted_idx"),
+            models.Index(
+                Lower("batch_no"),
+                models.F("submitted_at").desc(),
+                models.F("id").desc(),
+                name="lms_archive_batch_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.full_name} ({self.email}), archived"
+
+
+class ArchivedRegistrationSearchEntry(models.Model):
+    # FTS5 twin of RegistrationSearchEntry for the archive, maintained by
+    # triggers on ArchivedRegistration.
+    registration = models.OneToOneField(
+        ArchivedRegistration,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="rowid",
+        db_constraint=False,
+        related_name="search_entry",
+    )
+    full_name = models.TextField()
+    email = models.TextField()
+    phone = models.TextField()
+    referral_source = models.TextField()
+    document = SearchDocumentField(db_column="LMS_archive_search")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "LMS_archive_search"
+
+
+class RegistrationStat(models.Model):
+    # Registration counters per (dimension, bucket), e.g. ("batch", "B12") or
+    # ("day", "2026-03-01"), kept current by LMS.stats so the statistics panel
+    # never aggregates the registrations table.
+    dimension = models.CharField(max_length=32)
+    bucket = models.CharField(max_length=200)
+    pending = models.IntegerField(default=0)
+    created = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["dimension", "bucket"], name="lms_stat_bucket_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.dimension}={self.bucket}: {self.pending} pending, {self.created} created"
+
+
+class BackgroundJob(models.Model):
+    # A long-running admin operation (an export, bulk provisioning) queued for
+    # `manage.py run_jobs`; see LMS.jobs.
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    kind = models.CharField(max_length=40)
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=QUEUED)
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(default=0)
+    message = models.TextField(blank=True)
+    # File name of the finished artifact inside the job's artifact directory.
+    artifact = models.CharField(max_length=200, blank=True)
+    created_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "id"], name="lms_job_queue_idx"),
+        ]
+
+    @property
+    def finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+    @property
+    def percent(self):
+        if self.status == self.SUCCEEDED:
+            return 100
+        return min(100, self.progress * 100 // self.total) if self.total else 0
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
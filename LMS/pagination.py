@@ -0,0 +1,150 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+PAGE_SIZE_CHOICES = [25, 50, 100, 200]
+DEFAULT_PAGE_SIZE = 50
+
+
+def parse_page_size(value, default=DEFAULT_PAGE_SIZE):
+    try:
+        page_size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return page_size if page_size in PAGE_SIZE_CHOICES else default
+
+
+def encode_cursor(values, direction):
+    payload = json.dumps({"v": values, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    if not token:
+        return None, "next"
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, direction = payload["v"], payload["d"]
+    except (ValueError, KeyError, TypeError):
+        return None, "next"
+    if not isinstance(values, list) or direction not in ("next", "prev"):
+        return None, "next"
+    return values, direction
+
+
+def key_field(queryset, name):
+    if name in queryset.query.annotations:
+        return queryset.query.annotations[name].output_field
+    return queryset.model._meta.get_field(name)
+
+
+def cursor_value(row, name):
+    value = getattr(row, name)
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def seek_filter(keys, values, forward):
+    # Lexicographic "row comes after the cursor" condition:
+    # (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... with > flipped for descending keys.
+    # The redundant leading k1 >= v1 bound lets SQLite turn it into an index range
+    # seek instead of scanning the index from the start.
+    condition = Q()
+    equal = Q()
+    for (field_name, descending), value in zip(keys, values):
+        lookup = "lt" if descending == forward else "gt"
+        condition |= equal & Q(**{f"{field_name}__{lookup}": value})
+        equal &= Q(**{field_name: value})
+    (first_name, first_descending), first_value = keys[0], values[0]
+    first_lookup = "lte" if first_descending == forward else "gte"
+    return Q(**{f"{first_name}__{first_lookup}": first_value}) & condition
+
+
+def cursor_key_values(fields, values):
+    """Convert decoded cursor values to the keys' Python types, or ``None``."""
+    if len(values) != len(fields):
+        return None
+    try:
+        values = [field.to_python(value) for field, value in zip(fields, values)]
+    except (ValidationError, TypeError, ValueError):
+        # A tampered cursor: to_python() raises TypeError for e.g. a number
+        # where a timestamp belongs.
+        return None
+    return None if None in values else values
+
+
+def keyset_page_query(queryset, keys, cursor, page_size):
+    """Return ``(query, forward, seeking, later)`` for one page; nothing is run yet.
+
+    ``later`` is only set on a backward page: the rows from the cursor on, which
+    decide whether the page has a next page. The cursor row itself may have been
+    deleted since, so that cannot be assumed.
+    """
+    fields = [key_field(queryset, field_name) for field_name, _ in keys]
+    values, direction = decode_cursor(cursor)
+    forward = direction == "next"
+
+    if values is not None:
+        values = cursor_key_values(fields, values)
+        if values is None:
+            forward = True
+
+    later = None
+    if values is not None:
+        if not forward:
+            at_cursor = Q(**{field_name: value for (field_name, _), value in zip(keys, values)})
+            later = queryset.filter(seek_filter(keys, values, True) | at_cursor)
+        queryset = queryset.filter(seek_filter(keys, values, forward))
+
+    ordering = [
+        f"-{field_name}" if descending == forward else field_name
+        for field_name, descending in keys
+    ]
+    return queryset.order_by(*ordering)[: page_size + 1], forward, values is not None, later
+
+
+def keyset_page(rows, keys, forward, seeking, page_size, has_later=False):
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if not forward:
+        rows.reverse()
+
+    if forward:
+        has_next, has_previous = has_more, seeking
+    else:
+        has_next, has_previous = has_later, has_more
+
+    def row_cursor(row, row_direction):
+        return encode_cursor([cursor_value(row, name) for name, _ in keys], row_direction)
+
+    return {
+        "items": rows,
+        "page_size": page_size,
+        "next_cursor": row_cursor(rows[-1], "next") if rows and has_next else "",
+        "prev_cursor": row_cursor(rows[0], "prev") if rows and has_previous else "",
+    }
+
+
+def keyset_paginate(queryset, keys, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """Return one page of ``queryset`` ordered by ``keys`` without OFFSET.
+
+    ``keys`` is a list of ``(field_name, descending)`` pairs whose combination is
+    unique (end it with the primary key); annotations may be used as keys. Each
+    page seeks past the cursor row, so page 1000 costs the same index range scan
+    as page 1.
+    """
+    query, forward, seeking, later = keyset_page_query(queryset, keys, cursor, page_size)
+    has_later = later is not None and later.exists()
+    return keyset_page(list(query), keys, forward, seeking, page_size, has_later)
+
+
+async def akeyset_paginate(queryset, keys, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """Async version of :func:`keyset_paginate`, for async views."""
+    query, forward, seeking, later = keyset_page_query(queryset, keys, cursor, page_size)
+    has_later = later is not None and await later.aexists()
+    return keyset_page(
+        [row async for row in query], keys, forward, seeking, page_size, has_later
+    )
@@ -0,0 +1,40 @@
+from .binding import REGISTRATION_DISPLAY
+
+
+# The StudentRegistration columns each page reads; everything else stays in
+# the table. Dashboard rows were loading every answer, long free-text ones
+# included, to show seven of them. Exports read their chosen columns through
+# values_list() (see LMS.exports.export_columns) and need no entry here.
+REGISTRATION_PROJECTIONS = {
+    "dashboard": (
+        "id",
+        "submitted_at",
+        "full_name",
+        "email",
+        "contact_number",
+        "account_created",
+        "created_user",
+        "duplicate_of",
+    ),
+    "detail": (
+        "id",
+        "submitted_at",
+        "account_created",
+        "created_user",
+        "duplicate_of",
+        *(
+            field_name
+            for _section_title, fields in REGISTRATION_DISPLAY
+            for field_name, _field_label in fields
+        ),
+    ),
+}
+
+
+def project_registrations(registrations, view):
+    """Load only the columns ``view`` declares in REGISTRATION_PROJECTIONS.
+
+    Touching any other field on a row costs a query per row, so add it to the
+    projection when a template starts using it.
+    """
+    return registrations.only(*REGISTRATION_PROJECTIONS[view])
@@ -0,0 +1,229 @@
+import os
+import re
+import secrets
+import string
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .cache import invalidate_student_profiles, invalidate_users
+from .models import StudentProfile, StudentRegistration
+from .stats import record_accounts_created
+
+
+DEFAULT_USERNAME_FORMAT = "{first}{id}"
+DEFAULT_PASSWORD_LENGTH = 10
+USERNAME_PLACEHOLDERS = {"id", "first", "last", "batch"}
+PASSWORD_ALPHABET = string.ascii_letters + string.digits
+# Below this many passwords, starting worker processes costs more than it saves.
+INLINE_HASH_LIMIT = 8
+
+CREDENTIAL_SHEET_HEADER = [
+    "registration_id",
+    "full_name",
+    "email",
+    "user_id",
+    "username",
+    "password",
+]
+
+
+def split_full_name(full_name):
+    name_parts = full_name.split(maxsplit=1)
+    first_name = name_parts[0] if name_parts else ""
+    last_name = name_parts[1] if len(name_parts) > 1 else ""
+    return first_name, last_name
+
+
+def student_profile_for_registration(user, registration):
+    return StudentProfile(
+        user=user,
+        course_name="Cloud Computing",
+        course_duration="TBD",
+        progress_percent=0,
+        notes=f"Registration ID: {registration.id}",
+    )
+
+
+def default_username_format():
+    return getattr(settings, "LMS_USERNAME_FORMAT", DEFAULT_USERNAME_FORMAT)
+
+
+def default_password_length():
+    return getattr(settings, "LMS_PASSWORD_LENGTH", DEFAULT_PASSWORD_LENGTH)
+
+
+def format_field_names(username_format):
+    # Replacement fields can nest inside a format spec, as in "{id:{first}}".
+    for _literal, field_name, spec, _conversion in string.Formatter().parse(username_format):
+        if field_name is not None:
+            yield field_name
+            yield from format_field_names(spec or "")
+
+
+def validate_username_format(username_format):
+    try:
+        placeholders = set(format_field_names(username_format))
+    except ValueError:
+        return "Username format has an unbalanced brace."
+    # Only bare names: "{first.upper}" or "{id[0]}" would look values up.
+    if not placeholders <= USERNAME_PLACEHOLDERS:
+        return "Username format may only use {id}, {first}, {last} and {batch}."
+    if "id" not in placeholders:
+        return "Username format must include {id} so every username stays unique."
+    try:
+        username_format.format(id=1, first="first", last="last", batch="batch")
+    except (ValueError, IndexError, KeyError, AttributeError, TypeError):
+        return "Username format has an invalid placeholder specification."
+    return ""
+
+
+def render_username(username_format, registration):
+    first_name, last_name = split_full_name(registration.full_name)
+    username = username_format.format(
+        id=registration.id,
+        first=first_name,
+        last=last_name,
+        batch=registration.batch_no,
+    )
+    username = re.sub(r"[^\w.@+-]", "", User.normalize_username(username).lower())
+    return username[:150] or f"student{registration.id}"
+
+
+def assign_usernames(registrations, username_format):
+    bases = {
+        registration.id: render_username(username_format, registration)
+        for registration in registrations
+    }
+    # One query for clashes with existing accounts instead of one per username.
+    taken = set(
+        User.objects.filter(username__in=set(bases.values())).values_list("username", flat=True)
+    )
+    usernames = {}
+    for registration_id, base in bases.items():
+        username, suffix = base, 1
+        while username in taken:
+            suffix += 1
+            username = f"{base}{suffix}"
+        taken.add(username)
+        usernames[registration_id] = username
+    return usernames
+
+
+def generate_password(length):
+    return "".join(secrets.choice(PASSWORD_ALPHABET) for _ in range(length))
+
+
+def setup_hash_worker(settings_module):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    import django
+
+    django.setup()
+
+
+def hash_passwords(passwords, progress=None):
+    """Hash ``passwords`` with the configured hasher, spread across CPU cores.
+
+    ``progress(done, total)``, if given, is called as hashes complete.
+    """
+    workers = min(os.cpu_count() or 1, len(passwords))
+    if workers == 1 or len(passwords) <= INLINE_HASH_LIMIT:
+        hashes = map(make_password, passwords)
+        return collect_hashes(hashes, len(passwords), progress)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=setup_hash_worker,
+        initargs=(settings.SETTINGS_MODULE,),
+    ) as pool:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        hashes = pool.map(make_password, passwords, chunksize=chunksize)
+        return collect_hashes(hashes, len(passwords), progress)
+
+
+def collect_hashes(hashes, total, progress):
+    if progress is None:
+        return list(hashes)
+    collected = []
+    for password_hash in hashes:
+        collected.append(password_hash)
+        progress(len(collected), total)
+    return collected
+
+
+def provision_credentials(registrations, username_format, password_length, progress=None):
+    """Create student accounts for every pending registration in ``registrations``.
+
+    Returns one credential-sheet row per account, including the plain-text
+    password, which is never stored. Password hashing dominates the run time,
+    so ``progress(done, total)`` is reported from it.
+    """
+    registrations = list(registrations.filter(account_created=False).order_by("id"))
+    if not registrations:
+        return []
+
+    usernames = assign_usernames(registrations, username_format)
+    passwords = [generate_password(password_length) for _ in registrations]
+    password_hashes = hash_passwords(passwords, progress)
+
+    with transaction.atomic():
+        still_pending = set(
+            StudentRegistration.objects.filter(
+                id__in=[registration.id for registration in registrations],
+                account_created=False,
+            ).values_list("id", flat=True)
+        )
+        pending = [
+            (registration, password, password_hash)
+            for registration, password, password_hash in zip(
+                registrations, passwords, password_hashes
+            )
+            if registration.id in still_pending
+        ]
+
+        users = []
+        for registration, _password, password_hash in pending:
+            first_name, last_name = split_full_name(registration.full_name)
+            users.append(
+                User(
+                    username=usernames[registration.id],
+                    password=password_hash,
+                    email=User.objects.normalize_email(registration.email),
+                    first_name=first_name,
+                    last_name=last_name,
+                )
+            )
+        users = User.objects.bulk_create(users)
+
+        StudentProfile.objects.bulk_create(
+            student_profile_for_registration(user, registration)
+            for user, (registration, _password, _hash) in zip(users, pending)
+        )
+
+        for user, (registration, _password, _hash) in zip(users, pending):
+            registration.account_created = True
+            registration.created_user = user
+        StudentRegistration.objects.bulk_update(
+            [registration for registration, _password, _hash in pending],
+            ["account_created", "created_user"],
+        )
+        record_accounts_created([registration for registration, _password, _hash in pending])
+
+    # bulk_create skips the post_save signals that normally drop cached profiles
+    # and users.
+    invalidate_student_profiles([user.id for user in users])
+    invalidate_users([user.id for user in users])
+    return [
+        [
+            registration.id,
+            registration.full_name,
+            registration.email,
+            user.id,
+            user.username,
+            password,
+        ]
+        for user, (registration, password, _hash) in zip(users, pending)
+    ]
@@ -0,0 +1,202 @@
+import hashlib
+from types import MappingProxyType
+
+
+REGISTRATION_SECTIONS = [
+    (
+        "1. Basic Information",
+        [
+            ("batch_no", "Batch No", "text"),
+            ("batch_timings", "Batch Timings", "text"),
+            ("faculty_name", "Faculty Name", "text"),
+        ],
+    ),
+    (
+        "2. Personal Details",
+        [
+            ("full_name", "Full Name (As per your certificate)", "text"),
+            ("email", "Email ID", "email"),
+            ("unique_id_proof_type", "Type of Unique ID Proof", "text"),
+            ("unique_id_number", "Unique ID Number", "text"),
+            ("date_of_birth", "Date Of Birth", "date"),
+            ("contact_number", "Contact Number", "text"),
+            ("whatsapp_number", "WhatsApp Number", "text"),
+            ("gender", "Gender", "text"),
+        ],
+    ),
+    (
+        "3. Educational Details",
+        [
+            ("graduation_status", "Graduation Status", "text"),
+            ("current_education_qualification", "Current Education Qualification", "text"),
+            ("ug_discipline", "UG Discipline", "text"),
+            ("studied_college_in", "Studied / Studying College in?", "text"),
+            ("applied_for_pg", "If completed UG, have you applied for PG?", "text"),
+            (
+                "ug_pg_completion_timeline",
+                "If Final Year student (UG/PG), when will course be completed?",
+                "text",
+            ),
+            ("last_or_current_college_name", "Last / Current College Name", "text"),
+            ("college_address", "College Address", "textarea"),
+        ],
+    ),
+    (
+        "4. Current Status (Study / Work)",
+        [
+            ("currently_studying_or_working", "Currently Studying or Working?", "text"),
+            (
+                "work_office_designation_salary",
+                "If Working - Office Name, Designation, Salary",
+                "textarea",
+            ),
+            ("internships_currently", "Do you have any internships going on currently?", "text"),
+            ("preparing_competitive_exams", "Are you preparing for any Competitive Exams?", "text"),
+            (
+                "course_help_in_competitive_exams",
+                "If yes, how will this course help in competitive exams?",
+                "textarea",
+            ),
+        ],
+    ),
+    (
+        "5. Career Plans & Preferences",
+        [
+            (
+                "wants_job_immediately",
+                "Interested in getting a job immediately after finishing course?",
+                "text",
+            ),
+            ("plans_higher_education", "Planning for higher education? If yes, details", "textarea"),
+            ("preferred_job_location", "Preferred Job Location", "text"),
+            ("comfortable_shift_jobs", "Comfortable with shift timing jobs?", "text"),
+        ],
+    ),
+    (
+        "6. Course Commitment & Availability",
+        [
+            (
+                "can_spend_4_hours_daily",
+                "Can you spend 4 hours daily for Cloud Computing Classes?",
+                "text",
+            ),
+            (
+                "can_submit_assignments_on_time",
+                "Can you submit Assignments/Projects on time?",
+                "text",
+            ),
+            (
+                "course_importance_and_need",
+                "How important is this course to you? Why do you need it?",
+                "textarea",
+            ),
+            ("can_attend_webinars", "Can you attend webinars apart from class timings?", "text"),
+        ],
+    ),
+    (
+        "7. Technical Readiness",
+        [
+            ("has_computer_or_laptop", "Do you have a Computer/Laptop?", "text"),
+            ("has_smartphone", "Do you have a Smartphone?", "text"),
+        ],
+    ),
+    (
+        "8. Residential Details",
+        [
+            ("residential_address", "Complete Residential Address", "textarea"),
+            ("pin_code", "Pin Code", "text"),
+            ("currently_staying_in", "Currently Staying In", "text"),
+        ],
+    ),
+    (
+        "9. Family Details",
+        [
+            ("single_parent", "Single Parent?", "text"),
+            ("parents_details", "Parent/s Details", "textarea"),
+            ("father_or_guardian_name", "Name of Father / Guardian", "text"),
+            ("father_or_guardian_contact", "Contact Number of Father / Guardian", "text"),
+            ("current_working_member", "Who is currently working?", "text"),
+            ("breadwinner_profession", "Profession of Breadwinner in Family", "text"),
+            ("annual_family_income", "Annual Family Income", "text"),
+            ("family_members_count", "Number of Family Members (excluding parents)", "text"),
+            ("highest_family_education", "Highest Education Qualification in Family", "text"),
+            ("social_category", "Category (Gen/OBC/SC/ST)", "text"),
+        ],
+    ),
+    (
+        "10. Course Application Status",
+        [
+            ("application_status", "Applying for FIRST TIME or REJOINING?", "text"),
+            ("referral_source", "How did you come to know about this course?", "text"),
+        ],
+    ),
+]
+
+SELECT_OPTIONS = {
+    "unique_id_proof_type": [
+        "Aadhaar",
+        "PAN",
+        "Passport",
+        "Voter ID",
+        "Driving License",
+        "Other",
+    ],
+    "gender": ["Male", "Female", "Other", "Prefer not to say"],
+    "graduation_status": ["Completed", "Final Year", "Pursuing", "Not Started"],
+    "currently_studying_or_working": ["Studying", "Working", "Both", "Neither"],
+    "internships_currently": ["Yes", "No"],
+    "preparing_competitive_exams": ["Yes", "No"],
+    "wants_job_immediately": ["Yes", "No"],
+    "comfortable_shift_jobs": ["Yes", "No"],
+    "can_spend_4_hours_daily": ["Yes", "No"],
+    "can_submit_assignments_on_time": ["Yes", "No"],
+    "can_attend_webinars": ["Yes", "No"],
+    "has_computer_or_laptop": ["Yes", "No"],
+    "has_smartphone": ["Yes", "No"],
+    "single_parent": ["Yes", "No"],
+    "social_category": ["Gen", "OBC", "SC", "ST", "Other"],
+    "application_status": ["FIRST TIME", "REJOINING"],
+}
+
+REQUIRED_FIELDS = {"full_name", "email", "contact_number"}
+
+
+def build_registration_form_schema():
+    sections = []
+    for section_title, fields in REGISTRATION_SECTIONS:
+        formatted_fields = []
+        for field_name, field_label, field_type in fields:
+            options = tuple(SELECT_OPTIONS.get(field_name, ()))
+            formatted_fields.append(
+                MappingProxyType(
+                    {
+                        "name": field_name,
+                        "label": field_label,
+                        "type": "select" if options else field_type,
+                        "options": options,
+                        "required": field_name in REQUIRED_FIELDS,
+                    }
+                )
+            )
+        sections.append((section_title, tuple(formatted_fields)))
+    return tuple(sections)
+
+
+# Built once at import: the form definition only changes with a deploy. The
+# version keys the cached form markup, so editing any of the definitions above
+# renders a fresh fragment instead of serving stale HTML.
+REGISTRATION_FORM_SCHEMA = build_registration_form_schema()
+REGISTRATION_SCHEMA_VERSION = hashlib.sha1(
+    repr(REGISTRATION_FORM_SCHEMA).encode("utf-8")
+).hexdigest()[:12]
+
+
+def registration_form_with_values(data):
+    """REGISTRATION_FORM_SCHEMA with each field's raw value from ``data``, for re-display."""
+    return tuple(
+        (
+            section_title,
+            tuple({**field, "value": data.get(field["name"], "")} for field in fields),
+        )
+        for section_title, fields in REGISTRATION_FORM_SCHEMA
+    )
@@ -0,0 +1,136 @@
+import re
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, Exists, F, FloatField, Value, When
+from django.db.models.functions import Lower
+
+from .models import ArchivedRegistration, StudentRegistration
+from .sql import phone_sql
+
+
+SEARCH_TABLE = "LMS_registration_search"
+REGISTRATION_TABLE = "LMS_studentregistration"
+
+PHONE_QUERY_RE = re.compile(r"[\d\s\-+().,/]*\d{3}[\d\s\-+().,/]*")
+SEARCH_TERM_RE = re.compile(r"\w+")
+# bm25 has to score every match before the best one is known, at about 8
+# microseconds a row, so a query matching more rows than this (a common surname,
+# say) is listed newest first instead.
+RANKED_SEARCH_LIMIT = 2000
+
+
+def normalize_phone(value):
+    return re.sub(r"\D", "", value or "")
+
+
+def build_match_query(raw_query):
+    """Translate dashboard search text into an FTS5 MATCH expression.
+
+    Phone-looking input is collapsed to digits and matched against the phone
+    column only, where it finds numbers containing those digits (see
+    LMS.sql.phone_sql); anything else becomes an AND of prefix terms, which
+    covers partial names and email prefixes such as ``john.doe@gm``.
+    """
+    raw_query = raw_query.strip()
+    if PHONE_QUERY_RE.fullmatch(raw_query):
+        return f'phone : "{normalize_phone(raw_query)}"*'
+    terms = SEARCH_TERM_RE.findall(raw_query.lower())
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def ranked_search_limit():
+    return getattr(settings, "LMS_RANKED_SEARCH_LIMIT", RANKED_SEARCH_LIMIT)
+
+
+def search_registrations(registrations, raw_query):
+    """Restrict ``registrations`` to FTS matches for ``raw_query``, best first.
+
+    The queryset gains a ``search_rank`` annotation (FTS5 bm25, lower is better)
+    and is ordered by it, then newest first. When more than ranked_search_limit()
+    rows match, every rank is 0.0 and only the submission order remains. The
+    check is part of the query, so nothing runs until it is evaluated.
+    """
+    match_query = build_match_query(raw_query)
+    if not match_query:
+        return registrations.annotate(search_rank=Value(0.0, FloatField())).none()
+    search_entries = registrations.model._meta.get_field("search_entry").related_model
+    limit = ranked_search_limit()
+    beyond_limit = search_entries.objects.filter(document__match=match_query)[limit : limit + 1]
+    return (
+        registrations.filter(search_entry__document__match=match_query)
+        .annotate(
+            search_rank=Case(
+                When(Exists(beyond_limit), then=Value(0.0)),
+                default=F("search_entry__rank"),
+                output_field=FloatField(),
+            )
+        )
+        .order_by("search_rank", "-submitted_at", "-id")
+    )
+
+
+def rebuild_search_index():
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {SEARCH_TABLE}(rowid, full_name, email, phone, referral_source) "
+            f"SELECT id, full_name, lower(email), {phone_sql('contact_number')}, "
+            f"referral_source FROM {REGISTRATION_TABLE}"
+        )
+        cursor.execute(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT count(*) FROM {SEARCH_TABLE}")
+        return cursor.fetchone()[0]
+
+
+def filter_registrations(params, registrations=None):
+    """Apply the dashboard's search, status and batch filters from ``params``.
+
+    ``params`` is ``request.GET`` or any mapping with the same keys, such as a
+    background job's stored parameters. ``registrations`` defaults to the
+    active registrations; archived ones filter the same way. Returns
+    ``(registrations, q, status_filter, batch_filter)``.
+    """
+    q = params.get("q", "").strip()
+    status_filter = params.get("status", "all").strip()
+    batch_filter = params.get("batch", "").strip()
+
+    if registrations is None:
+        registrations = StudentRegistration.objects.all()
+    registrations = registrations.order_by("-submitted_at", "-id")
+
+    if q:
+        registrations = search_registrations(registrations, q)
+
+    if status_filter == "pending":
+        registrations = registrations.filter(account_created=False)
+    elif status_filter == "created":
+        registrations = registrations.filter(account_created=True)
+
+    # The batch filter is a whole-value match, ignoring case, so that it can be
+    # served in page order from lms_reg_batch_idx; a prefix match would have to
+    # sort every matching row first.
+    if batch_filter:
+        registrations = registrations.alias(batch_key=Lower("batch_no")).filter(
+            batch_key=batch_filter.lower()
+        )
+
+    return registrations, q, status_filter, batch_filter
+
+
+def include_archived(params):
+    return params.get("include_archived", "").strip() in ("1", "on")
+
+
+def filter_archived_registrations(params):
+    """The archived registrations matching ``params``, or ``None`` unless they asked.
+
+    Archived rows are only read when ``params`` has ``include_archived``, so the
+    default dashboard, search and exports never touch the archive.
+    """
+    if not include_archived(params):
+        return None
+    registrations, _q, _status, _batch = filter_registrations(
+        params, ArchivedRegistration.objects.all()
+    )
+    return registrations
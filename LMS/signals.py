@@ -0,0 +1,51 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate_student_profiles, invalidate_users
+from .models import StudentProfile, StudentRegistration
+from .stats import STAT_SOURCE_FIELDS, record_registration_changes, registration_stat_state
+
+
+@receiver([post_save, post_delete], sender=StudentProfile)
+def invalidate_cached_profile(sender, instance, **kwargs):
+    invalidate_student_profiles([instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_users([instance.pk])
+
+
+@receiver(pre_save, sender=StudentRegistration)
+def remember_registration_stat_state(
+    sender, instance, raw=False, using=None, update_fields=None, **kwargs
+):
+    # Updates need the stored values to know which counters to move.
+    instance._stat_state_before = None
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not STAT_SOURCE_FIELDS.intersection(update_fields):
+        return
+    instance._stat_state_before = (
+        StudentRegistration.objects.using(using)
+        .filter(pk=instance.pk)
+        .values(*STAT_SOURCE_FIELDS)
+        .first()
+    )
+
+
+@receiver(post_save, sender=StudentRegistration)
+def count_saved_registration(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, "_stat_state_before", None)
+    if created:
+        record_registration_changes(after=[registration_stat_state(instance)])
+    elif before is not None:
+        record_registration_changes(before=[before], after=[registration_stat_state(instance)])
+
+
+@receiver(post_delete, sender=StudentRegistration)
+def count_deleted_registration(sender, instance, **kwargs):
+    record_registration_changes(before=[registration_stat_state(instance)])
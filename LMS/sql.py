@@ -0,0 +1,28 @@
+# SQL expressions shared by the search index and duplicate detection. The
+# migrations that create their triggers keep frozen copies of this SQL, so a
+# change here also needs a new migration that recreates the triggers with it.
+
+# Characters stripped from contact numbers before indexing, so "+91 98765-43210"
+# and "919876543210" index (and search) as the same digits.
+PHONE_SEPARATORS = " -+().,/"
+
+
+def digits_sql(column):
+    expression = column
+    for separator in PHONE_SEPARATORS:
+        expression = f"replace({expression}, '{separator}', '')"
+    return expression
+
+
+# Shortest suffix of the local number indexed for substring search; the
+# dashboard treats a query as a phone number from three digits on.
+MIN_PHONE_SUFFIX = 3
+
+
+def phone_sql(column):
+    # Index the full digit string, so numbers stored with a country code match
+    # it, and every suffix of the last ten digits down to MIN_PHONE_SUFFIX. A
+    # run of digits anywhere in the local number is a prefix of one of them.
+    digits = digits_sql(column)
+    suffixes = [f"substr({digits}, -{length})" for length in range(10, MIN_PHONE_SUFFIX - 1, -1)]
+    return " || ' ' || ".join([digits, *suffixes])
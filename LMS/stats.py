@@ -0,0 +1,176 @@
+from datetime import timedelta
+from itertools import product
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import ArchivedRegistration, RegistrationStat, StudentRegistration
+
+
+# (dimension, label, source field) for every counter family on the statistics panel.
+STAT_DIMENSIONS = [
+    ("batch", "Batch", "batch_no"),
+    ("referral_source", "Referral Source", "referral_source"),
+    ("gender", "Gender", "gender"),
+    ("social_category", "Social Category", "social_category"),
+    ("day", "Day", "submitted_at"),
+]
+STAT_SOURCE_FIELDS = {field_name for _, _, field_name in STAT_DIMENSIONS} | {"account_created"}
+DEFAULT_STAT_DAYS = 30
+
+
+def stat_bucket(field_name, value):
+    if field_name == "submitted_at":
+        return timezone.localdate(value).isoformat() if value else ""
+    return value or ""
+
+
+def registration_stat_state(registration):
+    return {field_name: getattr(registration, field_name) for field_name in STAT_SOURCE_FIELDS}
+
+
+def apply_stat_deltas(deltas):
+    rows = [
+        (dimension, bucket, pending, created)
+        for (dimension, bucket), (pending, created) in deltas.items()
+        if pending or created
+    ]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {RegistrationStat._meta.db_table} (dimension, bucket, pending, created) "
+            "VALUES (%s, %s, %s, %s) "
+            "ON CONFLICT (dimension, bucket) DO UPDATE SET "
+            "pending = pending + excluded.pending, created = created + excluded.created",
+            rows,
+        )
+
+
+def record_registration_changes(before=(), after=()):
+    """Move counters from the ``before`` states to the ``after`` states.
+
+    Each state is a mapping of ``STAT_SOURCE_FIELDS``, as built by
+    :func:`registration_stat_state`; pass only ``after`` for new registrations
+    and only ``before`` for deleted ones.
+    """
+    deltas = {}
+    for states, sign in ((before, -1), (after, 1)):
+        for state in states:
+            column = 1 if state["account_created"] else 0
+            for dimension, _label, field_name in STAT_DIMENSIONS:
+                key = (dimension, stat_bucket(field_name, state[field_name]))
+                deltas.setdefault(key, [0, 0])[column] += sign
+    apply_stat_deltas(deltas)
+
+
+def record_registrations_added(registrations):
+    record_registration_changes(after=[registration_stat_state(r) for r in registrations])
+
+
+def record_accounts_created(registrations):
+    after = [registration_stat_state(registration) for registration in registrations]
+    before = [{**state, "account_created": False} for state in after]
+    record_registration_changes(before, after)
+
+
+def rebuild_registration_stats(
+    registration_models=(StudentRegistration, ArchivedRegistration), stat_model=RegistrationStat
+):
+    """Recompute every counter from the registrations tables; returns the bucket count.
+
+    The counters are historical: archived registrations count as they did
+    when they were active.
+    """
+    with transaction.atomic():
+        # The write transaction holds SQLite's lock from the first statement, so
+        # no incremental update can slip in between the aggregation and the swap.
+        stat_model.objects.all().delete()
+        counts = {}
+        for registration_model, (dimension, _label, field_name) in product(
+            registration_models, STAT_DIMENSIONS
+        ):
+            bucket = TruncDate(field_name) if field_name == "submitted_at" else F(field_name)
+            rows = (
+                registration_model.objects.order_by()
+                .values(bucket_value=bucket)
+                .annotate(
+                    pending=Count("id", filter=Q(account_created=False)),
+                    created=Count("id", filter=Q(account_created=True)),
+                )
+            )
+            for row in rows:
+                value = row["bucket_value"]
+                if hasattr(value, "isoformat"):
+                    value = value.isoformat()
+                count = counts.setdefault((dimension, value or ""), [0, 0])
+                count[0] += row["pending"]
+                count[1] += row["created"]
+        stat_model.objects.bulk_create(
+            (
+                stat_model(dimension=dimension, bucket=bucket, pending=pending, created=created)
+                for (dimension, bucket), (pending, created) in counts.items()
+            ),
+            batch_size=1000,
+        )
+    return len(counts)
+
+
+def stat_totals_query():
+    # Every registration sits in exactly one batch bucket, so summing that
+    # dimension gives the overall totals in O(number of batches).
+    return RegistrationStat.objects.filter(dimension="batch"), {
+        "pending": Sum("pending", default=0),
+        "created": Sum("created", default=0),
+    }
+
+
+def registration_stat_totals():
+    stats, sums = stat_totals_query()
+    totals = stats.aggregate(**sums)
+    totals["total"] = totals["pending"] + totals["created"]
+    return totals
+
+
+async def aregistration_stat_totals():
+    stats, sums = stat_totals_query()
+    totals = await stats.aaggregate(**sums)
+    totals["total"] = totals["pending"] + totals["created"]
+    return totals
+
+
+def registration_stats_summary(days=DEFAULT_STAT_DAYS):
+    """Group the counters for display, reading one row per non-empty bucket.
+
+    Day buckets are limited to the last ``days`` days, newest first.
+    """
+    since = (timezone.localdate() - timedelta(days=days - 1)).isoformat()
+    stats = (
+        RegistrationStat.objects.filter(Q(pending__gt=0) | Q(created__gt=0))
+        .exclude(dimension="day", bucket__lt=since)
+        .values_list("dimension", "bucket", "pending", "created")
+    )
+    buckets = {dimension: [] for dimension, _, _ in STAT_DIMENSIONS}
+    for dimension, bucket, pending, created in stats:
+        if dimension in buckets:
+            buckets[dimension].append(
+                {"bucket": bucket, "pending": pending, "created": created, "total": pending + created}
+            )
+
+    totals = {
+        "pending": sum(row["pending"] for row in buckets["batch"]),
+        "created": sum(row["created"] for row in buckets["batch"]),
+    }
+    totals["total"] = totals["pending"] + totals["created"]
+
+    sections = []
+    for dimension, label, _field_name in STAT_DIMENSIONS:
+        rows = buckets[dimension]
+        if dimension == "day":
+            rows.sort(key=lambda row: row["bucket"], reverse=True)
+        else:
+            rows.sort(key=lambda row: (-row["total"], row["bucket"].casefold()))
+        sections.append({"dimension": dimension, "label": label, "rows": rows})
+    return {"totals": totals, "sections": sections, "days": days}
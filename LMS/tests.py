@@ -1,3 +1,1664 @@
-from django.test import TestCase
+import csv
+import importlib.util
+import io
+import json
+import os
+import re
+import tempfile
+from datetime import date, timedelta
+from itertools import product
+from unittest import skipUnless
+
+from asgiref.sync import async_to_sync, sync_to_async
+
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.utils import ConnectionHandler
+from django.db.models import Q
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.core.management import call_command
+from django.test import (
+    Client,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+
+from hope.database import sqlite_database
+from hope.metrics import REGISTRY
+from hope.middleware import PRIMARY_PIN_COOKIE, PerformanceMiddleware, ReadYourWritesMiddleware
+from hope.routers import PrimaryReplicaRouter, replica_reads
+
+from .archive import archive_registrations
+from .benchmarks.async_views import routed_views
+from .benchmarks.common import sample_submission
+from .benchmarks.data import seed_benchmark_data
+from .benchmarks.views import compare_benchmark_results, run_view_benchmarks
+from .binding import REGISTRATION_BINDER, bind_registration
+from .checks import check_background_jobs
+from .duplicates import duplicate_clusters, identity_keys
+from .exports import SUMMARY_EXPORT_FIELDS, astream_export, stream_registrations_csv
+from .importers import import_registrations, read_spreadsheet_rows
+from .jobs import job_artifact_path
+from .models import (
+    ArchivedRegistration,
+    BackgroundJob,
+    RegistrationIdentity,
+    RegistrationSearchEntry,
+    RegistrationStat,
+    StudentProfile,
+    StudentRegistration,
+)
+from .outbox import drain_outbox, outbox_connection, pending_outbox_count
+from .pagination import encode_cursor, keyset_paginate
+from .provisioning import provision_credentials, validate_username_format
+from .registration_fields import (
+    REGISTRATION_FORM_SCHEMA,
+    REGISTRATION_SCHEMA_VERSION,
+    SELECT_OPTIONS,
+)
+from .search import build_match_query, filter_registrations
+from .stats import rebuild_registration_stats, registration_stat_totals
+
+
+class DashboardQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="secret", is_staff=True)
+        StudentRegistration.objects.bulk_create(
+            StudentRegistration(
+                full_name=f"Student {index}",
+                email=f"student{index}@example.com",
+                contact_number=f"98765{index:05d}",
+                batch_no=f"B{index % 3}",
+                account_created=index % 2 == 0,
+            )
+            for index in range(120)
+        )
+
+    def registration_query_plans(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("admin_dashboard"), params)
+        self.assertEqual(response.status_code, 200)
+
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                sql = query["sql"]
+                if sql.startswith("SELECT") and '"LMS_studentregistration"' in sql:
+                    cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+                    plans.append([row[-1] for row in cursor.fetchall()])
+        return response, plans
+
+    def test_every_filter_combination_uses_an_index(self):
+        self.client.force_login(self.admin)
+        for status, batch in product(["all", "pending", "created"], ["", "b1"]):
+            params = {"status": status, "batch": batch, "page_size": 25}
+            response, _ = self.registration_query_plans(params)
+            next_cursor = response.context["registrations_page"]["next_cursor"]
+
+            for cursor in ["", next_cursor]:
+                with self.subTest(status=status, batch=batch, cursor=bool(cursor)):
+                    _, plans = self.registration_query_plans({**params, "cursor": cursor})
+                    self.assertTrue(plans)
+                    for plan in plans:
+                        for step in plan:
+                            self.assertNotIn("TEMP B-TREE", step)
+                            if "LMS_studentregistration" in step:
+                                self.assertIn("USING", step)
+                                if cursor or batch:
+                                    self.assertTrue(step.startswith("SEARCH"), step)
+
+    def test_batch_filter_matches_the_whole_batch_ignoring_case(self):
+        StudentRegistration.objects.create(
+            full_name="Late", email="late@example.com", batch_no="B12"
+        )
+        for batch in ["b1", "B1", " B1 "]:
+            with self.subTest(batch=batch):
+                registrations, *_ = filter_registrations({"batch": batch})
+                self.assertEqual(set(registrations.values_list("batch_no", flat=True)), {"B1"})
+        self.client.force_login(self.admin)
+        self.assertContains(self.client.get(reverse("admin_dashboard")), "Exact Batch No")
+
+
+class SearchIndexTests(TestCase):
+    def register(self, **fields):
+        return StudentRegistration.objects.create(
+            **{"full_name": "Asha Rao", "email": "ar@example.com", **fields}
+        )
+
+    def search(self, q):
+        registrations, *_ = filter_registrations({"q": q})
+        return [registration.id for registration in registrations]
+
+    def test_triggers_follow_insert_update_and_delete(self):
+        registration = self.register(
+            contact_number="+91 98765-43210", referral_source="Poster"
+        )
+        entry = RegistrationSearchEntry.objects.get(registration=registration)
+        self.assertEqual(
+            (entry.full_name, entry.email, entry.phone, entry.referral_source),
+            (
+                "Asha Rao",
+                "ar@example.com",
+                "919876543210 9876543210 876543210 76543210 6543210 543210 43210 3210 210",
+                "Poster",
+            ),
+        )
+
+        StudentRegistration.objects.filter(id=registration.id).update(full_name="Meera Iyer")
+        self.assertEqual(self.search("asha"), [])
+        self.assertEqual(self.search("meera"), [registration.id])
+        # Columns outside the index leave it alone.
+        StudentRegistration.objects.filter(id=registration.id).update(batch_no="B9")
+        entries = RegistrationSearchEntry.objects.filter(registration=registration)
+        self.assertEqual(entries.count(), 1)
+
+        registration.delete()
+        self.assertFalse(RegistrationSearchEntry.objects.filter(registration_id=registration.id))
+        self.assertEqual(self.search("meera"), [])
+
+    def test_match_query_quotes_every_term(self):
+        self.assertEqual(build_match_query("  John.Doe@gm "), '"john"* "doe"* "gm"*')
+        self.assertEqual(
+            build_match_query('Asha "AJ" OR NOT rao*'), '"asha"* "aj"* "or"* "not"* "rao"*'
+        )
+        self.assertEqual(
+            build_match_query("NEAR(a b) col:x -y ^z"), '"near"* "a"* "b"* "col"* "x"* "y"* "z"*'
+        )
+        self.assertEqual(build_match_query('"*():^-'), "")
+
+    def test_operators_and_quotes_are_searched_as_text(self):
+        registration = self.register(full_name='Not "Or" Near', contact_number="9876543210")
+        for q in ['"', "*", "(", "a:b", "NEAR(x y)", "OR", 'not "or', "-near", "^"]:
+            with self.subTest(q=q):
+                self.search(q)  # Must not raise an FTS5 syntax error.
+        self.assertEqual(self.search('not "or'), [registration.id])
+        self.assertEqual(self.search("OR"), [registration.id])
+
+    def test_phone_numbers_match_whatever_the_formatting(self):
+        local = self.register(contact_number="98765 43210")
+        international = self.register(email="ar@example.org", contact_number="+91-98765-43211")
+        self.assertEqual(build_match_query("+91 98765-43210"), 'phone : "919876543210"*')
+        self.assertEqual(self.search("9876543210"), [local.id])
+        self.assertEqual(self.search("(98765) 43210"), [local.id])
+        self.assertEqual(self.search("98765-43211"), [international.id])
+        self.assertEqual(self.search("+91 98765 43211"), [international.id])
+        self.assertEqual(self.search("919876543211"), [international.id])
+        self.assertEqual(sorted(self.search("98765")), [local.id, international.id])
+        # The last digits, or any run of digits inside the local number.
+        self.assertEqual(self.search("543210"), [local.id])
+        self.assertEqual(self.search("43211"), [international.id])
+        self.assertEqual(sorted(self.search("6543")), [local.id, international.id])
+        self.assertEqual(self.search("1234"), [])
+
+    def test_results_are_ranked_name_first(self):
+        by_referral = self.register(full_name="Meera Iyer", referral_source="Asha")
+        by_name = self.register(email="x@example.com")
+        self.assertEqual(self.search("asha"), [by_name.id, by_referral.id])
+
+    @override_settings(LMS_RANKED_SEARCH_LIMIT=2)
+    def test_broad_searches_are_listed_newest_first(self):
+        by_name = self.register()
+        by_referral = self.register(full_name="Meera Iyer", referral_source="Asha")
+        self.assertEqual(self.search("asha"), [by_name.id, by_referral.id])
+
+        newest = self.register(full_name="Ravi Asha", email="ra@example.com")
+        self.assertEqual(self.search("asha"), [newest.id, by_referral.id, by_name.id])
+        registrations, *_ = filter_registrations({"q": "asha"})
+        self.assertEqual({registration.search_rank for registration in registrations}, {0.0})
+        self.assertEqual(self.search("ravi"), [newest.id])
+
+
+class KeysetPaginationTests(TestCase):
+    keys = [("submitted_at", True), ("id", True)]
+
+    @classmethod
+    def setUpTestData(cls):
+        StudentRegistration.objects.bulk_create(
+            StudentRegistration(
+                full_name=f"Student {index}",
+                email=f"student{index}@example.com",
+                contact_number=f"98765{index:05d}",
+            )
+            for index in range(8)
+        )
+        # Three submission times shared by several rows, so pages split ties.
+        registrations = StudentRegistration.objects.order_by("id")
+        first = registrations.first().submitted_at
+        for registration in registrations:
+            registration.submitted_at = first - timedelta(minutes=registration.id % 3)
+        StudentRegistration.objects.bulk_update(registrations, ["submitted_at"])
+        cls.ordered = list(
+            StudentRegistration.objects.order_by("-submitted_at", "-id").values_list(
+                "id", flat=True
+            )
+        )
+
+    def page(self, cursor=""):
+        return keyset_paginate(StudentRegistration.objects.all(), self.keys, cursor, 3)
+
+    def ids(self, page):
+        return [registration.id for registration in page["items"]]
+
+    def forward_pages(self):
+        pages = [self.page()]
+        while pages[-1]["next_cursor"]:
+            pages.append(self.page(pages[-1]["next_cursor"]))
+        return pages
+
+    def test_forward_traversal_visits_every_row_once_in_order(self):
+        pages = self.forward_pages()
+        self.assertEqual([len(self.ids(page)) for page in pages], [3, 3, 2])
+        self.assertEqual(sum((self.ids(page) for page in pages), []), self.ordered)
+        self.assertEqual(pages[0]["prev_cursor"], "")
+        self.assertEqual(pages[-1]["next_cursor"], "")
+
+    def test_backward_traversal_returns_the_same_pages(self):
+        forward = self.forward_pages()
+        backward = [forward[-1]]
+        while backward[-1]["prev_cursor"]:
+            backward.append(self.page(backward[-1]["prev_cursor"]))
+        self.assertEqual(
+            [self.ids(page) for page in reversed(backward)], [self.ids(page) for page in forward]
+        )
+        self.assertEqual(backward[-1]["prev_cursor"], "")
+        self.assertTrue(backward[-1]["next_cursor"])
+
+    def test_backward_page_has_no_next_once_later_rows_are_gone(self):
+        second = self.page(self.page()["next_cursor"])
+        StudentRegistration.objects.filter(id__in=self.ordered[3:]).delete()
+        first = self.page(second["prev_cursor"])
+        self.assertEqual(self.ids(first), self.ordered[:3])
+        self.assertEqual(first["next_cursor"], "")
+
+    def test_malformed_or_tampered_cursor_falls_back_to_the_first_page(self):
+        first_ids = self.ids(self.page())
+        for cursor in [
+            "not-a-cursor!",
+            encode_cursor(["2026-01-01T00:00:00+00:00"], "next"),
+            encode_cursor([5, 5], "next"),
+            encode_cursor([None, 5], "prev"),
+            encode_cursor(["yesterday", "x"], "next"),
+            encode_cursor(["2026-01-01T00:00:00+00:00", 5], "sideways"),
+        ]:
+            with self.subTest(cursor=cursor):
+                page = self.page(cursor)
+                self.assertEqual(self.ids(page), first_ids)
+                self.assertEqual(page["prev_cursor"], "")
+
+
+@override_settings(DATABASE_READ_REPLICA="replica", DATABASE_REPLICA_LAG=30)
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def routed_read(self, request):
+        @replica_reads
+        def view(request):
+            return HttpResponse(self.router.db_for_read(StudentRegistration) or "default")
+
+        return ReadYourWritesMiddleware(view)(request)
+
+    def test_reads_use_replica_only_inside_replica_views(self):
+        self.assertIsNone(self.router.db_for_read(StudentRegistration))
+        self.assertEqual(self.routed_read(self.factory.get("/")).content, b"replica")
+        self.assertEqual(self.router.db_for_write(StudentRegistration), "default")
+
+    def test_write_pins_client_to_primary(self):
+        response = self.routed_read(self.factory.post("/"))
+        self.assertEqual(response.content, b"default")
+        self.assertEqual(response.cookies[PRIMARY_PIN_COOKIE]["max-age"], 30)
+
+        request = self.factory.get("/")
+        request.COOKIES[PRIMARY_PIN_COOKIE] = "1"
+        self.assertEqual(self.routed_read(request).content, b"default")
+
+    def test_replica_is_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica", "LMS"))
+        self.assertIsNone(self.router.allow_migrate("default", "LMS"))
+
+    @override_settings(DATABASE_READ_REPLICA=None)
+    def test_without_replica_everything_reads_primary(self):
+        response = self.routed_read(self.factory.post("/"))
+        self.assertEqual(response.content, b"default")
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
+
+
+class DatabaseProfileTests(TestCase):
+    def test_new_connections_get_their_profile_pragmas(self):
+        expected = {
+            "default": {"journal_mode": "delete", "synchronous": 2, "busy_timeout": 5000},
+            "tuned": {"journal_mode": "wal", "synchronous": 1, "busy_timeout": 20000},
+        }
+        with tempfile.TemporaryDirectory() as scratch:
+            for profile, pragmas in expected.items():
+                with self.subTest(profile=profile):
+                    database = sqlite_database(os.path.join(scratch, f"{profile}.db"), profile)
+                    new_connection = ConnectionHandler({"default": database})["default"]
+                    try:
+                        with new_connection.cursor() as cursor:
+                            applied = {}
+                            for pragma in pragmas:
+                                cursor.execute(f"PRAGMA {pragma}")
+                                applied[pragma] = cursor.fetchone()[0]
+                    finally:
+                        new_connection.close()
+                    self.assertEqual(applied, pragmas)
+
+    def test_only_the_primary_takes_the_write_lock_at_begin(self):
+        primary = sqlite_database("primary.db", "tuned")
+        replica = sqlite_database("replica.db", "tuned", replica=True)
+        self.assertEqual(primary["OPTIONS"], {"transaction_mode": "IMMEDIATE"})
+        self.assertEqual(replica["OPTIONS"], {})
+        self.assertEqual(replica["PRAGMAS"], primary["PRAGMAS"])
+
+
+class PerformanceMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="secret", is_staff=True)
+
+    def setUp(self):
+        REGISTRY.reset()
+
+    def test_server_timing_and_histograms(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("admin_dashboard"))
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="\d+ queries", tpl;dur=[\d.]+, size;desc="\d+ bytes"$',
+        )
+
+        summary = self.client.get(reverse("metrics")).json()
+        self.assertEqual(summary["admin_dashboard"]["wall_ms"]["count"], 1)
+        self.assertGreater(summary["admin_dashboard"]["db_queries"]["p50"], 0)
+        self.assertEqual(
+            set(summary["admin_dashboard"]["template_ms"]),
+            {"count", "sum", "max", "p50", "p95", "p99"},
+        )
+
+        prometheus = self.client.get(reverse("metrics"), {"format": "prometheus"}).content.decode()
+        self.assertIn('hope_request_wall_ms_bucket{view="admin_dashboard",le="+Inf"} 1', prometheus)
+
+    def test_metrics_are_staff_only(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 302)
+
+    @override_settings(PERFORMANCE_N_PLUS_ONE_THRESHOLD=3)
+    def test_repeated_query_shape_is_reported(self):
+        def view(request):
+            for index in range(5):
+                list(User.objects.filter(id=index))
+            return HttpResponse()
+
+        with self.assertLogs("hope.performance", "WARNING") as logs:
+            PerformanceMiddleware(view)(RequestFactory().get("/"))
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("ran the same query 5 times", logs.output[0])
+
+
+class ViewBenchmarkTests(TestCase):
+    def test_every_scenario_runs(self):
+        seed_benchmark_data(40, chunk_size=16)
+        results = run_view_benchmarks(repeat=1)
+        self.assertIn("dashboard status=pending&batch=B1&q=Student+42", results)
+        self.assertIn("create credentials", results)
+        for metrics in results.values():
+            self.assertGreater(metrics["queries"], 0)
+            self.assertGreater(metrics["peak_kib"], 0)
+        self.assertLess(
+            results["dashboard unfiltered"]["read_kib"], results["export csv"]["read_kib"]
+        )
+
+    def test_regressions_past_tolerance_are_reported(self):
+        baseline = {"export csv": {"latency_ms": 100.0, "queries": 3, "peak_kib": 1000.0}}
+        within = {"export csv": {"latency_ms": 140.0, "queries": 3, "peak_kib": 1200.0}}
+        self.assertEqual(compare_benchmark_results(baseline, within), [])
+
+        regressed = {"export csv": {"latency_ms": 160.0, "queries": 4, "peak_kib": 1300.0}}
+        regressions = compare_benchmark_results(baseline, regressed)
+        self.assertEqual(len(regressions), 3)
+        self.assertIn("3 -> 4 queries", regressions[0])
+        self.assertIn("latency_ms 100.0 -> 160.0", regressions[1])
+        self.assertIn("peak_kib 1000.0 -> 1300.0", regressions[2])
+
+
+class ImportRegistrationTests(TestCase):
+    HEADER = "Full Name (As per your certificate),email,Contact Number,Date Of Birth,Notes\n"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="secret", is_staff=True)
+
+    def upload(self, content):
+        self.client.force_login(self.admin)
+        upload = SimpleUploadedFile("registrations.csv", content, content_type="text/csv")
+        return self.client.post(reverse("import_registrations"), {"file": upload})
+
+    def test_good_rows_are_imported_and_bad_rows_reported(self):
+        report = import_registrations(
+            csv.reader(
+                io.StringIO(
+                    self.HEADER
+                    + "Asha Rao,asha@example.com,9876543210,2001-04-17,\n"
+                    + ",,,,\n"
+                    + "Ravi Kumar,not-an-email,9876500000,17/04/2001,\n"
+                    + "Meena Iyer,meena@example.com,,,\n"
+                    + "Kiran Das,kiran@example.com,9876511111,,\n"
+                )
+            )
+        )
+        self.assertEqual(report["created"], 2)
+        self.assertEqual(report["ignored_columns"], ["Notes"])
+        self.assertEqual(
+            report["errors"],
+            [
+                {
+                    "row": 4,
+                    "errors": [
+                        "Email ID is not a valid email address.",
+                        "Date Of Birth must be a date in YYYY-MM-DD format.",
+                    ],
+                },
+                {"row": 5, "errors": ["Contact Number is required."]},
+            ],
+        )
+        self.assertEqual(
+            list(StudentRegistration.objects.order_by("id").values_list("full_name", flat=True)),
+            ["Asha Rao", "Kiran Das"],
+        )
+
+    def test_missing_required_columns_import_nothing(self):
+        report = import_registrations([["full_name", "Email ID"], ["Asha", "asha@example.com"]])
+        self.assertEqual(
+            report["errors"],
+            [{"row": 1, "errors": ["Missing required column(s): Contact Number."]}],
+        )
+        self.assertFalse(StudentRegistration.objects.exists())
+
+    def test_decode_error_mid_file_keeps_earlier_batches_and_reports_them(self):
+        good_rows = "".join(
+            f"Student {index},s{index}@example.com,98765{index:05d},,\n" for index in range(5)
+        )
+        content = (
+            (self.HEADER + good_rows).encode()
+            + b"Bad \xff Name,x@example.com,9876500009,,\n"
+            + b"Never Read,late@example.com,9876500010,,\n"
+        )
+        report = import_registrations(
+            read_spreadsheet_rows(io.BytesIO(content), "registrations.csv"), batch_size=2
+        )
+        self.assertEqual(report["created"], 5)
+        self.assertEqual(StudentRegistration.objects.count(), 5)
+        (error,) = report["errors"]
+        self.assertEqual(error["row"], 7)
+        self.assertIn("Could not read the file from this row on", error["errors"][0])
+
+    def test_unreadable_upload_shows_the_partial_report(self):
+        for content in [
+            self.HEADER.encode() + b"Asha Rao,asha@example.com,9876543210,,\n\xff\n",
+            self.HEADER.encode()
+            + b"Asha Rao,asha@example.com,9876543210,,\n"
+            + b'"'
+            + b"x" * (csv.field_size_limit() + 1)
+            + b'"\n',
+        ]:
+            with self.subTest(content=content[-20:]):
+                StudentRegistration.objects.all().delete()
+                response = self.upload(content)
+                self.assertContains(response, "Could not read the file from this row on")
+                report = response.context["report"]
+                self.assertEqual(report["created"], 1)
+                self.assertEqual(report["errors"][0]["row"], 3)
+
+
+class ProvisioningTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="secret", is_staff=True)
+        for name in ["Asha Rao", "Ravi Kumar"]:
+            StudentRegistration.objects.create(
+                full_name=name,
+                email=f"{name.split()[0].lower()}@example.com",
+                contact_number="9876543210",
+                batch_no="B1",
+            )
+
+    def test_malformed_username_formats_are_rejected(self):
+        for username_format in [
+            "{id}{first.x}",
+            "{id[0]}{first}",
+            "{id:{first.x}}",
+            "{id:{id[0]}}",
+            "{id:{first}}",
+            "{id:d}{first:d}",
+            "{id!x}",
+            "{id",
+            "{first}",
+        ]:
+            with self.subTest(username_format=username_format):
+                self.assertTrue(validate_username_format(username_format))
+
+        self.client.force_login(self.admin)
+        response = self.client.post(
+            reverse("provision_credentials"),
+            {"username_format": "{id:{first.x}}", "password_length": "10"},
+            follow=True,
+        )
+        self.assertContains(response, "may only use {id}, {first}, {last} and {batch}")
+        self.assertFalse(BackgroundJob.objects.exists())
+
+    def test_good_format_provisions_working_accounts(self):
+        self.assertEqual(validate_username_format("{batch}.{first:.3}{id:03}"), "")
+        sheet = provision_credentials(
+            StudentRegistration.objects.all(), "{batch}.{first:.3}{id:03}", 12
+        )
+        self.assertEqual(len(sheet), 2)
+        for registration_id, _name, _email, user_id, username, password in sheet:
+            user = User.objects.get(id=user_id)
+            self.assertEqual(username, f"b1.{user.first_name[:3].lower()}{registration_id:03}")
+            self.assertEqual(len(password), 12)
+            self.assertTrue(user.check_password(password))
+            self.assertTrue(self.client.login(username=username, password=password))
+        self.assertFalse(StudentRegistration.objects.filter(account_created=False).exists())
+
+
+class RegistrationStatsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="secret", is_staff=True)
+
+    def stat_rows(self):
+        return set(
+            RegistrationStat.objects.filter(Q(pending__gt=0) | Q(created__gt=0)).values_list(
+                "dimension", "bucket", "pending", "created"
+            )
+        )
+
+    def assertCountersMatchRebuild(self):
+        incremental = self.stat_rows()
+        rebuild_registration_stats()
+        self.assertEqual(incremental, self.stat_rows())
+
+    def test_counters_follow_every_write_path(self):
+        registration = StudentRegistration.objects.create(
+            full_name="Asha Rao",
+            email="asha@example.com",
+            contact_number="9876543210",
+            batch_no="B1",
+            gender="Female",
+        )
+        import_registrations(
+            [
+                ["full_name", "Email", "Contact Number", "Batch No"],
+                ["Ravi Kumar", "ravi@example.com", "9876500000", "B2"],
+                ["Meena Iyer", "meena@example.com", "9876511111", "B1"],
+            ]
+        )
+        self.assertCountersMatchRebuild()
+
+        self.client.force_login(self.admin)
+        self.client.post(
+            reverse("create_credentials_for_registration", args=[registration.id]),
+            {"username": "asha", "password": "secret-password"},
+        )
+        provision_credentials(StudentRegistration.objects.filter(batch_no="B2"), "{first}{id}", 10)
+        self.assertIn(("batch", "B1", 1, 1), self.stat_rows())
+        self.assertIn(("batch", "B2", 0, 1), self.stat_rows())
+        self.assertCountersMatchRebuild()
+
+        registration.batch_no = "B3"
+        registration.save()
+        StudentRegistration.objects.filter(batch_no="B1").delete()
+        self.assertCountersMatchRebuild()
+        self.assertNotIn("B1", {bucket for dimension, bucket, _, _ in self.stat_rows()})
+
+    def test_stats_page_reads_only_counters(self):
+        for index in range(30):
+            StudentRegistration.objects.create(
+                full_name=f"Student {index}",
+                email=f"s{index}@example.com",
+                contact_number="9876543210",
+                batch_no=f"B{index % 5}",
+            )
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("registration_stats"))
+        self.assertContains(response, "Total 30")
+        self.assertFalse(
+            [query["sql"] for query in queries if "LMS_studentregistration" in query["sql"]]
+        )
+
+
+class DuplicateDetectionTests(TestCase):
+    def register(self, **values):
+        values = {"full_name": "Applicant", "contact_number": "", **values}
+        return StudentRegistration.objects.create(**values)
+
+    def stored_keys(self, registration):
+        return set(
+            RegistrationIdentity.objects.filter(registration=registration).values_list("kind", "value")
+        )
+
+    def test_trigger_keys_match_python_keys(self):
+        values = {
+            "email": " Ãsha.Rao@Example.COM",
+            "contact_number": "+91 (98765) 43-210",
+            "whatsapp_number": "9876543210",
+            "unique_id_number": "ab-12 34/56",
+        }
+        registration = self.register(**values)
+        self.assertEqual(self.stored_keys(registration), identity_keys(values))
+        self.assertEqual(
+            identity_keys(values),
+            {("email", "Ãsha.rao@example.com"), ("phone", "9876543210"), ("id_number", "AB123456")},
+        )
+
+        registration.email = "new@example.com"
+        registration.save()
+        self.assertIn(("email", "new@example.com"), self.stored_keys(registration))
+        registration.delete()
+        self.assertFalse(RegistrationIdentity.objects.exists())
+
+    def test_submission_is_flagged_against_earliest_match(self):
+        first = self.register(email="asha@example.com", contact_number="9876543210")
+        self.register(email="other@example.com", contact_number="+91 98765 43210")
+
+        submission = sample_submission()
+        submission["email"] = "ASHA@example.com"
+        response = self.client.post(reverse("student_register"), submission)
+        self.assertRedirects(response, reverse("home"))
+        self.assertEqual(StudentRegistration.objects.latest("id").duplicate_of_id, first.id)
+
+    def test_clusters_follow_chains_of_shared_keys(self):
+        a = self.register(email="a@example.com", contact_number="1111111")
+        b = self.register(email="A@example.com", contact_number="2222222")
+        c = self.register(email="c@example.com", whatsapp_number="222-2222")
+        self.register(email="d@example.com", contact_number="3333333")
+        e = self.register(email="e@example.com", unique_id_number="X-1234")
+        f = self.register(email="f@example.com", unique_id_number="x1234")
+
+        clusters = duplicate_clusters()
+        self.assertEqual(
+            [[registration.id for registration in cluster["registrations"]] for cluster in clusters],
+            [[a.id, b.id, c.id], [e.id, f.id]],
+        )
+        self.assertEqual(clusters[0]["keys"], [("Email", "a@example.com"), ("Phone", "2222222")])
+
+
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_benchmark_data(30, chunk_size=7)
+        cls.admin = User.objects.get(is_staff=True)
+        cls.student = User.objects.filter(profile__isnull=False).first()
+
+    def export(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("export_registrations_csv"), {"columns": "all"})
+        return b"".join(response.streaming_content)
+
+    async def test_async_views_match_sync_views(self):
+        sync_export = await sync_to_async(self.export)()
+        with routed_views(async_views=True):
+            await self.async_client.aforce_login(self.admin)
+            response = await self.async_client.get(reverse("export_registrations_csv"))
+            self.assertTrue(response.is_async)
+            response = await self.async_client.get(
+                reverse("export_registrations_csv"), {"columns": "all"}
+            )
+            self.assertEqual(b"".join([chunk async for chunk in response]), sync_export)
+
+            response = await self.async_client.get(reverse("admin_dashboard"), {"q": "Student 2"})
+            self.assertContains(response, "Student 29")
+            self.assertEqual(response.context["registration_totals"]["total"], 30)
+            registration = await StudentRegistration.objects.afirst()
+            response = await self.async_client.get(
+                reverse("registration_detail", args=[registration.id])
+            )
+            self.assertContains(response, registration.full_name)
+            self.assertNotIn('"0 queries"', response["Server-Timing"])
+
+            await self.async_client.aforce_login(self.student)
+            response = await self.async_client.get(reverse("admin_dashboard"))
+            self.assertEqual(response.status_code, 302)
+            response = await self.async_client.get(reverse("student_dashboard"))
+            self.assertContains(response, "Cloud Computing")
+
+    DASHBOARD_FILTERS = [
+        {"page_size": 25},
+        {"status": "pending", "page_size": 25},
+        {"batch": "b2"},
+        {"q": "Student 2", "page_size": 25},
+        {"include_archived": "1", "page_size": 25},
+        {"include_archived": "1", "q": "Student 1"},
+    ]
+    EXPORT_FILTERS = [
+        {"columns": "all"},
+        {"format": "jsonl", "status": "created"},
+        {"include_archived": "1", "batch": "b1"},
+        {"format": "jsonl", "include_archived": "1", "q": "Student 1"},
+    ]
+
+    def archive_batch(self):
+        archive_registrations(StudentRegistration.objects.filter(batch_no="B1"))
+
+    def dashboard_page(self, response):
+        page, archived = response.context["registrations_page"], response.context["archived_page"]
+        return (
+            [registration.id for registration in page["items"]],
+            archived and [registration.id for registration in archived["items"]],
+            page["next_cursor"],
+        )
+
+    def sync_dashboards_and_exports(self):
+        self.client.force_login(self.admin)
+        dashboards = []
+        for params in self.DASHBOARD_FILTERS:
+            pages, cursor = [], ""
+            while cursor is not None:
+                response = self.client.get(reverse("admin_dashboard"), {**params, "cursor": cursor})
+                *page, cursor = self.dashboard_page(response)
+                pages.append(page)
+                cursor = cursor or None
+            dashboards.append(pages)
+        exports = [
+            b"".join(self.client.get(reverse("export_registrations_csv"), params))
+            for params in self.EXPORT_FILTERS
+        ]
+        return dashboards, exports
+
+    async def test_async_dashboard_and_exports_match_sync_ones(self):
+        await sync_to_async(self.archive_batch)()
+        sync_dashboards, sync_exports = await sync_to_async(self.sync_dashboards_and_exports)()
+        self.assertGreater(len(sync_dashboards[0]), 1)
+        self.assertTrue(sync_dashboards[4][0][1])
+
+        with routed_views(async_views=True):
+            await self.async_client.aforce_login(self.admin)
+            for params, sync_pages in zip(self.DASHBOARD_FILTERS, sync_dashboards):
+                pages, cursor = [], ""
+                while cursor is not None:
+                    response = await self.async_client.get(
+                        reverse("admin_dashboard"), {**params, "cursor": cursor}
+                    )
+                    *page, cursor = self.dashboard_page(response)
+                    pages.append(page)
+                    cursor = cursor or None
+                self.assertEqual(pages, sync_pages, params)
+
+            for params, sync_export in zip(self.EXPORT_FILTERS, sync_exports):
+                response = await self.async_client.get(reverse("export_registrations_csv"), params)
+                self.assertTrue(response.is_async)
+                self.assertEqual(b"".join([chunk async for chunk in response]), sync_export, params)
+
+            response = await self.async_client.get(
+                reverse("export_registrations_csv"), {"format": "xml"}
+            )
+            self.assertRedirects(response, reverse("admin_dashboard"), fetch_redirect_response=False)
+
+    async def test_async_detail_reads_active_then_archived_registrations(self):
+        await sync_to_async(self.archive_batch)()
+        active = await StudentRegistration.objects.order_by("id").afirst()
+        archived = await ArchivedRegistration.objects.order_by("id").afirst()
+        with routed_views(async_views=True):
+            await self.async_client.aforce_login(self.admin)
+            response = await self.async_client.get(
+                reverse("registration_detail", args=[active.id])
+            )
+            self.assertFalse(response.context["archived"])
+            self.assertContains(response, active.full_name)
+
+            response = await self.async_client.get(
+                reverse("registration_detail", args=[archived.id])
+            )
+            self.assertTrue(response.context["archived"])
+            self.assertContains(response, archived.full_name)
+            self.assertEqual(
+                response.context["registration"].date_of_birth, date(2001, 4, 17)
+            )
+
+            response = await self.async_client.get(reverse("registration_detail", args=[10**6]))
+            self.assertEqual(response.status_code, 404)
+
+
+class RegistrationOutboxTests(TestCase):
+    def setUp(self):
+        outbox = tempfile.TemporaryDirectory()
+        self.addCleanup(outbox.cleanup)
+        settings_override = override_settings(
+            LMS_REGISTRATION_INGEST="queue",
+            LMS_REGISTRATION_OUTBOX=os.path.join(outbox.name, "outbox.sqlite3"),
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def submit(self, **fields):
+        submission = sample_submission()
+        submission.update(fields)
+        response = self.client.post(reverse("student_register"), submission)
+        self.assertRedirects(response, reverse("home"))
+
+    def queued_submit_times(self):
+        rows = outbox_connection().execute(
+            "SELECT submitted_at FROM registration_outbox ORDER BY id"
+        )
+        return [parse_datetime(submitted_at) for (submitted_at,) in rows]
+
+    def test_queued_submissions_drain_with_their_submit_time(self):
+        for index in range(3):
+            self.submit(full_name=f"Student {index}", email=f"s{index}@example.com")
+        self.assertFalse(StudentRegistration.objects.exists())
+        self.assertEqual(pending_outbox_count(), 3)
+        submit_times = self.queued_submit_times()
+
+        self.assertEqual(drain_outbox(batch_size=2), 2)
+        self.assertEqual(pending_outbox_count(), 1)
+        self.assertEqual(drain_outbox(batch_size=2), 1)
+        self.assertEqual(drain_outbox(batch_size=2), 0)
+
+        registrations = StudentRegistration.objects.order_by("id")
+        self.assertEqual(
+            [(registration.full_name, registration.submitted_at) for registration in registrations],
+            [(f"Student {index}", submit_times[index]) for index in range(3)],
+        )
+        self.assertEqual(registrations[0].date_of_birth, date(2001, 4, 17))
+        self.assertEqual(registrations[0].gender, SELECT_OPTIONS["gender"][0])
+
+    def test_drain_flags_duplicates_and_counts_registrations(self):
+        saved = StudentRegistration.objects.create(
+            full_name="Saved", email="asha@example.com", contact_number="9876511111"
+        )
+        for email, contact_number in [
+            ("ASHA@example.com", "9876522222"),
+            ("ravi@example.com", "9876533333"),
+            ("ravi.k@example.com", "+91 98765-33333"),
+            ("other@example.com", "9876544444"),
+            ("RAVI@example.com", "9876555555"),
+        ]:
+            # The sample's placeholder answers would match every submission.
+            self.submit(
+                email=email, contact_number=contact_number, whatsapp_number="", unique_id_number=""
+            )
+        drain_outbox(batch_size=3)
+        drain_outbox(batch_size=3)
+
+        asha, ravi, ravi_k, other, ravi_again = StudentRegistration.objects.exclude(
+            id=saved.id
+        ).order_by("id")
+        self.assertEqual(asha.duplicate_of_id, saved.id)
+        self.assertIsNone(ravi.duplicate_of_id)
+        # Queued alongside ravi, in the same drained batch.
+        self.assertEqual(ravi_k.duplicate_of_id, ravi.id)
+        self.assertIsNone(other.duplicate_of_id)
+        # Drained in a later batch than the registration it repeats.
+        self.assertEqual(ravi_again.duplicate_of_id, ravi.id)
+
+        self.assertEqual(registration_stat_totals()["total"], 6)
+        counters = set(RegistrationStat.objects.values_list("dimension", "bucket", "pending"))
+        rebuild_registration_stats()
+        self.assertEqual(
+            counters, set(RegistrationStat.objects.values_list("dimension", "bucket", "pending"))
+        )
+
+
+class BackgroundJobTests(TransactionTestCase):
+    def setUp(self):
+        artifacts = tempfile.TemporaryDirectory()
+        self.addCleanup(artifacts.cleanup)
+        settings_override = override_settings(LMS_JOB_ARTIFACTS=artifacts.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        seed_benchmark_data(12, chunk_size=5)
+        self.admin = User.objects.get(is_staff=True)
+        self.client.force_login(self.admin)
+
+    def test_worker_runs_queued_export(self):
+        params = {"status": "pending", "columns": "all"}
+        expected = b"".join(
+            self.client.get(reverse("export_registrations_csv"), params).streaming_content
+        )
+
+        with self.settings(LMS_BACKGROUND_JOBS="worker"):
+            response = self.client.post(reverse("export_registrations_background"), params)
+        job = BackgroundJob.objects.get()
+        self.assertRedirects(response, reverse("background_job", args=[job.id]))
+        progress = self.client.get(reverse("background_job_progress", args=[job.id])).json()
+        self.assertEqual((progress["status"], progress["finished"]), ("queued", False))
+
+        call_command("run_jobs", once=True, workers=2, stdout=io.StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.progress, job.total), ("succeeded", 9, 9))
+        response = self.client.get(reverse("background_job_download", args=[job.id]))
+        self.assertEqual(b"".join(response.streaming_content), expected)
+
+        other_admin = User.objects.create_user("other", password="x", is_staff=True)
+        self.client.force_login(other_admin)
+        response = self.client.get(reverse("background_job", args=[job.id]))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(LMS_BACKGROUND_JOBS="inline")
+    def test_inline_provisioning_sheet_downloads_once(self):
+        response = self.client.post(
+            reverse("provision_credentials") + "?status=pending&batch=B1",
+            {"username_format": "{first}{id}", "password_length": "12"},
+        )
+        job = BackgroundJob.objects.get()
+        self.assertRedirects(response, reverse("background_job", args=[job.id]))
+        self.assertEqual(job.status, "succeeded")
+        self.assertEqual(os.stat(job_artifact_path(job)).st_mode & 0o777, 0o600)
+
+        response = self.client.get(reverse("background_job_download", args=[job.id]))
+        rows = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(rows), 1 + StudentRegistration.objects.filter(batch_no="B1").count())
+        self.assertFalse(
+            StudentRegistration.objects.filter(batch_no="B1", account_created=False).exists()
+        )
+        response = self.client.get(reverse("background_job_download", args=[job.id]))
+        self.assertEqual(response.status_code, 404)
+
+
+    def test_check_warns_about_inline_jobs_without_debug(self):
+        for jobs, debug, warned in [
+            ("inline", False, True),
+            ("inline", True, False),
+            ("worker", False, False),
+        ]:
+            with self.subTest(jobs=jobs, debug=debug):
+                with self.settings(LMS_BACKGROUND_JOBS=jobs, DEBUG=debug):
+                    ids = [message.id for message in check_background_jobs(None)]
+                self.assertEqual(ids, ["LMS.W001"] if warned else [])
+
+
+class CsvExportStreamTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user("admin", password="secret", is_staff=True)
+        student = User.objects.create_user("quoted.student")
+        for index, full_name in enumerate(
+            ['Asha "AJ" Rao', "Rao, Vikram", "Line\nBreak", "=HYPERLINK(1)", "Zoë Ñúñez"]
+        ):
+            StudentRegistration.objects.create(
+                full_name=full_name,
+                email=f"student{index}@example.com",
+                contact_number=f"98765{index:05d}",
+                batch_no="B1",
+                referral_source="Friend, colleague",
+                graduation_status="Completed" if index % 2 else "",
+                account_created=index == 0,
+                created_user=student if index == 0 else None,
+            )
+
+    def test_matches_the_original_export_byte_for_byte(self):
+        # The export as it was written row by row before streaming. Cells are
+        # written verbatim, e.g. "=HYPERLINK(1)", as they always were.
+        expected = io.StringIO()
+        writer = csv.writer(expected)
+        writer.writerow(
+            [
+                "registration_id",
+                "submitted_at",
+                *SUMMARY_EXPORT_FIELDS,
+                "account_created",
+                "created_user_id",
+                "created_username",
+            ]
+        )
+        for reg in StudentRegistration.objects.order_by("-submitted_at", "-id"):
+            writer.writerow(
+                [
+                    reg.id,
+                    reg.submitted_at.isoformat(),
+                    *[getattr(reg, field_name) for field_name in SUMMARY_EXPORT_FIELDS],
+                    "Yes" if reg.account_created else "No",
+                    reg.created_user.id if reg.created_user else "",
+                    reg.created_user.username if reg.created_user else "",
+                ]
+            )
+
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("export_registrations_csv"))
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(b"".join(response.streaming_content).decode(), expected.getvalue())
+
+    def test_duplicate_of_id_is_added_on_request(self):
+        first, second = StudentRegistration.objects.order_by("id")[:2]
+        second.duplicate_of = first
+        second.save()
+        self.client.force_login(self.admin)
+        for columns, width in [("duplicate_of_id", 16), ("all, duplicate_of_id", None)]:
+            with self.subTest(columns=columns):
+                response = self.client.get(
+                    reverse("export_registrations_csv"), {"columns": columns}
+                )
+                content = b"".join(response.streaming_content).decode()
+                header, *rows = csv.reader(io.StringIO(content))
+                self.assertEqual(header[-1], "duplicate_of_id")
+                if width:
+                    self.assertEqual(len(header), width)
+                else:
+                    self.assertIn("college_address", header)
+                flagged = {row[0]: row[-1] for row in rows}
+                self.assertEqual(flagged[str(second.id)], str(first.id))
+                self.assertEqual(flagged[str(first.id)], "")
+
+    def test_streams_in_chunks_without_reading_ahead(self):
+        registrations = StudentRegistration.objects.order_by("id")
+        with CaptureQueriesContext(connection) as queries:
+            chunks = stream_registrations_csv(registrations, SUMMARY_EXPORT_FIELDS, chunk_size=2)
+        self.assertEqual(len(queries), 0)
+
+        first = next(chunks)
+        self.assertEqual(len(list(csv.reader(io.StringIO(first.decode())))), 3)
+        rest = list(chunks)
+        # 5 rows in chunks of 2, then the final (possibly empty) flush.
+        self.assertEqual(len(rest), 2)
+        content = (first + b"".join(rest)).decode()
+        self.assertEqual(len(list(csv.reader(io.StringIO(content)))), 6)
+
+    def test_async_stream_yields_the_same_chunks(self):
+        registrations = StudentRegistration.objects.order_by("id")
+        sync_chunks = list(
+            stream_registrations_csv(registrations, SUMMARY_EXPORT_FIELDS, chunk_size=2)
+        )
+
+        async def collect():
+            chunks = stream_registrations_csv(registrations, SUMMARY_EXPORT_FIELDS, chunk_size=2)
+            return [chunk async for chunk in astream_export(chunks)]
+
+        self.assertEqual(async_to_sync(collect)(), sync_chunks)
+
+
+class ProjectionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_benchmark_data(6, chunk_size=5)
+        cls.admin = User.objects.get(is_staff=True)
+        cls.registration = StudentRegistration.objects.order_by("id").first()
+
+    def registration_columns(self, url, params=None):
+        """Columns of LMS_studentregistration selected while serving ``url``."""
+        self.client.force_login(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        selects = [
+            query["sql"].split(" FROM ")[0]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and ' FROM "LMS_studentregistration"' in query["sql"]
+        ]
+        self.assertEqual(len(selects), 1)
+        return re.findall(r'"LMS_studentregistration"\."(\w+)"', selects[0])
+
+    def test_dashboard_reads_only_the_table_columns(self):
+        self.assertEqual(
+            self.registration_columns(reverse("admin_dashboard")),
+            [
+                "id",
+                "full_name",
+                "email",
+                "contact_number",
+                "submitted_at",
+                "account_created",
+                "created_user_id",
+                "duplicate_of_id",
+            ],
+        )
+        response = self.client.get(reverse("admin_dashboard"))
+        self.assertNotIn("college_address", response.context["registrations"][0].__dict__)
+
+    def test_detail_reads_the_displayed_answers(self):
+        columns = self.registration_columns(
+            reverse("registration_detail", args=[self.registration.id])
+        )
+        self.assertIn("college_address", columns)
+        self.assertIn("duplicate_of_id", columns)
+
+    def test_summary_export_reads_its_columns(self):
+        columns = self.registration_columns(reverse("export_registrations_csv"))
+        self.assertEqual(
+            columns,
+            [
+                "id",
+                "submitted_at",
+                *SUMMARY_EXPORT_FIELDS,
+                "account_created",
+                "created_user_id",
+            ],
+        )
+
+
+class ExportFormatTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_benchmark_data(12, chunk_size=5)
+        StudentRegistration.objects.filter(id__lte=3).update(gender="", has_smartphone="No")
+        cls.admin = User.objects.get(is_staff=True)
+
+    def export(self, export_format):
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("export_registrations_csv"), {"format": export_format, "batch": "B1"}
+        )
+        self.assertEqual(response.status_code, 200)
+        return response, b"".join(response.streaming_content)
+
+    def test_jsonl_has_every_field_typed(self):
+        response, content = self.export("jsonl")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        records = [json.loads(line) for line in content.decode().splitlines()]
+        self.assertEqual(len(records), StudentRegistration.objects.filter(batch_no="B1").count())
+        first = StudentRegistration.objects.filter(batch_no="B1").order_by("id").first()
+        record = next(record for record in records if record["registration_id"] == first.id)
+        self.assertEqual(record["date_of_birth"], first.date_of_birth.isoformat())
+        self.assertIs(record["has_smartphone"], first.has_smartphone == "Yes")
+        self.assertEqual(record["gender"], first.gender or None)
+        self.assertIn("residential_address", record)
+
+    @skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet_columns_are_typed(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        _response, content = self.export("parquet")
+        table = pq.read_table(io.BytesIO(content))
+        self.assertEqual(table.num_rows, StudentRegistration.objects.filter(batch_no="B1").count())
+        self.assertEqual(table.schema.field("date_of_birth").type, pa.date32())
+        self.assertEqual(table.schema.field("has_smartphone").type, pa.bool_())
+        self.assertEqual(
+            table.schema.field("gender").type, pa.dictionary(pa.int8(), pa.string())
+        )
+        by_id = {row["registration_id"]: row for row in table.to_pylist()}
+        first = StudentRegistration.objects.filter(batch_no="B1").order_by("id").first()
+        self.assertEqual(by_id[first.id]["gender"], first.gender or None)
+        self.assertEqual(by_id[first.id]["date_of_birth"], first.date_of_birth)
+
+    def test_unknown_format_is_refused(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("export_registrations_csv"), {"format": "xml"})
+        self.assertRedirects(response, reverse("admin_dashboard"))
+
+
+class RegistrationBindingTests(TestCase):
+    def bind(self, **fields):
+        return bind_registration(
+            {"full_name": "Asha Rao", "email": "asha@example.com", "contact_number": "98765"}
+            | fields
+        )
+
+    def test_sample_submission_binds_trimmed_values(self):
+        values, errors = bind_registration(sample_submission())
+        self.assertEqual(errors, [])
+        self.assertEqual(set(values), {field.name for field in REGISTRATION_BINDER})
+        self.assertEqual(values["email"], "applicant@example.com")
+        self.assertEqual(values["date_of_birth"], date(2001, 4, 17))
+        self.assertEqual(values["contact_number"], "+91 98765 43210")
+
+    def test_required_fields(self):
+        values, errors = bind_registration({"full_name": "  ", "batch_no": "B1"})
+        self.assertEqual(
+            errors,
+            [
+                "Full Name (As per your certificate) is required.",
+                "Email ID is required.",
+                "Contact Number is required.",
+            ],
+        )
+        self.assertEqual((values["batch_no"], values["gender"]), ("B1", ""))
+        self.assertIsNone(values["date_of_birth"])
+
+    def test_dates(self):
+        values, errors = self.bind(date_of_birth=" 2001-04-17 ")
+        self.assertEqual((values["date_of_birth"], errors), (date(2001, 4, 17), []))
+        for raw in ["17/04/2001", "2001-02-30", "yesterday"]:
+            with self.subTest(raw=raw):
+                values, errors = self.bind(date_of_birth=raw)
+                self.assertEqual(errors, ["Date Of Birth must be a date in YYYY-MM-DD format."])
+                self.assertIsNone(values["date_of_birth"])
+
+    def test_yes_no_and_select_options_are_canonicalised(self):
+        values, errors = self.bind(
+            has_smartphone=" yes ",
+            single_parent="NO",
+            gender="prefer NOT to say",
+            application_status="first time",
+        )
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            [values[name] for name in ["has_smartphone", "single_parent", "gender"]],
+            ["Yes", "No", "Prefer not to say"],
+        )
+        self.assertEqual(values["application_status"], "FIRST TIME")
+
+        values, errors = self.bind(has_smartphone="Maybe", social_category="General")
+        self.assertEqual(
+            errors,
+            [
+                "Do you have a Smartphone? must be one of: Yes, No.",
+                "Category (Gen/OBC/SC/ST) must be one of: Gen, OBC, SC, ST, Other.",
+            ],
+        )
+        self.assertIsNone(values["has_smartphone"])
+
+    def test_email_and_length_limits(self):
+        _values, errors = self.bind(email="not-an-email", batch_no="B" * 101)
+        self.assertEqual(
+            errors,
+            ["Batch No must be at most 100 characters.", "Email ID is not a valid email address."],
+        )
+
+    def test_rejected_submission_keeps_the_answers(self):
+        submission = sample_submission()
+        submission["full_name"] = "Asha Rao"
+        submission["email"] = "not-an-email"
+        submission["gender"] = "Female"
+        submission["college_address"] = "12 Lake Road"
+        response = self.client.post(reverse("student_register"), submission)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Email ID is not a valid email address.")
+        self.assertContains(response, 'value="Asha Rao"')
+        self.assertContains(response, 'value="not-an-email"')
+        self.assertContains(response, '<option value="Female" selected>')
+        self.assertContains(response, ">12 Lake Road</textarea>")
+        self.assertFalse(StudentRegistration.objects.exists())
+        # The shared blank form is not touched by one applicant's answers.
+        self.assertNotContains(self.client.get(reverse("student_register")), "Asha Rao")
+
+
+class RegistrationFormCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def render_form(self, sections, schema_version):
+        return render_to_string(
+            "student_register.html",
+            {"sections": sections, "schema_version": schema_version},
+            request=RequestFactory().get(reverse("student_register")),
+        )
+
+    def test_cached_fragment_renders_the_schema(self):
+        response = self.client.get(reverse("student_register"))
+        fields = [field for _title, fields in REGISTRATION_FORM_SCHEMA for field in fields]
+        for field in fields:
+            self.assertContains(response, f'name="{field["name"]}"', count=1)
+        for _title, options in SELECT_OPTIONS.items():
+            for option in options:
+                self.assertContains(response, f'<option value="{option}">')
+
+        fragment = cache.get(
+            make_template_fragment_key("registration_form", [REGISTRATION_SCHEMA_VERSION])
+        )
+        self.assertIsNotNone(fragment)
+        self.assertIn(fragment, response.content.decode())
+        self.assertContains(self.client.get(reverse("student_register")), fragment, html=False)
+
+    def test_fragment_follows_the_schema_version(self):
+        first_section_only = REGISTRATION_FORM_SCHEMA[:1]
+        self.render_form(REGISTRATION_FORM_SCHEMA, REGISTRATION_SCHEMA_VERSION)
+        # Same version, so the cached markup is served whatever the sections say.
+        self.assertIn(
+            'name="full_name"', self.render_form(first_section_only, REGISTRATION_SCHEMA_VERSION)
+        )
+        html = self.render_form(first_section_only, "next-version")
+        self.assertIn('name="batch_no"', html)
+        self.assertNotIn('name="full_name"', html)
+
+
+class OptionFieldTests(TestCase):
+    def test_options_are_stored_as_codes_and_read_as_text(self):
+        registration = StudentRegistration.objects.create(
+            full_name="Coded",
+            email="coded@example.com",
+            contact_number="9000000001",
+            gender="Prefer not to say",
+            has_smartphone="No",
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT gender, has_smartphone, social_category FROM LMS_studentregistration "
+                "WHERE id = %s",
+                [registration.id],
+            )
+            self.assertEqual(cursor.fetchone(), (4, 2, 0))
+
+        registration.refresh_from_db()
+        self.assertEqual(
+            (registration.gender, registration.has_smartphone, registration.social_category),
+            ("Prefer not to say", "No", ""),
+        )
+        self.assertEqual(
+            list(
+                StudentRegistration.objects.filter(gender__in=["Prefer not to say", "Male"])
+                .exclude(social_category="Gen")
+                .values_list("has_smartphone", flat=True)
+            ),
+            ["No"],
+        )
+        with self.assertRaises(ValueError):
+            StudentRegistration.objects.filter(gender="Unknown").exists()
+
+
+class CachedUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user("cached.student", password="Secret123!")
+        self.admin = User.objects.create_user("cached.admin", password="x", is_staff=True)
+
+    def test_logged_in_requests_skip_user_query_until_user_saved(self):
+        student_client = Client()
+        response = student_client.post(
+            reverse("student_login"), {"username": "cached.student", "password": "Secret123!"}
+        )
+        self.assertRedirects(response, reverse("student_dashboard"))
+        student_client.get(reverse("student_dashboard"))
+        with CaptureQueriesContext(connection) as queries:
+            student_client.get(reverse("student_dashboard"))
+        self.assertFalse([query for query in queries if '"auth_user"' in query["sql"]])
+
+        self.client.force_login(self.admin)
+        self.client.post(
+            reverse("update_student", args=[self.student.id]),
+            {
+                "email": "",
+                "first_name": "New",
+                "last_name": "",
+                "password": "Changed123!",
+                "progress_percent": "0",
+            },
+        )
+        # The cached copy still held the old password hash; it must not keep
+        # the old session alive.
+        response = student_client.get(reverse("student_dashboard"))
+        self.assertEqual(response.status_code, 302)
+
+
+class StudentProfileCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user("cache.admin", password="x", is_staff=True)
+
+    def student_dashboard(self, student):
+        client = Client()
+        client.force_login(student)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse("student_dashboard"))
+        profile_queries = [query for query in queries if "LMS_studentprofile" in query["sql"]]
+        return response, profile_queries
+
+    def test_update_student_invalidates_the_cached_profile(self):
+        student = User.objects.create_user("cache.student", password="Secret123!")
+        StudentProfile.objects.create(user=student, course_name="Cloud Computing")
+        response, profile_queries = self.student_dashboard(student)
+        self.assertContains(response, "Cloud Computing")
+        self.assertEqual(len(profile_queries), 1)
+        response, profile_queries = self.student_dashboard(student)
+        self.assertEqual(profile_queries, [])
+
+        self.client.force_login(self.admin)
+        self.client.post(
+            reverse("update_student", args=[student.id]),
+            {
+                "email": "",
+                "first_name": "",
+                "last_name": "",
+                "password": "",
+                "course_name": "Data Engineering",
+                "course_duration": "6 months",
+                "progress_percent": "40",
+                "notes": "",
+            },
+        )
+        response, profile_queries = self.student_dashboard(student)
+        self.assertContains(response, "Data Engineering")
+        self.assertContains(response, "40%")
+        self.assertEqual(len(profile_queries), 1)
+
+        StudentProfile.objects.filter(user=student).get().delete()
+        response, _ = self.student_dashboard(student)
+        self.assertNotContains(response, "Data Engineering")
+
+    def test_credentials_for_a_registration_serve_its_profile(self):
+        registration = StudentRegistration.objects.create(
+            full_name="Asha Rao", email="asha@example.com", contact_number="9876543210"
+        )
+        self.client.force_login(self.admin)
+        self.client.post(
+            reverse("create_credentials_for_registration", args=[registration.id]),
+            {"username": "asha", "password": "Secret123!"},
+        )
+        student = User.objects.get(username="asha")
+        response, _ = self.student_dashboard(student)
+        self.assertContains(response, f"Registration ID: {registration.id}")
+
+        profile = student.profile
+        profile.notes = "Moved to the evening batch"
+        profile.save()
+        response, _ = self.student_dashboard(student)
+        self.assertContains(response, "Moved to the evening batch")
+
+
+class CountingPasswordHasher(PBKDF2PasswordHasher):
+    algorithm = "counting_pbkdf2"
+    iterations = 1
+    hashes = 0
+
+    def encode(self, password, salt, iterations=None):
+        CountingPasswordHasher.hashes += 1
+        return super().encode(password, salt, iterations)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["LMS.tests.CountingPasswordHasher"],
+    LMS_LOGIN_THROTTLE_IP=(10, 3600),
+    LMS_LOGIN_THROTTLE_USERNAME=(3, 3600),
+)
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = User.objects.create_user("throttled", password="Secret123!")
+        CountingPasswordHasher.hashes = 0
+
+    def attempt(self, username, password="wrong", ip="203.0.113.7"):
+        return self.client.post(
+            reverse("student_login"),
+            {"username": username, "password": password},
+            REMOTE_ADDR=ip,
+        )
+
+    def test_flood_hashes_at_most_bucket_size(self):
+        responses = [self.attempt(f"guess{index}") for index in range(200)]
+        self.assertEqual(CountingPasswordHasher.hashes, 10)
+        self.assertEqual([response.status_code for response in responses].count(429), 190)
+        self.assertEqual(int(responses[-1]["Retry-After"]), 360)
+
+        # One username from many addresses is capped by its own bucket.
+        for index in range(20):
+            self.attempt("throttled", ip=f"198.51.100.{index}")
+        self.assertEqual(CountingPasswordHasher.hashes, 13)
+        response = self.attempt("THROTTLED", password="Secret123!", ip="192.0.2.1")
+        self.assertEqual(response.status_code, 429)
+
+    def test_success_refills_username_bucket(self):
+        for _ in range(2):
+            self.attempt("throttled")
+        response = self.attempt("throttled", password="Secret123!")
+        self.assertRedirects(response, reverse("student_dashboard"))
+        self.client.logout()
+        for _ in range(3):
+            self.assertEqual(self.attempt("throttled").status_code, 200)
+
+
+class DeltaExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_benchmark_data(10, chunk_size=4)
+        cls.admin = User.objects.get(is_staff=True)
+
+    def pull(self, since, **params):
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("export_registration_changes"), {"since": since, **params}
+        )
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        return rows, int(response["X-Export-Watermark"]), response["X-Export-Has-More"] == "1"
+
+    def test_pulls_only_changes_after_watermark(self):
+        rows, watermark, has_more = self.pull(0, limit=6)
+        self.assertEqual((len(rows), has_more), (6, True))
+        rest, watermark, has_more = self.pull(watermark)
+        self.assertEqual((len(rest), has_more), (4, False))
+        self.assertEqual(
+            sorted(int(row["registration_id"]) for row in rows + rest),
+            list(StudentRegistration.objects.order_by("id").values_list("id", flat=True)),
+        )
+        self.assertEqual(self.pull(watermark), ([], watermark, False))
+
+        pending = StudentRegistration.objects.filter(account_created=False).first()
+        self.client.post(
+            reverse("create_credentials_for_registration", args=[pending.id]),
+            {"username": "delta.student", "password": "Secret123!"},
+        )
+        StudentRegistration.objects.filter(batch_no="B1").update(batch_timings="Evenings")
+        deleted = StudentRegistration.objects.exclude(id=pending.id).exclude(batch_no="B1").first()
+        deleted_id = deleted.id
+        deleted.delete()
+
+        rows, _watermark, _has_more = self.pull(watermark)
+        changed = {int(row["registration_id"]): row for row in rows}
+        self.assertEqual(
+            set(changed),
+            {pending.id, deleted_id}
+            | set(StudentRegistration.objects.filter(batch_no="B1").values_list("id", flat=True)),
+        )
+        self.assertEqual(changed[pending.id]["account_created"], "Yes")
+        self.assertEqual(changed[pending.id]["created_username"], "delta.student")
+        self.assertEqual((changed[deleted_id]["deleted"], changed[deleted_id]["email"]), ("Yes", ""))
+
+    def test_rejects_invalid_watermark(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse("export_registration_changes"), {"since": "x"})
+        self.assertEqual(response.status_code, 400)
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        seed_benchmark_data(12, chunk_size=5)
+        cls.admin = User.objects.get(is_staff=True)
+        cls.closed_ids = set(
+            StudentRegistration.objects.filter(batch_no__in=["B1", "B2"]).values_list(
+                "id", flat=True
+            )
+        )
+
+    def export(self, **params):
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("export_registrations_csv"), {"columns": "all", **params}
+        )
+        content = b"".join(response.streaming_content).decode()
+        return {row["registration_id"]: row for row in csv.DictReader(io.StringIO(content))}
+
+    def dashboard(self, **params):
+        self.client.force_login(self.admin)
+        return self.client.get(reverse("admin_dashboard"), params).context
+
+    def test_archived_rows_leave_active_queries_until_included(self):
+        call_command(
+            "archive_registrations", "--batch", "b1", "--batch", "B2", stdout=io.StringIO()
+        )
+        self.assertEqual(ArchivedRegistration.objects.count(), 2)
+        self.assertFalse(StudentRegistration.objects.filter(id__in=self.closed_ids).exists())
+
+        context = self.dashboard()
+        self.assertIsNone(context["archived_page"])
+        # The counters are historical and keep archived registrations.
+        self.assertEqual(context["registration_totals"]["total"], 12)
+        self.assertTrue(self.closed_ids.isdisjoint(reg.id for reg in context["registrations"]))
+
+        context = self.dashboard(include_archived="1")
+        self.assertEqual({reg.id for reg in context["archived_page"]["items"]}, self.closed_ids)
+        context = self.dashboard(include_archived="1", q="Student 1")
+        (found,) = context["archived_page"]["items"]
+        self.assertEqual(found.full_name, "Student 1")
+
+        response = self.client.get(reverse("registration_detail", args=[found.id]))
+        self.assertTrue(response.context["archived"])
+        self.assertEqual(response.context["registration"].date_of_birth.isoformat(), "2001-04-17")
+
+    def test_export_and_restore_round_trip(self):
+        before = self.export()
+        call_command(
+            "archive_registrations", "--batch", "B1", "--batch", "B2", stdout=io.StringIO()
+        )
+        closed = {str(registration_id) for registration_id in self.closed_ids}
+        self.assertEqual(set(self.export()), set(before) - closed)
+        self.assertEqual(self.export(include_archived="1"), before)
+
+        call_command(
+            "archive_registrations", "--restore", "--batch", "B1", "--batch", "B2",
+            stdout=io.StringIO(),
+        )
+        self.assertFalse(ArchivedRegistration.objects.exists())
+        self.assertEqual(self.export(), before)
+
+    def changes(self, since):
+        self.client.force_login(self.admin)
+        response = self.client.get(
+            reverse("export_registration_changes"), {"since": since, "columns": "all"}
+        )
+        content = b"".join(response.streaming_content).decode()
+        rows = {int(row["registration_id"]): row for row in csv.DictReader(io.StringIO(content))}
+        return rows, int(response["X-Export-Watermark"])
+
+    def stats(self):
+        return list(
+            RegistrationStat.objects.order_by("dimension", "bucket").values_list(
+                "dimension", "bucket", "pending", "created"
+            )
+        )
+
+    def test_archive_moves_reach_delta_export_as_archived_and_keep_stats(self):
+        before = self.export()
+        _rows, watermark = self.changes(0)
+        stats = self.stats()
+        call_command(
+            "archive_registrations", "--batch", "B1", "--batch", "B2", stdout=io.StringIO()
+        )
+        rows, watermark = self.changes(watermark)
+        self.assertEqual(set(rows), self.closed_ids)
+        for registration_id, row in rows.items():
+            self.assertEqual((row["deleted"], row["archived"]), ("No", "Yes"))
+            # The archived row carries the same values as the full export did.
+            exported = before[str(registration_id)]
+            self.assertEqual({column: row[column] for column in exported}, exported)
+        self.assertEqual(self.stats(), stats)
+        rebuild_registration_stats()
+        self.assertEqual(self.stats(), stats)
+
+        call_command(
+            "archive_registrations", "--restore", "--batch", "B1", stdout=io.StringIO()
+        )
+        rows, _watermark = self.changes(watermark)
+        (restored,) = rows.values()
+        self.assertEqual((restored["batch_no"], restored["archived"]), ("B1", "No"))
+        self.assertEqual(self.stats(), stats)
+        self.assertEqual(self.dashboard()["registration_totals"]["total"], 12)
+        self.assertEqual(len(self.dashboard(q="Student 1")["registrations"]), 3)
 
-# Create your tests here.
@@ -0,0 +1,82 @@
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.cache import cache
+
+
+# (attempts, seconds): a bucket holds up to ``attempts`` tokens and refills at
+# ``attempts / seconds`` tokens per second.
+LOGIN_THROTTLE_IP = (20, 60)
+LOGIN_THROTTLE_USERNAME = (5, 60)
+
+# Buckets live in the default cache; the lock makes each check atomic within a
+# process. With a cache shared between processes, concurrent checks elsewhere
+# can let a few extra attempts through.
+_bucket_lock = threading.Lock()
+
+
+def client_ip_bucket(request):
+    # REMOTE_ADDR is the proxy's address behind a reverse proxy; have it set
+    # the real client address instead of trusting X-Forwarded-For here.
+    client_ip = request.META.get("REMOTE_ADDR", "")
+    return (
+        f"lms:login-throttle:ip:{client_ip}",
+        getattr(settings, "LMS_LOGIN_THROTTLE_IP", LOGIN_THROTTLE_IP),
+    )
+
+
+def username_bucket(username):
+    return (
+        f"lms:login-throttle:user:{username.casefold()}",
+        getattr(settings, "LMS_LOGIN_THROTTLE_USERNAME", LOGIN_THROTTLE_USERNAME),
+    )
+
+
+def take_tokens(buckets, now=None):
+    """Take a token from every bucket, or from none if any is empty.
+
+    ``buckets`` holds ``(cache key, (attempts, seconds))`` pairs. Returns 0
+    when the attempt may go ahead, else the seconds until every bucket has a
+    token again. Each bucket is one cache entry holding
+    ``(tokens, updated_at)``, so a check costs one read and one write however
+    many attempts came before.
+    """
+    now = time.time() if now is None else now
+    keys = [key for key, _rate in buckets]
+    with _bucket_lock:
+        stored = cache.get_many(keys)
+        states = {}
+        retry_after = 0.0
+        for key, (attempts, seconds) in buckets:
+            tokens, updated_at = stored.get(key, (attempts, now))
+            tokens = min(attempts, tokens + (now - updated_at) * attempts / seconds)
+            if tokens < 1:
+                retry_after = max(retry_after, (1 - tokens) * seconds / attempts)
+            states[key] = tokens
+        if retry_after:
+            return math.ceil(retry_after)
+        cache.set_many(
+            {key: (states[key] - 1, now) for key in keys},
+            max(seconds for _key, (_attempts, seconds) in buckets),
+        )
+    return 0
+
+
+def throttled_authenticate(request, username, password):
+    """``authenticate`` unless the client or the username is over its limit.
+
+    Returns ``(user, retry_after)``. A refused attempt never reaches the
+    password hasher, so a flood costs one cache check per request instead of
+    a hash. A successful login refills the username's bucket.
+    """
+    user_bucket = username_bucket(username)
+    retry_after = take_tokens([client_ip_bucket(request), user_bucket])
+    if retry_after:
+        return None, retry_after
+    user = authenticate(request, username=username, password=password)
+    if user is not None:
+        cache.delete(user_bucket[0])
+    return user, 0
@@ -1,25 +1,74 @@
+from django.conf import settings
 from django.urls import path
 
 from . import views
 
+
+def read_view(name):
+    # Under ASGI (settings.ASYNC_VIEWS) the read-heavy views run as async views.
+    return getattr(views, f"{name}_async" if settings.ASYNC_VIEWS else name)
+
+
 urlpatterns = [
     path("", views.home, name="home"),
     path("student/register/", views.student_register_view, name="student_register"),
     path("student/login/", views.student_login_view, name="student_login"),
     path("admin/login/", views.admin_login_view, name="admin_login"),
     path("logout/", views.logout_view, name="logout"),
-    path("student/dashboard/", views.student_dashboard, name="student_dashboard"),
-    path("admin/dashboard/", views.admin_dashboard, name="admin_dashboard"),
+    path("student/dashboard/", read_view("student_dashboard"), name="student_dashboard"),
+    path("admin/dashboard/", read_view("admin_dashboard"), name="admin_dashboard"),
     path(
         "admin/registrations/export-csv/",
-        views.export_registrations_csv,
+        read_view("export_registrations_csv"),
         name="export_registrations_csv",
     ),
+    path(
+        "admin/registrations/export-changes/",
+        views.export_registration_changes,
+        name="export_registration_changes",
+    ),
+    path(
+        "admin/registrations/import/",
+        views.import_registrations_view,
+        name="import_registrations",
+    ),
+    path(
+        "admin/registrations/statistics/",
+        views.registration_stats,
+        name="registration_stats",
+    ),
+    path(
+        "admin/registrations/duplicates/",
+        views.duplicate_registrations,
+        name="duplicate_registrations",
+    ),
+    path(
+        "admin/registrations/provision-credentials/",
+        views.provision_credentials_view,
+        name="provision_credentials",
+    ),
+    path(
+        "admin/registrations/export-background/",
+        views.export_registrations_background,
+        name="export_registrations_background",
+    ),
+    path("admin/jobs/", views.background_jobs, name="background_jobs"),
+    path("admin/jobs/<int:job_id>/", views.background_job, name="background_job"),
+    path(
+        "admin/jobs/<int:job_id>/progress/",
+        views.background_job_progress,
+        name="background_job_progress",
+    ),
+    path(
+        "admin/jobs/<int:job_id>/download/",
+        views.background_job_download,
+        name="background_job_download",
+    ),
     path("admin/students/create/", views.create_student, name="create_student"),
     path("admin/students/<int:user_id>/update/", views.update_student, name="update_student"),
     path(
         "admin/registrations/<int:registration_id>/",
-        views.registration_detail,
+        read_view("registration_detail"),
         name="registration_detail",
     ),
     path(
@@ -1,221 +1,151 @@
-import csv
-
+from asgiref.sync import sync_to_async
 from django.contrib import messages
-from django.contrib.auth import authenticate, login, logout
+from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib.auth.models import User
-from django.db.models import Q
-from django.http import HttpResponse
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
-from django.utils.dateparse import parse_date
-
-from .models import StudentProfile, StudentRegistration
-
-
-REGISTRATION_SECTIONS = [
-    (
-        "1. Basic Information",
-        [
-            ("batch_no", "Batch No", "text"),
-            ("batch_timings", "Batch Timings", "text"),
-            ("faculty_name", "Faculty Name", "text"),
-        ],
-    ),
-    (
-        "2. Personal Details",
-        [
-            ("full_name", "Full Name (As per your certificate)", "text"),
-            ("email", "Email ID", "email"),
-            ("unique_id_proof_type", "Type of Unique ID Proof", "text"),
-            ("unique_id_number", "Unique ID Number", "text"),
-            ("date_of_birth", "Date Of Birth", "date"),
-            ("contact_number", "Contact Number", "text"),
-            ("whatsapp_number", "WhatsApp Number", "text"),
-            ("gender", "Gender", "text"),
-        ],
-    ),
-    (
-        "3. Educational Details",
-        [
-            ("graduation_status", "Graduation Status", "text"),
-            ("current_education_qualification", "Current Education Qualification", "text"),
-            ("ug_discipline", "UG Discipline", "text"),
-            ("studied_college_in", "Studied / Studying College in?", "text"),
-            ("applied_for_pg", "If completed UG, have you applied for PG?", "text"),
-            (
-                "ug_pg_completion_timeline",
-                "If Final Year student (UG/PG), when will course be completed?",
-                "text",
-            ),
-            ("last_or_current_college_name", "Last / Current College Name", "text"),
-            ("college_address", "College Address", "textarea"),
-        ],
-    ),
-    (
-        "4. Current Status (Study / Work)",
-        [
-            ("currently_studying_or_working", "Currently Studying or Working?", "text"),
-            (
-                "work_office_designation_salary",
-                "If Working - Office Name, Designation, Salary",
-                "textarea",
-            ),
-            ("internships_currently", "Do you have any internships going on currently?", "text"),
-            ("preparing_competitive_exams", "Are you preparing for any Competitive Exams?", "text"),
-            (
-                "course_help_in_competitive_exams",
-                "If yes, how will this course help in competitive exams?",
-                "textarea",
-            ),
-        ],
-    ),
-    (
-        "5. Career Plans & Preferences",
-        [
-            (
-                "wants_job_immediately",
-                "Interested in getting a job immediately after finishing course?",
-                "text",
-            ),
-            ("plans_higher_education", "Planning for higher education? If yes, details", "textarea"),
-            ("preferred_job_location", "Preferred Job Location", "text"),
-            ("comfortable_shift_jobs", "Comfortable with shift timing jobs?", "text"),
-        ],
-    ),
-    (
-        "6. Course Commitment & Availability",
-        [
-            (
-                "can_spend_4_hours_daily",
-                "Can you spend 4 hours daily for Cloud Computing Classes?",
-                "text",
-            ),
-            (
-                "can_submit_assignments_on_time",
-                "Can you submit Assignments/Projects on time?",
-                "text",
-            ),
-            (
-                "course_importance_and_need",
-                "How important is this course to you? Why do you need it?",
-                "textarea",
-            ),
-            ("can_attend_webinars", "Can you attend webinars apart from class timings?", "text"),
-        ],
-    ),
-    (
-        "7. Technical Readiness",
-        [
-            ("has_computer_or_laptop", "Do you have a Computer/Laptop?", "text"),
-            ("has_smartphone", "Do you have a Smartphone?", "text"),
-        ],
-    ),
-    (
-        "8. Residential Details",
-        [
-            ("residential_address", "Complete Residential Address", "textarea"),
-            ("pin_code", "Pin Code", "text"),
-            ("currently_staying_in", "Currently Staying In", "text"),
-        ],
-    ),
-    (
-        "9. Family Details",
-        [
-            ("single_parent", "Single Parent?", "text"),
-            ("parents_details", "Parent/s Details", "textarea"),
-            ("father_or_guardian_name", "Name of Father / Guardian", "text"),
-            ("father_or_guardian_contact", "Contact Number of Father / Guardian", "text"),
-            ("current_working_member", "Who is currently working?", "text"),
-            ("breadwinner_profession", "Profession of Breadwinner in Family", "text"),
-            ("annual_family_income", "Annual Family Income", "text"),
-            ("family_members_count", "Number of Family Members (excluding parents)", "text"),
-            ("highest_family_education", "Highest Education Qualification in Family", "text"),
-            ("social_category", "Category (Gen/OBC/SC/ST)", "text"),
-        ],
-    ),
-    (
-        "10. Course Application Status",
-        [
-            ("application_status", "Applying for FIRST TIME or REJOINING?", "text"),
-            ("referral_source", "How did you come to know about this course?", "text"),
-        ],
-    ),
-]
-
-SELECT_OPTIONS = {
-    "unique_id_proof_type": [
-        "Aadhaar",
-        "PAN",
-        "Passport",
-        "Voter ID",
-        "Driving License",
-        "Other",
-    ],
-    "gender": ["Male", "Female", "Other", "Prefer not to say"],
-    "graduation_status": ["Completed", "Final Year", "Pursuing", "Not Started"],
-    "currently_studying_or_working": ["Studying", "Working", "Both", "Neither"],
-    "internships_currently": ["Yes", "No"],
-    "preparing_competitive_exams": ["Yes", "No"],
-    "wants_job_immediately": ["Yes", "No"],
-    "comfortable_shift_jobs": ["Yes", "No"],
-    "can_spend_4_hours_daily": ["Yes", "No"],
-    "can_submit_assignments_on_time": ["Yes", "No"],
-    "can_attend_webinars": ["Yes", "No"],
-    "has_computer_or_laptop": ["Yes", "No"],
-    "has_smartphone": ["Yes", "No"],
-    "single_parent": ["Yes", "No"],
-    "social_category": ["Gen", "OBC", "SC", "ST", "Other"],
-    "application_status": ["FIRST TIME", "REJOINING"],
-}
-
-REQUIRED_FIELDS = {"full_name", "email", "contact_number"}
-
-
-def registration_form_sections():
-    sections = []
-    for section_title, fields in REGISTRATION_SECTIONS:
-        formatted_fields = []
-        for field_name, field_label, field_type in fields:
-            options = SELECT_OPTIONS.get(field_name, [])
-            formatted_fields.append(
-                {
-                    "name": field_name,
-                    "label": field_label,
-                    "type": "select" if options else field_type,
-                    "options": options,
-                    "required": field_name in REQUIRED_FIELDS,
-                }
-            )
-        sections.append((section_title, formatted_fields))
-    return sections
+from django.views.decorators.http import require_POST
+
+from hope.routers import replica_reads
+
+from .archive import registration_from_archive
+from .binding import bind_registration, registration_display_sections
+from .cache import aget_student_profile_payload, get_student_profile_payload
+from .duplicates import duplicate_clusters, find_duplicate_of
+from .exports import (
+    DELTA_EXPORT_LIMIT,
+    EXPORT_FORMATS,
+    MAX_DELTA_EXPORT_LIMIT,
+    astream_export,
+    registration_changes,
+    registration_export_fields,
+    stream_registration_changes_csv,
+    stream_registrations_export,
+)
+from .importers import import_registrations, read_spreadsheet_rows
+from .jobs import JOB_KINDS, enqueue_job, job_artifact_path, job_label
+from .models import ArchivedRegistration, BackgroundJob, StudentProfile, StudentRegistration
+from .outbox import enqueue_registration, queued_ingest_enabled
+from .pagination import PAGE_SIZE_CHOICES, akeyset_paginate, keyset_paginate, parse_page_size
+from .projections import project_registrations
+from .provisioning import (
+    default_password_length,
+    default_username_format,
+    split_full_name,
+    student_profile_for_registration,
+    validate_username_format,
+)
+from .registration_fields import (
+    REGISTRATION_FORM_SCHEMA,
+    REGISTRATION_SCHEMA_VERSION,
+    registration_form_with_values,
+)
+from .search import filter_archived_registrations, filter_registrations
+from .stats import (
+    DEFAULT_STAT_DAYS,
+    aregistration_stat_totals,
+    registration_stat_totals,
+    registration_stats_summary,
+)
+from .throttling import throttled_authenticate
+
+
+REGISTRATION_PAGE_KEYS = [("submitted_at", True), ("id", True)]
+SEARCH_PAGE_KEYS = [("search_rank", False), ("submitted_at", True), ("id", True)]
+STUDENT_PAGE_KEYS = [("id", False)]
+REGISTRATION_FILTER_PARAMS = ["q", "status", "batch", "include_archived"]
+RECENT_JOBS_LIMIT = 50
 
 
 def filtered_registrations(request):
-    q = request.GET.get("q", "").strip()
-    status_filter = request.GET.get("status", "all").strip()
-    batch_filter = request.GET.get("batch", "").strip()
-
-    registrations = StudentRegistration.objects.select_related("created_user").order_by(
-        "-submitted_at"
-    )
-
-    if q:
-        registrations = registrations.filter(
-            Q(full_name__icontains=q)
-            | Q(email__icontains=q)
-            | Q(contact_number__icontains=q)
-            | Q(referral_source__icontains=q)
-        )
+    return filter_registrations(request.GET)
+
+
+def registration_filter_params(params):
+    # What a background job needs to rebuild the same filtered queryset later.
+    return {name: params.get(name, "").strip() for name in REGISTRATION_FILTER_PARAMS}
+
+
+def dashboard_pages(request, q):
+    """Return keyset pagination arguments for the registrations, students and archive tables."""
+    registrations_page = {
+        "keys": SEARCH_PAGE_KEYS if q else REGISTRATION_PAGE_KEYS,
+        "cursor": request.GET.get("cursor", ""),
+        "page_size": parse_page_size(request.GET.get("page_size")),
+    }
+    students_page = {
+        "keys": STUDENT_PAGE_KEYS,
+        "cursor": request.GET.get("students_cursor", ""),
+        "page_size": parse_page_size(request.GET.get("students_page_size")),
+    }
+    archived_page = {**registrations_page, "cursor": request.GET.get("archived_cursor", "")}
+    return registrations_page, students_page, archived_page
+
+
+def dashboard_archived_registrations(request):
+    # None unless the filters ask for archived rows. The table never shows the
+    # compressed answers.
+    archived = filter_archived_registrations(request.GET)
+    return None if archived is None else archived.defer("answers")
+
+
+def dashboard_context(
+    registrations_page,
+    students_page,
+    registration_totals,
+    q,
+    status_filter,
+    batch_filter,
+    archived_page=None,
+):
+    return {
+        "students": students_page["items"],
+        "students_page": students_page,
+        "registrations": registrations_page["items"],
+        "registrations_page": registrations_page,
+        "archived_page": archived_page,
+        "include_archived": archived_page is not None,
+        "registration_totals": registration_totals,
+        "page_size_choices": PAGE_SIZE_CHOICES,
+        "export_formats": EXPORT_FORMATS,
+        "q": q,
+        "status_filter": status_filter,
+        "batch_filter": batch_filter,
+    }
+
+
+def export_response(streaming_content, export_format="csv", filename="student_registrations"):
+    export = EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(streaming_content, content_type=export["content_type"])
+    response["Content-Disposition"] = f"attachment; filename={filename}.{export['extension']}"
+    return response
 
-    if status_filter == "pending":
-        registrations = registrations.filter(account_created=False)
-    elif status_filter == "created":
-        registrations = registrations.filter(account_created=True)
 
-    if batch_filter:
-        registrations = registrations.filter(batch_no__icontains=batch_filter)
+def export_request(request):
+    """Return ``(registrations, export chunks, format)`` for an export view.
 
-    return registrations, q, status_filter, batch_filter
+    Raises ``ValueError`` for an unknown or unavailable ``?format=``.
+    """
+    registrations, _, _, _ = filtered_registrations(request)
+    # The export streams after the view returns, outside @replica_reads; resolve
+    # the database now so it still reads from the replica.
+    registrations = registrations.using(registrations.db)
+    archived = filter_archived_registrations(request.GET)
+    if archived is not None:
+        archived = archived.using(archived.db)
+    export_format = request.GET.get("format", "").strip() or "csv"
+    field_names = registration_export_fields(
+        request.GET.get("columns", "").strip(), export_format
+    )
+    chunks = stream_registrations_export(registrations, field_names, export_format, archived)
+    return registrations, chunks, export_format
 
 
 def home(request):
@@ -228,95 +158,24 @@ def home(request):
 
 def student_register_view(request):
     if request.method == "POST":
-        full_name = request.POST.get("full_name", "").strip()
-        email = request.POST.get("email", "").strip()
-        contact_number = request.POST.get("contact_number", "").strip()
-
-        if not full_name or not email or not contact_number:
-            messages.error(
+        values, errors = bind_registration(request.POST)
+        if errors:
+            # Re-render rather than redirect, so the applicant keeps their answers.
+            for error in errors:
+                messages.error(request, error)
+            return render(
                 request,
-                "Full Name, Email ID, and Contact Number are required.",
+                "student_register.html",
+                {"sections": registration_form_with_values(request.POST), "submitted": True},
             )
-            return redirect("student_register")
 
-        student_registration = StudentRegistration(
-            batch_no=request.POST.get("batch_no", "").strip(),
-            batch_timings=request.POST.get("batch_timings", "").strip(),
-            faculty_name=request.POST.get("faculty_name", "").strip(),
-            full_name=full_name,
-            email=email,
-            unique_id_proof_type=request.POST.get("unique_id_proof_type", "").strip(),
-            unique_id_number=request.POST.get("unique_id_number", "").strip(),
-            date_of_birth=parse_date(request.POST.get("date_of_birth", "").strip() or ""),
-            contact_number=contact_number,
-            whatsapp_number=request.POST.get("whatsapp_number", "").strip(),
-            gender=request.POST.get("gender", "").strip(),
-            graduation_status=request.POST.get("graduation_status", "").strip(),
-            current_education_qualification=request.POST.get(
-                "current_education_qualification", ""
-            ).strip(),
-            ug_discipline=request.POST.get("ug_discipline", "").strip(),
-            studied_college_in=request.POST.get("studied_college_in", "").strip(),
-            applied_for_pg=request.POST.get("applied_for_pg", "").strip(),
-            ug_pg_completion_timeline=request.POST.get(
-                "ug_pg_completion_timeline", ""
-            ).strip(),
-            last_or_current_college_name=request.POST.get(
-                "last_or_current_college_name", ""
-            ).strip(),
-            college_address=request.POST.get("college_address", "").strip(),
-            currently_studying_or_working=request.POST.get(
-                "currently_studying_or_working", ""
-            ).strip(),
-            work_office_designation_salary=request.POST.get(
-                "work_office_designation_salary", ""
-            ).strip(),
-            internships_currently=request.POST.get("internships_currently", "").strip(),
-            preparing_competitive_exams=request.POST.get(
-                "preparing_competitive_exams", ""
-            ).strip(),
-            course_help_in_competitive_exams=request.POST.get(
-                "course_help_in_competitive_exams", ""
-            ).strip(),
-            wants_job_immediately=request.POST.get("wants_job_immediately", "").strip(),
-            plans_higher_education=request.POST.get("plans_higher_education", "").strip(),
-            preferred_job_location=request.POST.get("preferred_job_location", "").strip(),
-            comfortable_shift_jobs=request.POST.get("comfortable_shift_jobs", "").strip(),
-            can_spend_4_hours_daily=request.POST.get(
-                "can_spend_4_hours_daily", ""
-            ).strip(),
-            can_submit_assignments_on_time=request.POST.get(
-                "can_submit_assignments_on_time", ""
-            ).strip(),
-            course_importance_and_need=request.POST.get(
-                "course_importance_and_need", ""
-            ).strip(),
-            can_attend_webinars=request.POST.get("can_attend_webinars", "").strip(),
-            has_computer_or_laptop=request.POST.get("has_computer_or_laptop", "").strip(),
-            has_smartphone=request.POST.get("has_smartphone", "").strip(),
-            residential_address=request.POST.get("residential_address", "").strip(),
-            pin_code=request.POST.get("pin_code", "").strip(),
-            currently_staying_in=request.POST.get("currently_staying_in", "").strip(),
-            single_parent=request.POST.get("single_parent", "").strip(),
-            parents_details=request.POST.get("parents_details", "").strip(),
-            father_or_guardian_name=request.POST.get(
-                "father_or_guardian_name", ""
-            ).strip(),
-            father_or_guardian_contact=request.POST.get(
-                "father_or_guardian_contact", ""
-            ).strip(),
-            current_working_member=request.POST.get("current_working_member", "").strip(),
-            breadwinner_profession=request.POST.get("breadwinner_profession", "").strip(),
-            annual_family_income=request.POST.get("annual_family_income", "").strip(),
-            family_members_count=request.POST.get("family_members_count", "").strip(),
-            highest_family_education=request.POST.get(
-                "highest_family_education", ""
-            ).strip(),
-            social_category=request.POST.get("social_category", "").strip(),
-            application_status=request.POST.get("application_status", "").strip(),
-            referral_source=request.POST.get("referral_source", "").strip(),
-        )
-        student_registration.save()
+        # Flag, never reject: admins review likely duplicates on the dashboard.
+        # Queued submissions are flagged when the outbox drains.
+        if queued_ingest_enabled():
+            enqueue_registration(values)
+        else:
+            values["duplicate_of_id"] = find_duplicate_of(values)
+            StudentRegistration(**values).save()
         messages.success(
             request,
             "Registration submitted successfully. Admin will create your User ID and Password.",
@@ -326,10 +185,17 @@ def student_register_view(request):
     return render(
         request,
         "student_register.html",
-        {"sections": registration_form_sections()},
+        {"sections": REGISTRATION_FORM_SCHEMA, "schema_version": REGISTRATION_SCHEMA_VERSION},
     )
 
 
+def login_throttled(request, template_name, retry_after):
+    messages.error(request, f"Too many login attempts. Try again in {retry_after} seconds.")
+    response = render(request, template_name, status=429)
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
 def student_login_view(request):
     if request.user.is_authenticated and not request.user.is_staff:
         return redirect("student_dashboard")
@@ -337,7 +203,9 @@ def student_login_view(request):
     if request.method == "POST":
         username = request.POST.get("username", "").strip()
         password = request.POST.get("password", "")
-        user = authenticate(request, username=username, password=password)
+        user, retry_after = throttled_authenticate(request, username, password)
+        if retry_after:
+            return login_throttled(request, "student_login.html", retry_after)
 
         if user is not None and not user.is_staff:
             login(request, user)
@@ -355,7 +223,9 @@ def admin_login_view(request):
     if request.method == "POST":
         username = request.POST.get("username", "").strip()
         password = request.POST.get("password", "")
-        user = authenticate(request, username=username, password=password)
+        user, retry_after = throttled_authenticate(request, username, password)
+        if retry_after:
+            return login_throttled(request, "admin_login.html", retry_after)
 
         if user is not None and user.is_staff:
             login(request, user)
@@ -376,7 +246,7 @@ def student_dashboard(request):
     if request.user.is_staff:
         return redirect("admin_dashboard")
 
-    profile, _ = StudentProfile.objects.get_or_create(user=request.user)
+    profile = get_student_profile_payload(request.user.id)
     return render(request, "student_dashboard.html", {"profile": profile})
 
 
@@ -385,89 +255,200 @@ def is_admin_user(user):
 
 
 @user_passes_test(is_admin_user)
+@replica_reads
 def admin_dashboard(request):
-    students = User.objects.filter(is_staff=False).order_by("id")
     registrations, q, status_filter, batch_filter = filtered_registrations(request)
+    registrations = project_registrations(registrations, "dashboard")
+    registrations_args, students_args, archived_args = dashboard_pages(request, q)
+    registrations_page = keyset_paginate(registrations, **registrations_args)
+    students_page = keyset_paginate(User.objects.filter(is_staff=False), **students_args)
+    archived = dashboard_archived_registrations(request)
+    archived_page = None if archived is None else keyset_paginate(archived, **archived_args)
     return render(
         request,
         "admin_dashboard.html",
-        {
-            "students": students,
-            "registrations": registrations,
-            "q": q,
-            "status_filter": status_filter,
-            "batch_filter": batch_filter,
-        },
+        dashboard_context(
+            registrations_page,
+            students_page,
+            registration_stat_totals(),
+            q,
+            status_filter,
+            batch_filter,
+            archived_page,
+        ),
     )
 
 
 @user_passes_test(is_admin_user)
+@replica_reads
+def registration_stats(request):
+    try:
+        days = min(max(int(request.GET.get("days", DEFAULT_STAT_DAYS)), 1), 366)
+    except ValueError:
+        days = DEFAULT_STAT_DAYS
+    return render(request, "registration_stats.html", {"stats": registration_stats_summary(days)})
+
+
+@user_passes_test(is_admin_user)
+@replica_reads
+def duplicate_registrations(request):
+    return render(request, "duplicate_registrations.html", {"clusters": duplicate_clusters()})
+
+
+@user_passes_test(is_admin_user)
+@replica_reads
 def export_registrations_csv(request):
-    registrations, _, _, _ = filtered_registrations(request)
+    try:
+        _registrations, chunks, export_format = export_request(request)
+    except ValueError as exc:
+        messages.error(request, str(exc))
+        return redirect("admin_dashboard")
+    return export_response(chunks, export_format)
+
 
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = "attachment; filename=student_registrations.csv"
-
-    writer = csv.writer(response)
-    writer.writerow(
-        [
-            "registration_id",
-            "submitted_at",
-            "full_name",
-            "email",
-            "contact_number",
-            "batch_no",
-            "batch_timings",
-            "faculty_name",
-            "graduation_status",
-            "preferred_job_location",
-            "application_status",
-            "referral_source",
-            "account_created",
-            "created_user_id",
-            "created_username",
-        ]
+@user_passes_test(is_admin_user)
+@replica_reads
+def export_registration_changes(request):
+    """CSV of registrations created, changed, archived or deleted after ``?since=<seq>``.
+
+    The response's X-Export-Watermark is the ``since`` for the next pull; when
+    X-Export-Has-More is "1" more changes were already waiting past ``limit``.
+    """
+    try:
+        since = int(request.GET.get("since") or 0)
+        limit = int(request.GET.get("limit") or DELTA_EXPORT_LIMIT)
+    except ValueError:
+        return HttpResponseBadRequest("since and limit must be whole numbers.")
+    if since < 0 or limit < 1:
+        return HttpResponseBadRequest("since must be 0 or more and limit at least 1.")
+    limit = min(limit, MAX_DELTA_EXPORT_LIMIT)
+
+    registrations = StudentRegistration.objects.all()
+    registrations = registrations.using(registrations.db)
+    changes, watermark, has_more = registration_changes(since, limit, using=registrations.db)
+    field_names = registration_export_fields(request.GET.get("columns", "").strip())
+    response = export_response(
+        stream_registration_changes_csv(registrations, changes, field_names),
+        filename=f"registration_changes_{since}_{watermark}",
     )
+    response["X-Export-Watermark"] = str(watermark)
+    response["X-Export-Has-More"] = "1" if has_more else "0"
+    return response
 
-    for reg in registrations:
-        writer.writerow(
-            [
-                reg.id,
-                reg.submitted_at.isoformat() if reg.submitted_at else "",
-                reg.full_name,
-                reg.email,
-                reg.contact_number,
-                reg.batch_no,
-                reg.batch_timings,
-                reg.faculty_name,
-                reg.graduation_status,
-                reg.preferred_job_location,
-                reg.application_status,
-                reg.referral_source,
-                "Yes" if reg.account_created else "No",
-                reg.created_user.id if reg.created_user else "",
-                reg.created_user.username if reg.created_user else "",
-            ]
-        )
 
-    return response
+@user_passes_test(is_admin_user)
+@require_POST
+def export_registrations_background(request):
+    params = registration_filter_params(request.POST)
+    params["columns"] = request.POST.get("columns", "").strip()
+    params["format"] = request.POST.get("format", "").strip() or "csv"
+    if params["format"] not in EXPORT_FORMATS:
+        messages.error(request, f"Unknown export format {params['format']!r}.")
+        return redirect("admin_dashboard")
+    job = enqueue_job("export_registrations", params, request.user)
+    return redirect("background_job", job_id=job.id)
+
+
+def own_job(request, job_id):
+    jobs = BackgroundJob.objects.all()
+    if not request.user.is_superuser:
+        jobs = jobs.filter(created_by=request.user)
+    return get_object_or_404(jobs, id=job_id)
 
 
 @user_passes_test(is_admin_user)
-def registration_detail(request, registration_id):
-    registration = get_object_or_404(StudentRegistration, id=registration_id)
-    display_sections = []
-    for section_title, fields in REGISTRATION_SECTIONS:
-        rows = []
-        for field_name, field_label, _field_type in fields:
-            value = getattr(registration, field_name, "")
-            rows.append((field_label, value))
-        display_sections.append((section_title, rows))
+def background_jobs(request):
+    jobs = BackgroundJob.objects.order_by("-id")
+    if not request.user.is_superuser:
+        jobs = jobs.filter(created_by=request.user)
+    jobs = list(jobs[:RECENT_JOBS_LIMIT])
+    for job in jobs:
+        job.label = job_label(job)
+    return render(request, "background_jobs.html", {"jobs": jobs})
+
+
+@user_passes_test(is_admin_user)
+def background_job(request, job_id):
+    job = own_job(request, job_id)
+    job.label = job_label(job)
+    return render(request, "background_job.html", {"job": job})
+
+
+@user_passes_test(is_admin_user)
+def background_job_progress(request, job_id):
+    job = own_job(request, job_id)
+    return JsonResponse(
+        {
+            "status": job.status,
+            "progress": job.progress,
+            "total": job.total,
+            "percent": job.percent,
+            "finished": job.finished,
+            "message": job.message,
+        }
+    )
+
+
+@user_passes_test(is_admin_user)
+def background_job_download(request, job_id):
+    job = own_job(request, job_id)
+    if job.status != BackgroundJob.SUCCEEDED or not job.artifact:
+        raise Http404("This job has no file to download.")
+    path = job_artifact_path(job)
+    try:
+        handle = open(path, "rb")
+    except FileNotFoundError:
+        raise Http404("The file has already been downloaded or removed.")
+    if JOB_KINDS.get(job.kind, {}).get("download_once"):
+        # The open handle keeps streaming after the file is unlinked.
+        path.unlink()
+    return FileResponse(handle, as_attachment=True, filename=job.artifact)
+
+
+@user_passes_test(is_admin_user)
+def import_registrations_view(request):
+    report = None
+    if request.method == "POST":
+        uploaded_file = request.FILES.get("file")
+        if uploaded_file is None:
+            messages.error(request, "Choose a CSV or XLSX file to import.")
+            return redirect("import_registrations")
+
+        # Unreadable files come back in the report, next to whatever was imported.
+        report = import_registrations(read_spreadsheet_rows(uploaded_file, uploaded_file.name))
+
+    return render(request, "import_registrations.html", {"report": report})
+
 
+def detail_registrations(registration_id):
+    return project_registrations(StudentRegistration.objects.filter(id=registration_id), "detail")
+
+
+def registration_detail_context(registration, archived_entry):
+    """Context for an active ``registration``, or failing that an archived one."""
+    archived = registration is None
+    if archived:
+        if archived_entry is None:
+            raise Http404("No registration matches the given query.")
+        registration = registration_from_archive(archived_entry)
+    return {
+        "registration": registration,
+        "archived": archived,
+        "display_sections": registration_display_sections(registration),
+    }
+
+
+@user_passes_test(is_admin_user)
+@replica_reads
+def registration_detail(request, registration_id):
+    registration = detail_registrations(registration_id).first()
+    archived_entry = None
+    if registration is None:
+        archived_entry = ArchivedRegistration.objects.filter(id=registration_id).first()
     return render(
         request,
         "registration_detail.html",
-        {"registration": registration, "display_sections": display_sections},
+        registration_detail_context(registration, archived_entry),
     )
 
 
@@ -498,9 +479,7 @@ def create_credentials_for_registration(request, registration_id):
                 "create_credentials_for_registration", registration_id=registration_id
             )
 
-        name_parts = registration.full_name.split(maxsplit=1)
-        first_name = name_parts[0] if name_parts else ""
-        last_name = name_parts[1] if len(name_parts) > 1 else ""
+        first_name, last_name = split_full_name(registration.full_name)
 
         user = User.objects.create_user(
             username=username,
@@ -510,13 +489,7 @@ def create_credentials_for_registration(request, registration_id):
             last_name=last_name,
         )
 
-        StudentProfile.objects.create(
-            user=user,
-            course_name="Cloud Computing",
-            course_duration="TBD",
-            progress_percent=0,
-            notes=f"Registration ID: {registration.id}",
-        )
+        student_profile_for_registration(user, registration).save()
 
         registration.account_created = True
         registration.created_user = user
@@ -535,6 +508,55 @@ def create_credentials_for_registration(request, registration_id):
     )
 
 
+@user_passes_test(is_admin_user)
+def provision_credentials_view(request):
+    registrations, q, _status_filter, batch_filter = filtered_registrations(request)
+    pending = registrations.filter(account_created=False)
+    username_format = request.POST.get("username_format", default_username_format()).strip()
+    password_length = request.POST.get("password_length", str(default_password_length())).strip()
+
+    if request.method == "POST":
+        format_error = validate_username_format(username_format)
+        if format_error:
+            messages.error(request, format_error)
+            return redirect(f"{request.path}?{request.GET.urlencode()}")
+
+        try:
+            password_length_value = int(password_length)
+            if password_length_value < 8 or password_length_value > 64:
+                raise ValueError
+        except ValueError:
+            messages.error(request, "Password length must be a number between 8 and 64.")
+            return redirect(f"{request.path}?{request.GET.urlencode()}")
+
+        if not pending.exists():
+            messages.info(request, "No pending registrations match the current filters.")
+            return redirect("admin_dashboard")
+
+        job = enqueue_job(
+            "provision_credentials",
+            {
+                **registration_filter_params(request.GET),
+                "username_format": username_format,
+                "password_length": password_length_value,
+            },
+            request.user,
+        )
+        return redirect("background_job", job_id=job.id)
+
+    return render(
+        request,
+        "provision_credentials.html",
+        {
+            "pending_count": pending.count(),
+            "q": q,
+            "batch_filter": batch_filter,
+            "username_format": username_format,
+            "password_length": password_length,
+        },
+    )
+
+
 @user_passes_test(is_admin_user)
 def create_student(request):
     if request.method == "POST":
@@ -620,3 +642,79 @@ def update_student(request, user_id):
         "update_student.html",
         {"student_user": student_user, "profile": profile},
     )
+
+
+# Async versions of the read-heavy views, routed instead of the sync ones when
+# settings.ASYNC_VIEWS is on (hope/asgi.py turns it on). Page queries go through
+# the async ORM (afirst, aexists, async iteration); exports stream their sync
+# generators a chunk at a time through astream_export. Templates are sync, so
+# pages render via sync_to_async.
+
+
+async def arender(request, template_name, context):
+    # Reuse the user the async auth check already loaded, so rendering does not
+    # look the session user up a second time through the sync request.user.
+    request.user = await request.auser()
+    return await sync_to_async(render)(request, template_name, context)
+
+
+@login_required
+async def student_dashboard_async(request):
+    user = await request.auser()
+    if user.is_staff:
+        return redirect("admin_dashboard")
+
+    profile = await aget_student_profile_payload(user.id)
+    return await arender(request, "student_dashboard.html", {"profile": profile})
+
+
+@user_passes_test(is_admin_user)
+@replica_reads
+async def admin_dashboard_async(request):
+    registrations, q, status_filter, batch_filter = filtered_registrations(request)
+    registrations = project_registrations(registrations, "dashboard")
+    registrations_args, students_args, archived_args = dashboard_pages(request, q)
+    registrations_page = await akeyset_paginate(registrations, **registrations_args)
+    students_page = await akeyset_paginate(User.objects.filter(is_staff=False), **students_args)
+    archived = dashboard_archived_registrations(request)
+    archived_page = None
+    if archived is not None:
+        archived_page = await akeyset_paginate(archived, **archived_args)
+    return await arender(
+        request,
+        "admin_dashboard.html",
+        dashboard_context(
+            registrations_page,
+            students_page,
+            await aregistration_stat_totals(),
+            q,
+            status_filter,
+            batch_filter,
+            archived_page,
+        ),
+    )
+
+
+@user_passes_test(is_admin_user)
+@replica_reads
+async def export_registrations_csv_async(request):
+    try:
+        _registrations, chunks, export_format = export_request(request)
+    except ValueError as exc:
+        await sync_to_async(messages.error)(request, str(exc))
+        return redirect("admin_dashboard")
+    return export_response(astream_export(chunks), export_format)
+
+
+@user_passes_test(is_admin_user)
+@replica_reads
+async def registration_detail_async(request, registration_id):
+    registration = await detail_registrations(registration_id).afirst()
+    archived_entry = None
+    if registration is None:
+        archived_entry = await ArchivedRegistration.objects.filter(id=registration_id).afirst()
+    return await arender(
+        request,
+        "registration_detail.html",
+        registration_detail_context(registration, archived_entry),
+    )
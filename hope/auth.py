@@ -0,0 +1,76 @@
+"""Session storage and password hashing profiles.
+
+Settings pick ``SESSION_ENGINE`` with :func:`session_engine` and
+``PASSWORD_HASHERS`` with :func:`password_hashers`. Each request with a session
+cookie loads the session, so the session profile decides whether that costs a
+query per request; each login verifies a password hash, so the hasher profile
+decides how much CPU a login costs.
+"""
+
+import importlib.util
+
+SESSION_PROFILES = {
+    # Django's stock behaviour: one SELECT on django_session per request.
+    'db': 'django.contrib.sessions.backends.db',
+    # Reads come from the cache and fall back to the table on a miss; writes go
+    # to both. With the default local-memory cache every process keeps its own
+    # copy, so a logout only clears the cache of the process that served it:
+    # use a shared cache (Redis, Memcached) when running several processes.
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    # The session lives in a signed cookie and no store is consulted at all.
+    # Cookies cannot be revoked server-side and the payload is readable by the
+    # client (though tamper-proof).
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+
+ARGON2_HASHER = 'django.contrib.auth.hashers.Argon2PasswordHasher'
+DJANGO_PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    ARGON2_HASHER,
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
+# The first hasher hashes new passwords; the rest only verify existing hashes,
+# which are rehashed with the first at the user's next login.
+PASSWORD_HASHER_PROFILES = {
+    # Django's default: PBKDF2-SHA256 at 1,000,000 iterations.
+    'pbkdf2': DJANGO_PASSWORD_HASHERS,
+    # Argon2id with Django's parameters (100 MiB, 2 passes) is memory-hard, so
+    # it resists GPU cracking at least as well for a fraction of the CPU time.
+    'argon2': [
+        ARGON2_HASHER,
+        *[hasher for hasher in DJANGO_PASSWORD_HASHERS if hasher != ARGON2_HASHER],
+    ],
+}
+
+# Python packages a hasher profile needs.
+PASSWORD_HASHER_REQUIREMENTS = {'argon2': 'argon2'}
+
+
+def session_engine(profile='db'):
+    """Return the ``SESSION_ENGINE`` for ``profile``."""
+    try:
+        return SESSION_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown session profile {profile!r}; choose one of {', '.join(SESSION_PROFILES)}."
+        ) from None
+
+
+def password_hashers(profile='pbkdf2'):
+    """Return ``PASSWORD_HASHERS`` for ``profile``, preferred hasher first."""
+    try:
+        hashers = PASSWORD_HASHER_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown password hasher profile {profile!r}; "
+            f"choose one of {', '.join(PASSWORD_HASHER_PROFILES)}."
+        ) from None
+    requirement = PASSWORD_HASHER_REQUIREMENTS.get(profile)
+    if requirement and importlib.util.find_spec(requirement) is None:
+        raise ValueError(
+            f"The {profile!r} password hasher profile requires the {requirement}-cffi package."
+        )
+    return list(hashers)
@@ -0,0 +1,208 @@
+"""Per-request performance metrics and their in-memory, per-view histograms.
+
+``hope.middleware.PerformanceMiddleware`` opens a :class:`RequestMetrics` for
+each request, times every SQL query through ``connection.execute_wrapper`` and
+template rendering through :class:`InstrumentedDjangoTemplates`, reports the
+totals in a ``Server-Timing`` header and folds them into :data:`REGISTRY`.
+:func:`metrics_view` exposes the histograms to staff as JSON or Prometheus text.
+Histograms live in process memory, so each worker reports its own traffic.
+"""
+
+import logging
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from contextvars import ContextVar
+
+from django.contrib.auth.decorators import user_passes_test
+from django.http import HttpResponse, JsonResponse
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+from LMS.views import is_admin_user
+
+
+logger = logging.getLogger("hope.performance")
+
+DURATION_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (1 << 10, 4 << 10, 16 << 10, 64 << 10, 256 << 10, 1 << 20, 4 << 20, 16 << 20)
+
+METRIC_BUCKETS = {
+    "wall_ms": DURATION_BUCKETS_MS,
+    "db_ms": DURATION_BUCKETS_MS,
+    "db_queries": COUNT_BUCKETS,
+    "template_ms": DURATION_BUCKETS_MS,
+    "response_bytes": SIZE_BUCKETS,
+}
+QUANTILES = {"p50": 0.50, "p95": 0.95, "p99": 0.99}
+
+DEFAULT_N_PLUS_ONE_THRESHOLD = 10
+
+# Collapse literals and IN-lists so "the same query with different values"
+# counts as one SQL shape.
+SQL_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+SQL_IN_LIST_RE = re.compile(r"\bIN \((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+
+_current = ContextVar("request_metrics", default=None)
+
+
+def sql_shape(sql):
+    return SQL_IN_LIST_RE.sub("IN (...)", SQL_LITERAL_RE.sub("?", sql))
+
+
+class RequestMetrics:
+    """Totals for one request; also the ``execute_wrapper`` that collects them."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_ms = 0.0
+        self.db_queries = 0
+        self.template_ms = 0.0
+        self.sql_shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - started) * 1000
+            self.db_queries += 1
+            self.sql_shapes[sql_shape(sql)] += 1
+
+    def activate(self):
+        return _current.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _current.reset(token)
+
+    def wall_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def repeated_queries(self, threshold):
+        return [(shape, count) for shape, count in self.sql_shapes.most_common() if count > threshold]
+
+
+class InstrumentedTemplate(Template):
+    def render(self, context=None, request=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_ms += (time.perf_counter() - started) * 1000
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing each top-level render."""
+
+    def from_string(self, template_code):
+        return InstrumentedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return InstrumentedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        # One count per bucket (value <= bound) plus the overflow bucket.
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, fraction):
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(lower + (upper - lower) * (rank - cumulative) / bucket_count, self.max)
+            cumulative += bucket_count
+        return self.max
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def observe(self, view_name, values):
+        with self.lock:
+            histograms = self.views.get(view_name)
+            if histograms is None:
+                histograms = self.views[view_name] = {
+                    metric: Histogram(bounds) for metric, bounds in METRIC_BUCKETS.items()
+                }
+            for metric, value in values.items():
+                histograms[metric].observe(value)
+
+    def summary(self):
+        with self.lock:
+            return {
+                view_name: {
+                    metric: {
+                        "count": histogram.count,
+                        "sum": round(histogram.total, 3),
+                        "max": round(histogram.max, 3),
+                        **{
+                            name: round(histogram.quantile(fraction), 3)
+                            for name, fraction in QUANTILES.items()
+                        },
+                    }
+                    for metric, histogram in histograms.items()
+                }
+                for view_name, histograms in sorted(self.views.items())
+            }
+
+    def prometheus(self):
+        lines = []
+        with self.lock:
+            for metric in METRIC_BUCKETS:
+                name = f"hope_request_{metric}"
+                lines.append(f"# TYPE {name} histogram")
+                for view_name, histograms in sorted(self.views.items()):
+                    histogram = histograms[metric]
+                    label = view_name.replace("\\", "\\\\").replace('"', '\\"')
+                    cumulative = 0
+                    for bound, bucket_count in zip(histogram.bounds, histogram.counts):
+                        cumulative += bucket_count
+                        lines.append(f'{name}_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{view="{label}",le="+Inf"}} {histogram.count}')
+                    lines.append(f'{name}_sum{{view="{label}"}} {histogram.total:.3f}')
+                    lines.append(f'{name}_count{{view="{label}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+
+# The same access rule as the admin dashboard.
+@user_passes_test(is_admin_user)
+def metrics_view(request):
+    if request.GET.get("format") == "prometheus":
+        return HttpResponse(REGISTRY.prometheus(), content_type="text/plain; version=0.0.4")
+    return JsonResponse(REGISTRY.summary())
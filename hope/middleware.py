@@ -0,0 +1,153 @@
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from hope.metrics import DEFAULT_N_PLUS_ONE_THRESHOLD, REGISTRY, RequestMetrics, logger
+from hope.routers import pin_to_primary, read_replica_alias, unpin
+
+
+PRIMARY_PIN_COOKIE = "hope_primary_pin"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS", "TRACE"}
+
+
+def instrument_connections(metrics):
+    """Return an ExitStack that feeds every configured connection's SQL to ``metrics``."""
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(metrics))
+    return stack
+
+
+class ReadYourWritesMiddleware:
+    """Keep a client on the primary database until the replica has caught up.
+
+    Any unsafe request (a POST to ``update_student``, say) reads from the
+    primary and sets a short-lived cookie; while it is present, replica-enabled
+    views read from the primary too, so the redirect after a write never shows
+    the replica's older snapshot.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not read_replica_alias():
+            return self.get_response(request)
+
+        token = pin_to_primary(self.pinned(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            unpin(token)
+        return self.set_pin_cookie(request, response)
+
+    async def __acall__(self, request):
+        if not read_replica_alias():
+            return await self.get_response(request)
+
+        token = pin_to_primary(self.pinned(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            unpin(token)
+        return self.set_pin_cookie(request, response)
+
+    def pinned(self, request):
+        return request.method not in SAFE_METHODS or PRIMARY_PIN_COOKIE in request.COOKIES
+
+    def set_pin_cookie(self, request, response):
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE,
+                "1",
+                max_age=getattr(settings, "DATABASE_REPLICA_LAG", 60),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class PerformanceMiddleware:
+    """Time each request and report it in ``Server-Timing`` and per-view histograms.
+
+    Records wall time, SQL query count and time (on every configured
+    database), template render time and response size. Streaming responses
+    are measured up to the point the view returns; their body is not counted.
+    Logs a warning when a request runs the same SQL shape more than
+    ``PERFORMANCE_N_PLUS_ONE_THRESHOLD`` times. Runs natively in both sync
+    (WSGI) and async (ASGI) middleware chains.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = metrics.activate()
+        try:
+            with instrument_connections(metrics):
+                response = self.get_response(request)
+        finally:
+            RequestMetrics.deactivate(token)
+        return self.record(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = metrics.activate()
+        try:
+            # Under ASGI, views and the async ORM run queries in the request's
+            # thread-sensitive executor, which has its own connections; wrap those.
+            stack = await sync_to_async(instrument_connections)(metrics)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            RequestMetrics.deactivate(token)
+        return self.record(request, response, metrics)
+
+    def record(self, request, response, metrics):
+        view_name = request.resolver_match.view_name if request.resolver_match else "unresolved"
+        values = {
+            "wall_ms": metrics.wall_ms(),
+            "db_ms": metrics.db_ms,
+            "db_queries": metrics.db_queries,
+            "template_ms": metrics.template_ms,
+        }
+        server_timing = [
+            f"app;dur={values['wall_ms']:.1f}",
+            f'db;dur={metrics.db_ms:.1f};desc="{metrics.db_queries} queries"',
+            f"tpl;dur={metrics.template_ms:.1f}",
+        ]
+        if not response.streaming:
+            values["response_bytes"] = len(response.content)
+            server_timing.append(f'size;desc="{values["response_bytes"]} bytes"')
+        response["Server-Timing"] = ", ".join(server_timing)
+        REGISTRY.observe(view_name, values)
+
+        threshold = getattr(
+            settings, "PERFORMANCE_N_PLUS_ONE_THRESHOLD", DEFAULT_N_PLUS_ONE_THRESHOLD
+        )
+        for shape, count in metrics.repeated_queries(threshold):
+            logger.warning(
+                "Possible N+1: %s ran the same query %d times: %s", view_name, count, shape
+            )
+        return response
@@ -0,0 +1,79 @@
+"""Primary/replica database routing.
+
+Writes always go to ``default``. Reads go to the replica alias named by
+``DATABASE_READ_REPLICA`` only inside views wrapped with :func:`replica_reads`,
+and only while the client is not pinned to the primary: see
+``hope.middleware.ReadYourWritesMiddleware``, which pins a client for
+``DATABASE_REPLICA_LAG`` seconds after any unsafe request.
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+
+_replica_reads = ContextVar("replica_reads", default=False)
+_primary_pinned = ContextVar("primary_pinned", default=False)
+
+
+def read_replica_alias():
+    return getattr(settings, "DATABASE_READ_REPLICA", None)
+
+
+def pin_to_primary(pinned=True):
+    """Pin the current request's reads to the primary; returns a reset token."""
+    return _primary_pinned.set(pinned)
+
+
+def unpin(token):
+    _primary_pinned.reset(token)
+
+
+def replica_reads(view_func):
+    """Let ``view_func`` read from the replica; use only on read-only views."""
+
+    if iscoroutinefunction(view_func):
+
+        @wraps(view_func)
+        async def async_wrapper(*args, **kwargs):
+            token = _replica_reads.set(True)
+            try:
+                return await view_func(*args, **kwargs)
+            finally:
+                _replica_reads.reset(token)
+
+        return async_wrapper
+
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        token = _replica_reads.set(True)
+        try:
+            return view_func(*args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replica = read_replica_alias()
+        if replica and _replica_reads.get() and not _primary_pinned.get():
+            return replica
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica is a copy of the primary, so rows from either may relate.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is refreshed from the primary, never migrated directly.
+        if db == read_replica_alias():
+            return False
+        return None
@@ -13,6 +13,9 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 from pathlib import Path
 import os
 
+from hope.database import sqlite_database
+from hope.auth import password_hashers, session_engine
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,11 +45,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'hope.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'hope.middleware.ReadYourWritesMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -55,7 +60,8 @@ ROOT_URLCONF = 'hope.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates with render timing for PerformanceMiddleware.
+        'BACKEND': 'hope.metrics.InstrumentedDjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -70,18 +76,87 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'hope.wsgi.application'
 
+# Serve the read-heavy views (dashboards, registration detail, CSV export) as
+# async views. hope/asgi.py turns this on; under WSGI the sync views are used,
+# since Django would otherwise run each async view in its own event loop and
+# buffer async streams. See `manage.py bench_async_views`.
+ASYNC_VIEWS = os.environ.get('HOPE_ASYNC_VIEWS', '') == '1'
+
 
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# 'default' is Django's stock SQLite setup; 'tuned' enables WAL, synchronous=NORMAL,
+# a busy timeout, mmap and a larger page cache, plus persistent connections. Pick
+# 'tuned' per deployment with HOPE_DATABASE_PROFILE=tuned: journal_mode=WAL is
+# stored in the database file, so even one manage.py run rewrites its header.
+# See hope/database.py and `manage.py bench_database_profile`.
+DATABASE_PROFILE = os.environ.get('HOPE_DATABASE_PROFILE', 'default')
+
 DATABASES = {
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3', DATABASE_PROFILE),
+}
+
+# Optional read replica: a SQLite snapshot of the primary refreshed by
+# `manage.py refresh_read_replica`. Dashboards, detail pages and exports read
+# from it; a client that just wrote stays on the primary for
+# DATABASE_REPLICA_LAG seconds.
+DATABASE_READ_REPLICA = None
+DATABASE_REPLICA_LAG = 60
+if os.environ.get('HOPE_DATABASE_REPLICA'):
+    DATABASE_READ_REPLICA = 'replica'
+    DATABASES['replica'] = sqlite_database(
+        os.environ['HOPE_DATABASE_REPLICA'], DATABASE_PROFILE, replica=True
+    )
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['hope.routers.PrimaryReplicaRouter']
+
+if ASYNC_VIEWS:
+    # Under ASGI each request's queries run in a fresh thread with its own
+    # connection, so there is nothing to keep open between requests.
+    for database in DATABASES.values():
+        database['CONN_MAX_AGE'] = 0
+
+
+# Performance instrumentation
+# hope.middleware.PerformanceMiddleware adds Server-Timing headers and feeds the
+# per-view histograms served to staff at /metrics/ (?format=prometheus).
+
+# Warn (logger "hope.performance") when one request repeats a SQL shape more often.
+PERFORMANCE_N_PLUS_ONE_THRESHOLD = 10
+
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Local memory is per process: each worker has its own cache and only sees its
+# own invalidations (see LMS_PROFILE_CACHE_TIMEOUT and LMS_USER_CACHE_TIMEOUT).
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'hope-default',
     }
 }
 
 
+# Sessions and authentication
+
+# 'db' is Django's table-backed store; 'cached_db' and 'signed_cookies' skip the
+# per-request session query. See hope/auth.py and `manage.py bench_auth`.
+SESSION_PROFILE = os.environ.get('HOPE_SESSION_PROFILE', 'db')
+SESSION_ENGINE = session_engine(SESSION_PROFILE)
+
+# 'pbkdf2' is Django's default; 'argon2' (needs argon2-cffi) makes each login
+# far cheaper in CPU without weakening the stored hashes.
+PASSWORD_HASHER_PROFILE = os.environ.get('HOPE_PASSWORD_HASHERS', 'pbkdf2')
+PASSWORD_HASHERS = password_hashers(PASSWORD_HASHER_PROFILE)
+
+# ModelBackend that keeps recently seen users in the cache, so an authenticated
+# request does not load its User row every time. See LMS_USER_CACHE_TIMEOUT.
+AUTHENTICATION_BACKENDS = ['LMS.backends.CachedModelBackend']
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -117,3 +192,47 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
 STATIC_URL = 'static/'
+
+
+# LMS
+
+# Credential provisioning. Username placeholders: {id}, {first}, {last}, {batch};
+# {id} keeps generated usernames unique.
+LMS_USERNAME_FORMAT = '{first}{id}'
+LMS_PASSWORD_LENGTH = 10
+
+# Seconds a student's dashboard profile stays cached. Profile saves invalidate
+# it, but only in the process that saved it while CACHES is local memory: other
+# workers keep serving their copy until it expires. Point CACHES at a shared
+# backend (Redis, Memcached) before running several workers.
+LMS_PROFILE_CACHE_TIMEOUT = 15 * 60
+
+# Login throttling: token buckets of (attempts, seconds) per client IP and per
+# username, kept in the default cache. An attempt over either limit gets a 429
+# before its password is hashed; a successful login refills the username's.
+LMS_LOGIN_THROTTLE_IP = (20, 60)
+LMS_LOGIN_THROTTLE_USERNAME = (5, 60)
+
+# Seconds an authenticated user stays cached for session lookups. Saving or
+# deleting the user invalidates it, but only in the cache of the process that
+# saved it while CACHES is local memory; keep this short, as a deactivated user
+# or changed password can go unnoticed elsewhere for that long.
+LMS_USER_CACHE_TIMEOUT = 60
+
+# Registration ingest: 'direct' saves each submission in the request; 'queue'
+# appends it to a durable WAL outbox drained by `manage.py drain_registration_outbox`.
+LMS_REGISTRATION_INGEST = 'direct'
+LMS_REGISTRATION_OUTBOX = BASE_DIR / 'registration_outbox.sqlite3'
+
+# Background jobs (exports, credential provisioning): 'worker' queues each job
+# for `manage.py run_jobs`, which must be running; 'inline' runs it in the request
+# that starts it, for development and tests only (`manage.py check` warns about
+# it when DEBUG is off). Finished files are kept under LMS_JOB_ARTIFACTS for
+# download.
+LMS_BACKGROUND_JOBS = 'worker'
+LMS_JOB_ARTIFACTS = BASE_DIR / 'job_artifacts'
+
+# Dashboard search orders matches by relevance only while at most this many rows
+# match; ranking costs time for every match, so a broader query (a common
+# surname, say) is listed newest first instead.
+LMS_RANKED_SEARCH_LIMIT = 2000
@@ -17,7 +17,10 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from hope.metrics import metrics_view
+
 urlpatterns = [
     path('', include('LMS.urls')),
+    path('metrics/', metrics_view, name='metrics'),
     path('admin/', admin.site.urls),
 ]